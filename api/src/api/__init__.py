@@ -2,7 +2,7 @@ __all__ = ("api_settings", "app", "serve")
 
 import debugpy
 
-from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
@@ -10,7 +10,10 @@ import uvicorn
 
 from db.models.base import DoesNotExist
 from db import _import_models
+from db.password_hashing import PasswordHasherBusy
 from .settings import api_settings
+from .response_cache import response_cache_middleware
+from .query_stats import query_stats_middleware
 
 # TODO: Move most of the src/main.py stuff in here.
 
@@ -46,6 +49,19 @@ async def default_exception_middleware(request: Request, call_next):
         return JSONResponse(content=response_content, status_code=500)
 
 
+app.middleware("http")(response_cache_middleware)
+app.middleware("http")(query_stats_middleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 CORS_ALLOW_ORIGINS = [
     "http://localhost:4200",
     "http://localhost:4201",
@@ -65,6 +81,8 @@ app.add_middleware(
 def api_router():
     from api.auth.views import oauth
 
+    from api.routes.admin_routes import admin
+
     from api.routes.user_routes import users
     from api.routes.uni_routes import uni
     from api.routes.lab_routes import labs
@@ -72,9 +90,17 @@ def api_router():
     from api.routes.software_routes import softwares
     from api.routes.material_routes import materials
     from api.routes.research_routes import research
+    from api.routes.search_routes import search
+
+    from api.schemas.field_selection import select_fields
 
-    api_router = APIRouter(prefix="/api", tags=["api"])
+    api_router = APIRouter(
+        prefix="/api",
+        tags=["api"],
+        dependencies=[Depends(select_fields)]
+    )
     api_router.include_router(oauth)
+    api_router.include_router(admin)
     api_router.include_router(users)
     api_router.include_router(uni)
     api_router.include_router(equipments)
@@ -93,6 +119,7 @@ def api_router():
     # api_router.include_router(lab_work_units)
 
     api_router.include_router(research)
+    api_router.include_router(search)
 
     return api_router
 
@@ -1,5 +1,6 @@
 from abc import abstractmethod
 from datetime import timedelta
+from http import HTTPStatus
 from typing import Annotated, TypeVar
 
 from fastapi import Depends, HTTPException
@@ -10,7 +11,9 @@ from db.models.base.base import Base
 from db.models.user import User, UserDoesNotExist, UserDomain, NativeUserCredentials
 
 from api.schemas.base_schemas import ModelRequest
-from .schemas import Token, parse_user_email_from_token, invalid_credentials_error
+from api.settings import api_settings
+from .principal_cache import principal_cache
+from .schemas import Token, parse_token_claims, invalid_credentials_error
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
@@ -30,11 +33,13 @@ async def login_native_user(
     if user.domain != UserDomain.NATIVE:
         raise invalid_credentials_error()
 
-    is_valid_password = any(
-        credentials.verify_password(password)
-        for credentials in await user.awaitable_attrs.credentials
-        if isinstance(credentials, NativeUserCredentials)
-    )
+    is_valid_password = False
+    for credentials in await user.awaitable_attrs.credentials:
+        if isinstance(credentials, NativeUserCredentials):
+            if await credentials.verify_password_async(password):
+                is_valid_password = True
+                break
+
     if not is_valid_password:
         raise invalid_credentials_error()
 
@@ -45,7 +50,11 @@ async def get_current_authenticated_user(
     db: Annotated[LocalSession, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> User:
-    user_email = parse_user_email_from_token(token)
+    user = await principal_cache.load(db, token)
+    if user is not None:
+        return user
+
+    user_email, token_expires_at = parse_token_claims(token)
 
     try:
         user = await User.get_for_email(db, user_email)
@@ -55,4 +64,13 @@ async def get_current_authenticated_user(
     if user.disabled:
         raise invalid_credentials_error()
 
+    principal_cache.put(token, user, token_expires_at)
+    return user
+
+
+async def get_current_admin_user(
+    user: Annotated[User, Depends(get_current_authenticated_user)],
+) -> User:
+    if api_settings.api_admin_role not in user.role_set:
+        raise HTTPException(HTTPStatus.FORBIDDEN, detail="Not an administrator")
     return user
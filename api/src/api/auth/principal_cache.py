@@ -0,0 +1,99 @@
+"""
+A cache of the users authenticated by verified access tokens, so that
+authenticating a request with a recently seen token neither verifies
+the token signature nor queries the user.
+
+Cached users are discarded when any write to the user table is committed
+(so changes to a user's email, roles or disabled flag take effect on the
+next request) and never outlive the expiry of their token (if it has one).
+
+The cache is local to the process, so only observes writes which
+are committed by sessions of the current process.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from db import LocalSession
+from db.changes import on_tables_committed
+from db.models.user import User
+
+from ..settings import api_settings
+
+
+def _detached_copy(user: User) -> User:
+    """
+    A copy of the loaded columns of the user, which is not attached to any session.
+    """
+    mapper = inspect(User)
+    copy = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        value = getattr(user, attr.key)
+        if isinstance(value, list):
+            value = list(value)
+        set_committed_value(copy, attr.key, value)
+    make_transient_to_detached(copy)
+    return copy
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._users: OrderedDict[str, tuple[User, float]] = OrderedDict()
+
+    async def load(self, db: LocalSession, token: str) -> User | None:
+        """
+        The user authenticated by the token, attached to the session,
+        or `None` if the token is not cached.
+        """
+        try:
+            user, expires_at = self._users[token]
+        except KeyError:
+            return None
+
+        if expires_at <= time.monotonic():
+            del self._users[token]
+            return None
+
+        self._users.move_to_end(token)
+        return await db.merge(user, load=False)
+
+    def put(self, token: str, user: User, token_expires_at: datetime | None):
+        if self.max_size <= 0:
+            return
+        ttl_seconds = self.ttl_seconds
+        if token_expires_at is not None:
+            token_expires_in = (token_expires_at - datetime.now(tz=timezone.utc)).total_seconds()
+            ttl_seconds = min(ttl_seconds, token_expires_in)
+        expires_at = time.monotonic() + ttl_seconds
+
+        self._users[token] = (_detached_copy(user), expires_at)
+        self._users.move_to_end(token)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    def invalidate(self, tables: set[str]):
+        if User.__tablename__ in tables:
+            self.clear()
+
+    def clear(self):
+        self._users.clear()
+
+
+def create_principal_cache() -> PrincipalCache:
+    cache = PrincipalCache(
+        max_size=api_settings.api_auth_principal_cache_size,
+        ttl_seconds=api_settings.api_auth_principal_cache_ttl_seconds,
+    )
+    on_tables_committed(cache.invalidate)
+    return cache
+
+
+principal_cache = create_principal_cache()
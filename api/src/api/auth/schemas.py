@@ -23,16 +23,29 @@ def invalid_credentials_error():
     )
 
 
-def parse_user_email_from_token(access_token: str):
+def parse_token_claims(access_token: str) -> tuple[str, datetime | None]:
+    """
+    The email of the user and the expiry (if any) of a verified access token
+    """
     try:
         payload = jwt.decode(access_token, SECRET_KEY)
-        email = payload.get("sub")
-        if email is None:
-            raise invalid_credentials_error()
-        return email
     except JWTError as e:
         raise invalid_credentials_error()
 
+    email = payload.get("sub")
+    if email is None:
+        raise invalid_credentials_error()
+
+    exp = payload.get("exp")
+    if exp is None:
+        return email, None
+    return email, datetime.fromtimestamp(exp, tz=timezone.utc)
+
+
+def parse_user_email_from_token(access_token: str):
+    email, _ = parse_token_claims(access_token)
+    return email
+
 
 class Token(BaseModel):
     token_type: str = "Bearer"
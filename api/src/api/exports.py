@@ -0,0 +1,126 @@
+"""
+Streaming exports of the full result of an index selection.
+
+In csv exports, list columns (eg. tags, disciplines or roles) are written
+as their items delimited by `;`. Other structured columns are written as json.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime
+from enum import Enum
+import io
+from typing import Any, AsyncIterator, Literal, TypeVar
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select, inspect
+
+from db import local_sessionmaker
+from db.models.base import Base
+
+from api.settings import api_settings
+
+ExportFormat = Literal["ndjson", "csv"]
+
+TModel = TypeVar("TModel", bound=Base)
+
+_export_media_types: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_row(model: Base) -> dict[str, Any]:
+    """
+    The values of the mapped columns of the model
+    """
+    return {
+        attr.key: getattr(model, attr.key)
+        for attr in inspect(type(model)).column_attrs
+    }
+
+
+CSV_LIST_DELIMITER = ";"
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, set, tuple)) and not any(
+        isinstance(item, (dict, list, set, tuple)) for item in value
+    ):
+        items = [_csv_value(item) for item in value]
+        if isinstance(value, set):
+            items.sort()
+        return CSV_LIST_DELIMITER.join(items)
+    if isinstance(value, (dict, list, set, tuple)):
+        return to_json(value).decode("utf-8")
+    return str(value)
+
+
+async def _stream_models(selection: Select[tuple[TModel]]) -> AsyncIterator[TModel]:
+    # Dependencies are closed before the body of a streaming response is sent,
+    # so the export cannot use the request session.
+    async with local_sessionmaker() as db:
+        models = await db.stream_scalars(
+            selection.execution_options(yield_per=api_settings.api_export_yield_per)
+        )
+        async for model in models:
+            yield model
+            db.expunge(model)
+
+
+async def _stream_ndjson(selection: Select[tuple[TModel]]) -> AsyncIterator[bytes]:
+    async for model in _stream_models(selection):
+        yield to_json(export_row(model)) + b"\n"
+
+
+async def _stream_csv(selection: Select[tuple[TModel]]) -> AsyncIterator[bytes]:
+    entity = selection.column_descriptions[0]["entity"]
+    columns = [attr.key for attr in inspect(entity).column_attrs]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value.encode("utf-8")
+
+    writer.writerow(columns)
+    yield flush()
+
+    async for model in _stream_models(selection):
+        row = export_row(model)
+        writer.writerow([_csv_value(row[c]) for c in columns])
+        yield flush()
+
+
+def export_response(
+    selection: Select[tuple[TModel]],
+    format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Streams every row of the selection as newline delimited json or csv.
+
+    In csv, the items of list columns are delimited by `CSV_LIST_DELIMITER`.
+    """
+    if format == "csv":
+        content = _stream_csv(selection)
+    else:
+        content = _stream_ndjson(selection)
+
+    return StreamingResponse(
+        content,
+        media_type=_export_media_types[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"'
+        },
+    )
@@ -0,0 +1,58 @@
+"""
+Reports the statements executed while serving each request, in a
+`Server-Timing` header and a structured log line.
+
+Requests which execute the same statement (up to its parameters) more
+than `api_query_repeat_threshold` times are logged as likely N+1 queries.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+
+from db.query_stats import collect_query_stats
+
+from .settings import api_settings
+
+logger = logging.getLogger("api.query_stats")
+
+
+async def query_stats_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    started_at = time.perf_counter()
+    with collect_query_stats() as stats:
+        response = await call_next(request)
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    db_ms = stats.total_seconds * 1000
+
+    response.headers.append(
+        "Server-Timing",
+        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={elapsed_ms:.1f}',
+    )
+
+    repeated = stats.repeated_statements(api_settings.api_query_repeat_threshold)
+    record = {
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "duration_ms": round(elapsed_ms, 1),
+        "query_count": stats.count,
+        "query_ms": round(db_ms, 1),
+        "distinct_statements": len(stats.fingerprints),
+    }
+
+    if repeated:
+        record["repeated_statements"] = [
+            {"count": n, "statement": f[:240]} for f, n in repeated
+        ]
+        logger.warning("likely n+1 queries %s", json.dumps(record))
+    else:
+        logger.info("%s", json.dumps(record))
+
+    return response
@@ -0,0 +1,151 @@
+"""
+An in-process cache of the responses of read-mostly catalogue index routes.
+
+Cached responses are invalidated whenever a session commits a write to
+any of the tables which were read while building the response (including
+the tables of the relations which are nested in the response).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+
+from db.changes import on_tables_committed, table_versions, table_versions_snapshot
+from db.query_stats import collect_query_stats
+
+from .settings import api_settings
+
+# The routes whose responses are cached.
+CACHED_ROUTES = frozenset(
+    {
+        "/api/uni/campus",
+        "/api/uni/funding",
+        "/api/labs/lab",
+        "/api/equipments/equipment",
+        "/api/softwares/software",
+    }
+)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    media_type: str | None
+    tables: frozenset[str]
+    expires_at: float
+
+
+@dataclass
+class ResponseCache:
+    max_size: int
+    ttl_seconds: float
+
+    _entries: OrderedDict[str, CachedResponse] = field(default_factory=OrderedDict)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: str,
+        response: Response,
+        body: bytes,
+        tables: frozenset[str],
+        versions: dict[str, int],
+    ):
+        """
+        Stores the response, which was built by reading from the tables.
+        The versions are a snapshot of the table versions taken before
+        the response was built.
+        """
+        # A response which was built while one of its tables was written is not stored.
+        if self.max_size <= 0 or not tables:
+            return
+        if table_versions(tables) != tuple(versions.get(t, 0) for t in sorted(tables)):
+            return
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() != "content-length"
+        }
+        self._entries[key] = CachedResponse(
+            body=body,
+            headers=headers,
+            media_type=response.media_type,
+            tables=tables,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tables: set[str]):
+        stale = [k for k, v in self._entries.items() if v.tables & tables]
+        for key in stale:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+def response_cache_key(request: Request) -> str:
+    params = sorted(request.query_params.multi_items())
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{request.url.path}?{query}"
+
+
+def create_response_cache() -> ResponseCache:
+    cache = ResponseCache(
+        max_size=api_settings.api_response_cache_size,
+        ttl_seconds=api_settings.api_response_cache_ttl_seconds,
+    )
+    on_tables_committed(cache.invalidate)
+    return cache
+
+
+response_cache = create_response_cache()
+
+
+async def response_cache_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    if request.url.path.rstrip("/") not in CACHED_ROUTES or request.method != "GET":
+        return await call_next(request)
+
+    key = response_cache_key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return Response(
+            content=cached.body,
+            headers=cached.headers,
+            media_type=cached.media_type,
+        )
+
+    versions = table_versions_snapshot()
+    with collect_query_stats() as stats:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])  # type: ignore
+
+    response_cache.put(key, response, body, frozenset(stats.tables), versions)
+
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers={
+            k: v for k, v in response.headers.items() if k.lower() != "content-length"
+        },
+        media_type=response.media_type,
+    )
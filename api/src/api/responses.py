@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from http import HTTPStatus
+import types
+from typing import TYPE_CHECKING, Any, Callable, Union, get_args, get_origin
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from db.models.base import Base
+    from api.schemas.base_schemas import ModelDetail
+
+
+class ModelResponse(JSONResponse):
+    """
+    A json response which serializes a pydantic model directly to bytes
+    with pydantic-core, without first converting the model to a dict
+    and passing it through `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return super().render(content)
+
+
+def serialized_model_types(response_model: Any) -> tuple[type[BaseModel], ...]:
+    """
+    The model types which serialize to the same json as the declared response
+    model, ie. the response model itself, or each model of a union.
+    """
+    if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        return (response_model,)
+    if get_origin(response_model) not in (Union, types.UnionType):
+        return ()
+    return tuple(
+        t for t in get_args(response_model)
+        if isinstance(t, type) and issubclass(t, BaseModel)
+    )
+
+
+class ModelRoute(APIRoute):
+    """
+    An api route which returns models from the endpoint as a `ModelResponse`.
+
+    Only models of exactly the declared response model of the route (or of one
+    of the models of a declared union) are returned as a `ModelResponse`, as
+    filtering them through the response model would not change them. Any other
+    model (eg. a subclass with additional fields) is validated and serialized
+    through the response model by fastapi.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # The endpoint is wrapped before the route is initialised, as fastapi
+        # builds a new dependant from the endpoint when the route is included
+        # in a router or the app.
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+        self._model_types = (
+            serialized_model_types(self.response_model)
+            if self.response_model is not None
+            else None
+        )
+
+    def _wrap_endpoint(self, call: Callable[..., Any]):
+        @functools.wraps(call)
+        async def endpoint(*args: Any, **kwargs: Any):
+            result = await call(*args, **kwargs)
+            if isinstance(result, BaseModel) and (
+                self._model_types is None or type(result) in self._model_types
+            ):
+                return ModelResponse(result, status_code=self.status_code or 200)
+            return result
+
+        return endpoint
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque_tag(tag: str):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque_tag(etag) in {opaque_tag(t) for t in if_none_match.split(",")}
+
+
+async def conditional_detail_response(
+    request: Request,
+    detail_cls: type[ModelDetail],
+    model: Base,
+) -> Response:
+    """
+    Responds with the detail of the model, or with `304 Not Modified` (without
+    hydrating the detail) if the client's `If-None-Match` header matches the
+    current etag of the detail.
+    """
+    etag = await detail_cls.etag(model, variant=str(request.query_params))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    detail = await detail_cls.from_model(model)
+    return ModelResponse(detail, headers=headers)
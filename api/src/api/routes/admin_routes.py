@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from api.responses import ModelRoute
+
+from api.auth.context import get_current_admin_user
+from db import engine
+from db.pool_metrics import pool_metrics
+
+from api.schemas.admin import DbPoolMetricsDetail
+
+admin = APIRouter(
+    prefix="/admin",
+    route_class=ModelRoute,
+    tags=["admin"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+
+@admin.get("/db-pool")
+async def read_db_pool_metrics() -> DbPoolMetricsDetail:
+    return DbPoolMetricsDetail.from_metrics(pool_metrics(engine.pool))
@@ -1,14 +1,22 @@
 from typing import Any, Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
-from api.auth.context import get_current_authenticated_user
+from api.responses import ModelRoute, conditional_detail_response
+from api.schemas.base_schemas import ModelBatchGetRequest
+from api.schemas.search import TagCount, TypeaheadItem
+from api.settings import api_settings
+
+from api.auth.context import get_current_admin_user, get_current_authenticated_user
+from api.exports import ExportFormat, export_response
 
 from db import get_db
 from db.models.equipment.equipment import Equipment, query_equipments
 from db.models.equipment.equipment_installation import EquipmentInstallation, query_equipment_installation_provisions, query_equipment_installations
 from db.models.equipment.equipment_lease import query_equipment_leases
 from db.models.lab.provisionable.lab_provision import LabProvision
+from db.models.uni.discipline import Discipline
+from db.models.search import query_tag_counts, query_typeahead
 
 from api.schemas.lab import LabProvisionDetail, LabProvisionIndexPage
 from api.schemas.equipment import (
@@ -23,7 +31,7 @@ from api.schemas.equipment import (
     EquipmentLeaseIndexPage
 )
 
-equipments = APIRouter(prefix="/equipments")
+equipments = APIRouter(prefix="/equipments", route_class=ModelRoute)
 
 @equipments.get("/equipment")
 async def index_equipments(
@@ -32,6 +40,8 @@ async def index_equipments(
     name: str | None = None,
     tags: str | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ):
     if tags:
@@ -48,7 +58,9 @@ async def index_equipments(
             name_eq=name,
             has_tags=tags_,
         ),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
 
@@ -58,22 +70,101 @@ async def create_equipment(create_req: EquipmentCreateRequest, db=Depends(get_db
     return await EquipmentDetail.from_model(model)
 
 
-@equipments.get("/equipment/{equipment_id}")
-async def read_equipment(equipment_id: UUID, db=Depends(get_db)) -> EquipmentDetail:
+@equipments.get("/equipment/export")
+async def export_equipments(
+    lab_id: UUID | None = None,
+    name_startswith: str | None = None,
+    name: str | None = None,
+    tags: str | None = None,
+    format: ExportFormat = "ndjson",
+    current_user=Depends(get_current_admin_user)
+):
+    if tags:
+        tags_ = set(tags.split(','))
+    else:
+        tags_ = set()
+
+    return export_response(
+        query_equipments(
+            lab=lab_id,
+            name_istartswith=name_startswith,
+            name_eq=name,
+            has_tags=tags_,
+        ),
+        format,
+        filename="equipments"
+    )
+
+
+@equipments.get("/equipment/typeahead")
+async def typeahead_equipments(
+    q: str,
+    limit: int = 10,
+    db=Depends(get_db),
+) -> list[TypeaheadItem]:
+    return await TypeaheadItem.from_selection(
+        db,
+        Equipment.__tablename__,
+        query_typeahead([Equipment.name], q, min(limit, api_settings.api_typeahead_max_limit)),
+    )
+
+
+@equipments.get("/equipment/tags")
+async def index_equipment_tags(
+    lab_id: UUID | None = None,
+    campus_id: UUID | None = None,
+    discipline: Discipline | None = None,
+    prefix: str | None = None,
+    limit: int = 10,
+    db=Depends(get_db),
+) -> list[TagCount]:
+    if (lab_id is not None) or (campus_id is not None) or (discipline is not None):
+        items = query_equipments(
+            lab=lab_id,
+            installed_campus=campus_id,
+            installed_discipline=discipline,
+        )
+    else:
+        items = None
+
+    return await TagCount.from_selection(
+        db,
+        query_tag_counts(
+            Equipment.__tablename__,
+            items,
+            prefix=prefix,
+            limit=min(limit, api_settings.api_typeahead_max_limit),
+        ),
+    )
+
+
+@equipments.post("/equipment/batch-get")
+async def batch_get_equipments(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> EquipmentIndexPage:
+    return await EquipmentIndexPage.from_ids(db, Equipment, request.ids)
+
+
+@equipments.get("/equipment/{equipment_id}", response_model=EquipmentDetail)
+async def read_equipment(equipment_id: UUID, request: Request, db=Depends(get_db)) -> Response:
     equipment = await Equipment.get_for_id(db, equipment_id)
-    return await EquipmentDetail.from_model(equipment)
+    return await conditional_detail_response(request, EquipmentDetail, equipment)
 
 @equipments.get("/installation")
 async def index_equipment_installations(
     lab: UUID | None = None,
     equipment: UUID | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db)
 ):
     return await EquipmentInstallationIndexPage.from_selection(
         db,
         query_equipment_installations(lab=lab, equipment=equipment),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
 @equipments.post("/installation")
@@ -89,6 +180,13 @@ async def create_installation(
     return await EquipmentInstallationDetail.from_model(installation)
 
 
+@equipments.post("/installation/batch-get")
+async def batch_get_equipment_installations(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> EquipmentInstallationIndexPage:
+    return await EquipmentInstallationIndexPage.from_ids(db, EquipmentInstallation, request.ids)
+
+
 @equipments.get("/installation/{installation_id}")
 async def read_equipment_installation(
     installation_id: UUID, db=Depends(get_db)
@@ -120,6 +218,8 @@ async def index_installation_provisions(
     installation: UUID,
     action_name: Literal["new_equipment", "transfer_equipment"] | None = None,
     only_pending: bool = False,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db)
 ) -> LabProvisionIndexPage:
     return await LabProvisionIndexPage.from_selection(
@@ -128,7 +228,9 @@ async def index_installation_provisions(
             installation=installation,
             action=action_name,
             only_pending=only_pending
-        )
+        ),
+        after=after,
+        include_total=include_total
     )
 
 
@@ -149,23 +251,29 @@ async def create_installation_provision(
     return await LabProvisionDetail.from_model(provision)
 
 @equipments.get("/installation/{installation_id}/lease")
-async def index_installation_leases(installation_id: UUID, db=Depends(get_db)) -> EquipmentLeaseIndexPage:
+async def index_installation_leases(installation_id: UUID, after: str | None = None, include_total: bool = True, db=Depends(get_db)) -> EquipmentLeaseIndexPage:
     return await EquipmentLeaseIndexPage.from_selection(
         db,
         query_equipment_leases(
             installation=installation_id
-        )
+        ),
+        after=after,
+        include_total=include_total
     )
 
 
 @equipments.get("/provision/")
 async def index_equipment_provisions(
     equipment: UUID | None = None,
+    after: str | None = None,
+    include_total: bool = True,
     db = Depends(get_db)
 ) -> LabProvisionIndexPage:
     return await LabProvisionIndexPage.from_selection(
         db,
         query_equipment_installation_provisions(
             equipment=equipment
-        )
+        ),
+        after=after,
+        include_total=include_total
     )
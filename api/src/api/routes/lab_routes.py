@@ -1,7 +1,11 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
-from api.auth.context import get_current_authenticated_user
+from api.responses import ModelRoute, conditional_detail_response
+from api.schemas.base_schemas import ModelBatchGetRequest
+
+from api.auth.context import get_current_admin_user, get_current_authenticated_user
+from api.exports import ExportFormat, export_response
 from db import get_db
 from db.models.lab.lab import Lab, query_labs
 from db.models.lab.provisionable.lab_provision import LabProvision, query_lab_provisions
@@ -17,7 +21,7 @@ from api.schemas.lab import (
     LabProvisionRequest
 )
 
-labs = APIRouter(prefix="/labs", tags=["labs"])
+labs = APIRouter(prefix="/labs", route_class=ModelRoute, tags=["labs"])
 
 
 @labs.get("/lab")
@@ -29,6 +33,8 @@ async def index_labs(
     discipline: Discipline | None = None,
     ids: str | None = None,
     page: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ) -> LabIndexPage:
     campus_lookup: CampusLookup | UUID | None = None
@@ -49,14 +55,23 @@ async def index_labs(
     return await LabIndexPage.from_selection(
         db,
         query_labs(campus=campus_model, discipline=discipline, search=search, id_in=id_in),
-        page_index=1
+        page_index=page,
+        after=after,
+        include_total=include_total
     )
 
 
-@labs.get("/lab/{lab_id}")
-async def lab_detail(lab_id: UUID, db=Depends(get_db)) -> LabDetail:
+@labs.post("/lab/batch-get")
+async def batch_get_labs(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> LabIndexPage:
+    return await LabIndexPage.from_ids(db, Lab, request.ids)
+
+
+@labs.get("/lab/{lab_id}", response_model=LabDetail)
+async def lab_detail(lab_id: UUID, request: Request, db=Depends(get_db)) -> Response:
     lab = await Lab.get_for_id(db, lab_id)
-    return await LabDetail.from_model(lab)
+    return await conditional_detail_response(request, LabDetail, lab)
 
 
 @labs.get("/provision")
@@ -65,6 +80,8 @@ async def index_lab_provisions(
     provisionable: UUID | None = None,
     action: str | None = None,
     only_pending: bool = False,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db)
 ):
     return await LabProvisionIndexPage.from_selection(
@@ -74,9 +91,38 @@ async def index_lab_provisions(
             provisionable_id=provisionable,
             action=action,
             only_pending=only_pending
-        )
+        ),
+        after=after,
+        include_total=include_total
+    )
+
+@labs.get("/provision/export")
+async def export_lab_provisions(
+    type: str | None = None,
+    provisionable: UUID | None = None,
+    action: str | None = None,
+    only_pending: bool = False,
+    format: ExportFormat = "ndjson",
+    current_user=Depends(get_current_admin_user)
+):
+    return export_response(
+        query_lab_provisions(
+            provisionable_type=type,
+            provisionable_id=provisionable,
+            action=action,
+            only_pending=only_pending
+        ),
+        format,
+        filename="lab_provisions"
     )
 
+@labs.post("/provision/batch-get")
+async def batch_get_lab_provisions(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> LabProvisionIndexPage:
+    return await LabProvisionIndexPage.from_ids(db, LabProvision, request.ids)
+
+
 @labs.get("/provision/{provision_id}")
 async def read_lab_provision(provision_id: UUID, db=Depends(get_db)):
     provision = await LabProvision.get_by_id(db, provision_id)
@@ -2,5 +2,7 @@
 from uuid import UUID
 from fastapi import APIRouter
 
+from api.responses import ModelRoute
 
-materials = APIRouter(prefix="/materials")
\ No newline at end of file
+
+materials = APIRouter(prefix="/materials", route_class=ModelRoute)
\ No newline at end of file
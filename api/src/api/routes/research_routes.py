@@ -1,5 +1,8 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+
+from api.responses import ModelRoute, conditional_detail_response
+from api.schemas.base_schemas import ModelBatchGetRequest
 
 from db import get_db
 from db.models.research.plan import ResearchPlan, query_research_plans
@@ -11,7 +14,7 @@ from api.schemas.research import (
     ResearchPlanUpdateRequest,
 )
 
-research = APIRouter(prefix="/research", tags=["research"])
+research = APIRouter(prefix="/research", route_class=ModelRoute, tags=["research"])
 
 
 
@@ -20,6 +23,8 @@ async def index_plans(
     researcher: UUID | None = None,
     coordinator: UUID | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ) -> ResearchPlanIndexPage:
     return await ResearchPlanIndexPage.from_selection(
@@ -28,7 +33,9 @@ async def index_plans(
             researcher=researcher,
             coordinator=coordinator
         ),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
 
@@ -42,10 +49,17 @@ async def create_plan(
     return await ResearchPlanDetail.from_model(created)
 
 
-@research.get("/plan/{plan_id}")
-async def get_plan(plan_id: UUID, db=Depends(get_db)) -> ResearchPlanDetail:
+@research.post("/plan/batch-get")
+async def batch_get_plans(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> ResearchPlanIndexPage:
+    return await ResearchPlanIndexPage.from_ids(db, ResearchPlan, request.ids)
+
+
+@research.get("/plan/{plan_id}", response_model=ResearchPlanDetail)
+async def get_plan(plan_id: UUID, request: Request, db=Depends(get_db)) -> Response:
     plan = await ResearchPlan.get_for_id(db, plan_id)
-    return await ResearchPlanDetail.from_model(plan)
+    return await conditional_detail_response(request, ResearchPlanDetail, plan)
 
 
 @research.put("/plan/{plan_id}")
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+
+from api.responses import ModelRoute
+from api.schemas.search import SearchResultPage
+from api.settings import api_settings
+from db import get_db
+
+search = APIRouter(prefix="/search", route_class=ModelRoute, tags=["search"])
+
+
+@search.get("")
+async def search_catalogue(
+    q: str,
+    types: str | None = None,
+    page_index: int = 1,
+    db=Depends(get_db),
+) -> SearchResultPage:
+    """
+    Searches equipment, software, users, labs, research plans, campuses and fundings.
+
+    `types` is a comma separated list of the types to include in the results.
+    """
+    return await SearchResultPage.from_search(
+        db,
+        q,
+        types=types.split(",") if types else None,
+        page_index=page_index,
+        page_size=api_settings.api_page_size_default,
+    )
@@ -2,10 +2,17 @@ from typing import Any, Literal
 from uuid import UUID
 from fastapi import APIRouter, Depends
 
+from api.responses import ModelRoute
+from api.schemas.base_schemas import ModelBatchGetRequest
+from api.schemas.search import TagCount
+from api.settings import api_settings
+
 from api.auth.context import get_current_authenticated_user
 
 from db import get_db
 from db.models.lab.provisionable.lab_provision import LabProvision
+from db.models.search import query_tag_counts
+from db.models.uni.discipline import Discipline
 from db.models.software import Software, query_softwares, SoftwareInstallation, query_software_installation_provisions
 from db.models.software.software_installation import SoftwareInstallation, query_software_installation_provisions, query_software_installations
 
@@ -24,7 +31,7 @@ from api.schemas.software import (
 )
 from db.models.software.software_lease import query_software_leases
 
-softwares = APIRouter(prefix="/softwares")
+softwares = APIRouter(prefix="/softwares", route_class=ModelRoute)
 
 @softwares.get("/software")
 async def index_softwares(
@@ -33,6 +40,8 @@ async def index_softwares(
     name: str | None = None,
     tags: str | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ):
     if tags:
@@ -49,7 +58,9 @@ async def index_softwares(
             name_eq=name,
             has_tags=tags_,
         ),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
 
@@ -59,6 +70,42 @@ async def create_software(create_req: SoftwareCreateRequest, db=Depends(get_db),
     return await SoftwareDetail.from_model(model)
 
 
+@softwares.get("/software/tags")
+async def index_software_tags(
+    lab_id: UUID | None = None,
+    campus_id: UUID | None = None,
+    discipline: Discipline | None = None,
+    prefix: str | None = None,
+    limit: int = 10,
+    db=Depends(get_db),
+) -> list[TagCount]:
+    if (lab_id is not None) or (campus_id is not None) or (discipline is not None):
+        items = query_softwares(
+            lab=lab_id,
+            installed_campus=campus_id,
+            installed_discipline=discipline,
+        )
+    else:
+        items = None
+
+    return await TagCount.from_selection(
+        db,
+        query_tag_counts(
+            Software.__tablename__,
+            items,
+            prefix=prefix,
+            limit=min(limit, api_settings.api_typeahead_max_limit),
+        ),
+    )
+
+
+@softwares.post("/software/batch-get")
+async def batch_get_softwares(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> SoftwareIndexPage:
+    return await SoftwareIndexPage.from_ids(db, Software, request.ids)
+
+
 @softwares.get("/software/{software_id}")
 async def read_equipment(software_id: UUID, db=Depends(get_db)) -> SoftwareDetail:
     equipment = await Software.get_by_id(db, software_id)
@@ -69,12 +116,16 @@ async def index_equipment_installations(
     lab: UUID | None = None,
     software: UUID | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db)
 ):
     return await SoftwareInstallationIndexPage.from_selection(
         db,
         query_software_installations(lab=lab, software=software),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
 @softwares.post("/installation")
@@ -98,6 +149,13 @@ async def new_software_installation(
     raise NotImplementedError
 
 
+@softwares.post("/installation/batch-get")
+async def batch_get_software_installations(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> SoftwareInstallationIndexPage:
+    return await SoftwareInstallationIndexPage.from_ids(db, SoftwareInstallation, request.ids)
+
+
 @softwares.get("/installation/{installation_id}")
 async def read_software_installation(
     installation_id: UUID, db=Depends(get_db)
@@ -129,6 +187,8 @@ async def index_installation_provisions(
     installation: UUID,
     action_name: Literal["new_software", "upgrade_software"] | None = None,
     only_pending: bool = False,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db)
 ) -> LabProvisionIndexPage:
     return await LabProvisionIndexPage.from_selection(
@@ -137,7 +197,9 @@ async def index_installation_provisions(
             installation=installation,
             action=action_name,
             only_pending=only_pending
-        )
+        ),
+        after=after,
+        include_total=include_total
     )
 
 
@@ -158,12 +220,14 @@ async def create_installation_provision(
     return await LabProvisionDetail.from_model(provision)
 
 @softwares.get("/installation/{installation_id}/lease")
-async def index_installation_leases(installation_id: UUID, db=Depends(get_db)) -> SoftwareLeaseIndexPage:
+async def index_installation_leases(installation_id: UUID, after: str | None = None, include_total: bool = True, db=Depends(get_db)) -> SoftwareLeaseIndexPage:
     return await SoftwareLeaseIndexPage.from_selection(
         db,
         query_software_leases(
             installation=installation_id
-        )
+        ),
+        after=after,
+        include_total=include_total
     )
 
 @softwares.get("/software/provision")
@@ -171,10 +235,14 @@ async def index_installation_leases(installation_id: UUID, db=Depends(get_db)) -
 async def index_software_provisions(
     action: Literal["new_software", "upgrade_software"] | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db = Depends(get_db)
 ):
     return await LabProvisionIndexPage.from_selection(
         db,
         query_software_installation_provisions(action=action),
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
@@ -1,5 +1,11 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
+from sqlalchemy import Select
+
+from api.responses import ModelRoute
+from api.schemas.base_schemas import ModelBatchGetRequest
+from api.schemas.search import TypeaheadItem
+from api.settings import api_settings
 
 from api.schemas.uni import (
     CampusDetail,
@@ -9,18 +15,23 @@ from api.schemas.uni import (
     FundingDetail,
 )
 from api.schemas.uni.funding_schemas import BudgetIndexPage
+from api.auth.context import get_current_admin_user, get_current_authenticated_user
+from api.exports import ExportFormat, export_response
 from db import get_db
-from db.models.uni.funding import query_budgets, Funding, query_fundings
-from db.models.uni.campus import query_campuses
+from db.models.uni.funding import Budget, query_budgets, Funding, query_fundings
+from db.models.uni.campus import Campus, query_campuses
+from db.models.search import query_typeahead
 
 
-uni = APIRouter(prefix="/uni")
+uni = APIRouter(prefix="/uni", route_class=ModelRoute)
 
 @uni.get("/campus")
 async def index_campuses(
     code_eq: str | None = None,
     text_like: str | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ) -> CampusIndexPage:
 
@@ -32,10 +43,34 @@ async def index_campuses(
     return await CampusIndexPage.from_selection(
         db,
         selection,
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
+    )
+
+
+@uni.get("/campus/typeahead")
+async def typeahead_campuses(
+    q: str,
+    limit: int = 10,
+    db=Depends(get_db),
+) -> list[TypeaheadItem]:
+    return await TypeaheadItem.from_selection(
+        db,
+        Campus.__tablename__,
+        query_typeahead(
+            [Campus.name, Campus.code], q, min(limit, api_settings.api_typeahead_max_limit)
+        ),
     )
 
 
+@uni.post("/campus/batch-get")
+async def batch_get_campuses(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> CampusIndexPage:
+    return await CampusIndexPage.from_ids(db, Campus, request.ids)
+
+
 @uni.get("/campus/{id}")
 async def read_campus(id: UUID, db=Depends(get_db)):
     campus = await lookup_campus(db, id)
@@ -44,18 +79,27 @@ async def read_campus(id: UUID, db=Depends(get_db)):
 
 @uni.get("/funding")
 async def index_research_fundings(
-    name: str | None = None, page_index: int = 1, db=Depends(get_db)
+    name: str | None = None, text_like: str | None = None, page_index: int = 1, after: str | None = None, include_total: bool = True, db=Depends(get_db)
 ) -> FundingIndexPage:
     selection = query_fundings(
         name_eq=name,
-        text=''
+        text=text_like
     )
     return await FundingIndexPage.from_selection(
         db,
         selection,
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
     )
 
+@uni.post("/funding/batch-get")
+async def batch_get_fundings(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> FundingIndexPage:
+    return await FundingIndexPage.from_ids(db, Funding, request.ids)
+
+
 @uni.get("/funding/{funding_id}")
 async def get_research_funding(
     funding_id: UUID, db=Depends(get_db)
@@ -70,23 +114,67 @@ async def index_budgets(
     lab: UUID | None = None,
     research_plan: UUID | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db = Depends(get_db)
 ) -> BudgetIndexPage:
+    selection = _select_budgets(
+        funding=funding,
+        funding_name=funding_name,
+        lab=lab,
+        research_plan=research_plan,
+    )
+
+    return await BudgetIndexPage.from_selection(
+        db,
+        selection,
+        page_index=page_index,
+        after=after,
+        include_total=include_total
+    )
+
+
+@uni.post("/budget/batch-get")
+async def batch_get_budgets(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> BudgetIndexPage:
+    return await BudgetIndexPage.from_ids(db, Budget, request.ids)
+
+
+@uni.get("/budget/export")
+async def export_budgets(
+    funding: UUID | None = None,
+    funding_name: str | None = None,
+    lab: UUID | None = None,
+    research_plan: UUID | None = None,
+    format: ExportFormat = "ndjson",
+    current_user=Depends(get_current_admin_user)
+):
+    selection = _select_budgets(
+        funding=funding,
+        funding_name=funding_name,
+        lab=lab,
+        research_plan=research_plan,
+    )
+    return export_response(selection, format, filename="budgets")
+
+
+def _select_budgets(
+    funding: UUID | None,
+    funding_name: str | None,
+    lab: UUID | None,
+    research_plan: UUID | None,
+):
+    funding_: Select | UUID | None
     if funding:
         funding_ = funding
     elif funding_name:
         funding_ = query_fundings(name_eq=funding_name)
     else:
-        funding = None
+        funding_ = None
 
-    selection = query_budgets(
+    return query_budgets(
         funding = funding_,
         lab=lab,
         research_plan=research_plan,
     )
-
-    return await BudgetIndexPage.from_selection(
-        db,
-        selection,
-        page_index=page_index
-    )
@@ -3,9 +3,15 @@ from typing import Annotated
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 
+from api.responses import ModelRoute
+from api.schemas.base_schemas import ModelBatchGetRequest
+from api.schemas.search import TypeaheadItem
+from api.settings import api_settings
+
 from api.auth.context import get_current_authenticated_user
 
 from db import LocalSession, get_db
+from db.models.search import query_typeahead
 from db.models.uni.discipline import Discipline
 from db.models.user import (
     NativeUserCredentials,
@@ -27,7 +33,7 @@ from api.schemas.user import (
 )
 
 
-users = APIRouter(prefix="/users", tags=["users"])
+users = APIRouter(prefix="/users", route_class=ModelRoute, tags=["users"])
 
 
 @users.get("/")
@@ -38,6 +44,8 @@ async def index_users(
     discipline: str | None = None,
     supervises_lab: UUID | None = None,
     page_index: int = 1,
+    after: str | None = None,
+    include_total: bool = True,
     db=Depends(get_db),
 ):
 
@@ -66,7 +74,27 @@ async def index_users(
     return await UserIndexPage.from_selection(
         db,
         selection,
-        page_index=page_index
+        page_index=page_index,
+        after=after,
+        include_total=include_total
+    )
+
+
+@users.get("/typeahead")
+async def typeahead_users(
+    q: str,
+    limit: int = 10,
+    db=Depends(get_db),
+) -> list[TypeaheadItem]:
+    return await TypeaheadItem.from_selection(
+        db,
+        User.__tablename__,
+        query_typeahead(
+            [User.name, User.email],
+            q,
+            min(limit, api_settings.api_typeahead_max_limit),
+            User.disabled.is_(False),
+        ),
     )
 
 
@@ -87,15 +115,22 @@ async def alter_password(
         raise HTTPException(401, detail="Not a native user")
     credentials: NativeUserCredentials = await user.awaitable_attrs.credentials
 
-    if not credentials.verify_password(alter_password.current_value):
+    if not await credentials.verify_password_async(alter_password.current_value):
         raise HTTPException(409, "Incorrect current password for user")
 
-    credentials.set_password(alter_password.new_value)
+    await credentials.set_password_async(alter_password.new_value)
     db.add(credentials)
     await db.commit()
     return await UserDetail.from_model(user)
 
 
+@users.post("/user/batch-get")
+async def batch_get_users(
+    request: ModelBatchGetRequest, db=Depends(get_db)
+) -> UserIndexPage:
+    return await UserIndexPage.from_ids(db, User, request.ids)
+
+
 @users.get("/user/{id}")
 async def get_user(id: UUID, db=Depends(get_db)) -> UserDetail:
     try:
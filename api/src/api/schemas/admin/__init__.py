@@ -0,0 +1,6 @@
+__all__ = (
+    "DbPoolCheckoutWaits",
+    "DbPoolMetricsDetail",
+)
+
+from .db_pool_schemas import DbPoolCheckoutWaits, DbPoolMetricsDetail
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from db.pool_metrics import CHECKOUT_WAIT_BUCKETS, CheckoutWaitStats, PoolMetrics
+
+from ..base_schemas import BaseModel
+
+
+class DbPoolCheckoutWaits(BaseModel):
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_mean: float
+
+    # The upper bound (in seconds) of each bucket of the wait time histogram,
+    # and the number of checkouts in each bucket. The final bucket is unbounded.
+    wait_bucket_bounds: list[float]
+    wait_bucket_counts: list[int]
+
+    @classmethod
+    def from_stats(cls, stats: CheckoutWaitStats) -> DbPoolCheckoutWaits:
+        total_count = stats.checkouts + stats.timeouts
+        return cls(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_seconds_total=stats.wait_seconds_total,
+            wait_seconds_max=stats.wait_seconds_max,
+            wait_seconds_mean=stats.wait_seconds_total / total_count if total_count else 0.0,
+            wait_bucket_bounds=list(CHECKOUT_WAIT_BUCKETS),
+            wait_bucket_counts=list(stats.wait_buckets),
+        )
+
+
+class DbPoolMetricsDetail(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+
+    checkout_waits: DbPoolCheckoutWaits | None
+
+    @classmethod
+    def from_metrics(cls, metrics: PoolMetrics) -> DbPoolMetricsDetail:
+        return cls(
+            pool_size=metrics.pool_size,
+            max_overflow=metrics.max_overflow,
+            checked_out=metrics.checked_out,
+            checked_in=metrics.checked_in,
+            overflow=metrics.overflow,
+            checkout_waits=(
+                DbPoolCheckoutWaits.from_stats(metrics.wait_stats)
+                if metrics.wait_stats is not None
+                else None
+            ),
+        )
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-import asyncio
+import base64
 from datetime import datetime
+import hashlib
+from http import HTTPStatus
+import json
 from typing import Any, Awaitable, Callable, ClassVar, Generic, Self, TypeVar, TypedDict, cast
 import typing
 from uuid import UUID
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 from humps import camelize
 from pydantic import BaseModel as _BaseModel, ConfigDict, Field
 from pydantic._internal._forward_ref import PydanticRecursiveRef
-from sqlalchemy import ScalarResult, Select, func
+from sqlalchemy import ColumnElement, ScalarResult, Select, any_, bindparam, func, literal, select, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
 
-from db import LocalSession, get_db
+from sqlalchemy.ext.asyncio import async_object_session
+
+from db import LocalSession, get_db, local_object_session
+from db.count_cache import count_selection, create_count_cache
+from db.forks import adopt, gather_forked
+from db.loader import model_loader
 from db.models.base import Base
 
 from api.settings import api_settings
 
+from .field_selection import _field_selection, current_field_selection
+
 
 class BaseModel(_BaseModel):
     model_config = ConfigDict(
@@ -29,6 +42,75 @@ class BaseModel(_BaseModel):
 
 # FIXME: mypy doesn't support PEP 695 yet.
 TModel = TypeVar("TModel", bound=Base)
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _page_count(total_item_count: int, page_size: int) -> int:
+    """
+    The number of pages needed to hold all the items, including the last partial page.
+    """
+    return -(-total_item_count // page_size)
+
+
+class ModelRef(BaseModel):
+    """
+    A reference to a model, returned in place of a nested detail
+    which was not expanded by the request.
+    """
+    id: UUID
+    # The table name of the model, serialized as `type`.
+    model_type: str = Field(alias="type")
+
+    @classmethod
+    def to(cls, model_type: type[Base], id: UUID) -> ModelRef:
+        return cls(id=id, type=model_type.__tablename__)
+
+
+class ModelRefIndexPage(BaseModel):
+    """
+    An index of references to models, returned in place of a nested
+    index page which was not expanded by the request.
+    """
+    items: list[ModelRef]
+    total_item_count: int | None = None
+    total_page_count: int | None = None
+    page_index: int
+    page_size: int
+
+    @classmethod
+    def from_models(cls, models: list[Base], page_size: int = 20) -> ModelRefIndexPage:
+        return cls(
+            items=[ModelRef.to(type(m), m.id) for m in models[:page_size]],
+            total_item_count=len(models),
+            total_page_count=_page_count(len(models), page_size),
+            page_index=1,
+            page_size=page_size
+        )
+
+    @classmethod
+    async def from_selection(
+        cls,
+        db: LocalSession,
+        selection: Select[tuple[TModel]],
+        page_size: int = 20,
+    ) -> ModelRefIndexPage:
+        """
+        Fetches the ids of the first page of the selection.
+
+        The ids and count are fetched by the `ModelLoader` of the session, together
+        with the reference pages of any other concurrently hydrating items.
+        """
+        entity = selection.column_descriptions[0]["entity"]
+
+        ids, total_item_count = await model_loader(db).load_page(selection, page_size)
+        return cls(
+            items=[ModelRef.to(entity, id) for id in ids],
+            total_item_count=total_item_count,
+            total_page_count=_page_count(total_item_count, page_size),
+            page_index=1,
+            page_size=page_size
+        )
 
 
 class ModelDetail(BaseModel, Generic[TModel]):
@@ -45,6 +127,111 @@ class ModelDetail(BaseModel, Generic[TModel]):
             **kwargs,
         )
 
+    @classmethod
+    async def _hydrate(
+        cls,
+        field_name: str,
+        load: Callable[[], Awaitable[T]],
+        ref: Callable[[], Awaitable[R]] | None = None
+    ) -> T | R | None:
+        """
+        Loads the value of a nested field, or returns `None` without loading
+        if the field was not selected by the current request.
+
+        If `ref` is provided, the field is a relation which is only loaded
+        if it was expanded by the current request. Otherwise the
+        reference is returned.
+        """
+        selection = current_field_selection()
+        if not selection.is_selected(field_name):
+            return None
+        if ref is not None and not selection.is_expanded(field_name):
+            return await ref()
+
+        token = _field_selection.set(selection.child(field_name))
+        try:
+            return await load()
+        finally:
+            _field_selection.reset(token)
+
+    @classmethod
+    async def _hydrate_index(
+        cls,
+        field_name: str,
+        index_cls: type[TIndexPage],
+        db: LocalSession,
+        selection: Select[tuple[Any]],
+    ) -> TIndexPage | ModelRefIndexPage | None:
+        """
+        Hydrates a nested index page of the selection.
+        """
+        return await cls._hydrate(
+            field_name,
+            lambda: index_cls.from_selection(db, selection),
+            ref=lambda: ModelRefIndexPage.from_selection(db, selection)
+        )
+
+    @classmethod
+    async def _hydrate_ref(
+        cls,
+        field_name: str,
+        model_type: type[Base],
+        id: UUID | None,
+        load: Callable[[], Awaitable[T]],
+    ) -> T | ModelRef | None:
+        """
+        Hydrates a nested detail of the model with the given id.
+        """
+        async def ref():
+            return ModelRef.to(model_type, id) if id is not None else None
+
+        return await cls._hydrate(field_name, load, ref=ref)
+
+    @classmethod
+    def _freshness_selections(cls, model: TModel) -> list[Select[tuple[Any]]]:
+        """
+        Selections of the child models which are hydrated by the detail.
+
+        The etag of the detail changes whenever a row of one of these selections
+        is created, updated or deleted.
+        """
+        return []
+
+    @classmethod
+    async def etag(cls, model: TModel, variant: str = "") -> str:
+        """
+        A weak etag for the detail of the model, built from the `updated_at` of the model
+        and the latest `updated_at` and count of each of its freshness selections.
+
+        The `variant` distinguishes the different representations of the same detail
+        (eg. with different fields selected).
+        """
+        db = local_object_session(model)
+
+        freshness = [f"{model.id}:{model.updated_at.isoformat()}", variant]
+
+        subqueries = []
+        for selection in cls._freshness_selections(model):
+            entity = selection.column_descriptions[0]["entity"]
+            subqueries.append(
+                selection.order_by(None)
+                .with_only_columns(
+                    func.max(entity.updated_at).label("updated_at"),
+                    func.count().label("count"),
+                    maintain_column_froms=True
+                )
+                .subquery()
+            )
+
+        if subqueries:
+            result = await db.execute(
+                select(*[c for sq in subqueries for c in (sq.c.updated_at, sq.c.count)])
+            )
+            freshness.extend(str(v) for v in result.one())
+
+        digest = hashlib.sha1("|".join(freshness).encode("utf-8")).hexdigest()
+        return f'W/"{digest}"'
+
     # TODO: pass db explicitly to from_model?
     #       (saves calling local_object_session as first line of every non-trivial from_model)
     @classmethod
@@ -79,17 +266,157 @@ class ModelUpdateRequest(ModelRequest[TModel], Generic[TModel]):
 TDetail = TypeVar("TDetail", bound=ModelDetail)
 
 
+class ModelBatchGetRequest(BaseModel):
+    """
+    Fetches the details of each of the models with the given ids.
+    """
+    ids: list[UUID] = Field(max_length=api_settings.api_batch_get_max_ids)
+
+_index_count_cache = create_count_cache(api_settings.api_count_cache_size)
+
+TIndexPage = TypeVar("TIndexPage", bound="ModelIndexPage")
+
+
+def encode_index_cursor(model: Base, page_index: int) -> str:
+    cursor = {"at": model.created_at.isoformat(), "id": str(model.id), "page": page_index}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("ascii")
+
+
+def decode_index_cursor(cursor: str) -> tuple[datetime, UUID, int]:
+    """
+    The `(created_at, id)` key of the last item of a page and the index of the next page.
+    """
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(decoded["at"]), UUID(decoded["id"]), int(decoded.get("page", 2))
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail=f"Invalid index cursor '{cursor}'")
+
+
+def _is_cursor_descending(selection: Select[Any], entity: Any) -> bool:
+    """
+    Whether the selection is ordered by descending rather than ascending
+    `(created_at, id)`. A cursor can only seek through selections which are
+    unordered or ordered by creation.
+    """
+    order_by: list[tuple[ColumnElement[Any], bool]] = []
+    for clause in selection._order_by_clauses:
+        if isinstance(clause, UnaryExpression) and clause.modifier in (operators.asc_op, operators.desc_op):
+            order_by.append((clause.element, clause.modifier is operators.desc_op))
+        else:
+            order_by.append((clause, False))
+
+    if not order_by:
+        return False
+
+    cursor_key = [entity.created_at.__clause_element__(), entity.id.__clause_element__()]
+    descending = order_by[0][1]
+    if len(order_by) <= len(cursor_key) and all(
+        column.compare(key) and desc == descending
+        for (column, desc), key in zip(order_by, cursor_key)
+    ):
+        return descending
+
+    raise HTTPException(
+        HTTPStatus.BAD_REQUEST,
+        detail="Cursor pagination is only supported for indexes ordered by creation",
+    )
+
+
 class ModelIndexPage(BaseModel, Generic[TModel, TDetail]):
     items: list[TDetail]
-    total_item_count: int
-    total_page_count: int
+    total_item_count: int | None = None
+    total_page_count: int | None = None
     page_index: int
     page_size: int
 
+    # True if the total item count is the planner's estimate of the count
+    total_is_estimate: bool = False
+
+    # The cursor of the next page, when the page was fetched in cursor mode.
+    next_cursor: str | None = None
+
     @classmethod
     async def item_from_model(cls, item: TModel):
         raise NotImplementedError
 
+    @classmethod
+    async def _items_from_models(cls, models: list[TModel]) -> list[TDetail]:
+        """
+        Hydrates the items of the page. Each item is hydrated concurrently
+        against its own fork of the session of the items. The lookups made
+        by the `ModelLoader` of each fork are batched together by the loader
+        of the session of the items.
+        """
+        if not models:
+            return []
+
+        db = async_object_session(models[0])
+
+        def hydrate_item(model: TModel):
+            async def load(fork: LocalSession):
+                return await cls.item_from_model(await adopt(fork, model))
+            return load
+
+        selection = current_field_selection()
+        token = _field_selection.set(selection.items())
+        try:
+            if not isinstance(db, LocalSession):
+                return [await cls.item_from_model(item) for item in models]
+            return await gather_forked(db, *[hydrate_item(m) for m in models])
+        finally:
+            _field_selection.reset(token)
+
+    @classmethod
+    async def from_items(
+        cls,
+        items: list[TModel],
+        page_size: int = 20,
+    ) -> Self:
+        """
+        Creates the first page of an index from an already loaded list of items
+        (eg. the items fetched for the relationship by a `ModelLoader`)
+        """
+        return cls(
+            items=await cls._items_from_models(items[:page_size]),
+            total_item_count=len(items),
+            total_page_count=_page_count(len(items), page_size),
+            page_index=1,
+            page_size=page_size,
+        )
+
+    @classmethod
+    async def from_ids(
+        cls,
+        db: LocalSession,
+        model_type: type[TModel],
+        ids: list[UUID],
+    ) -> Self:
+        """
+        Creates a single page containing the detail of each of the models
+        with the given ids, in the order of the ids.
+
+        Ids which do not identify a model are omitted from the page.
+        """
+        ids = list(dict.fromkeys(ids))
+        models = await db.scalars(
+            select(model_type).where(
+                model_type.id == any_(
+                    bindparam("ids", ids, type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True)))
+                )
+            )
+        )
+        models_by_id = {m.id: m for m in models}
+        items = [models_by_id[id] for id in ids if id in models_by_id]
+
+        return cls(
+            items=await cls._items_from_models(items),
+            total_item_count=len(items),
+            total_page_count=1,
+            page_index=1,
+            page_size=len(ids),
+        )
+
     @classmethod
     async def from_selection(
         cls,
@@ -97,31 +424,92 @@ class ModelIndexPage(BaseModel, Generic[TModel, TDetail]):
         selection: Select[tuple[TModel]],
         page_size: int = 20,
         page_index: int = 1,
+        after: str | None = None,
+        include_total: bool = True,
     ) -> Self:
+        """
+        Fetches a page of the selection.
+
+        If `after` is provided (the empty string selects the first page), the page
+        is fetched in cursor mode, seeking to the `(created_at, id)` key encoded
+        in the cursor rather than counting and offsetting into the selection.
+        Cursor mode follows the direction of the selection's ordering, which must
+        be by creation.
+
+        If `include_total` is `False`, the selection is not counted and the
+        page totals are omitted.
+        """
+        if after is not None:
+            return await cls._from_selection_after(db, selection, page_size, after)
+
         if page_index <= 0:
             raise IndexError("Pages are 1-indexed")
 
-        total_item_count = (
-            await db.scalar(
-                selection.order_by(None).with_only_columns(
-                    func.count(), maintain_column_froms=True
-                ),
+        total_item_count: int | None = None
+        total_page_count: int | None = None
+        total_is_estimate = False
+        if include_total:
+            total_item_count, total_is_estimate = await count_selection(
+                db,
+                selection,
+                cache=_index_count_cache,
+                estimate_threshold=api_settings.api_count_estimate_threshold,
             )
-            or 0
-        )
-        total_page_count = total_item_count // page_size
+            total_page_count = _page_count(total_item_count, page_size)
 
         selection = selection.offset((page_index - 1) * page_size).limit(
             page_size
         )
 
-        item_responses = [cls.item_from_model(item) for item in await db.scalars(selection)]
-        items = await asyncio.gather(*item_responses)
+        items = await cls._items_from_models(list(await db.scalars(selection)))
 
         return cls(
             items=items,
             total_item_count=total_item_count,
             total_page_count=total_page_count,
+            total_is_estimate=total_is_estimate,
+            page_index=page_index,
+            page_size=page_size,
+        )
+
+    @classmethod
+    async def _from_selection_after(
+        cls,
+        db: LocalSession,
+        selection: Select[tuple[TModel]],
+        page_size: int,
+        after: str,
+    ) -> Self:
+        entity = selection.column_descriptions[0]["entity"]
+        descending = _is_cursor_descending(selection, entity)
+
+        if descending:
+            selection = selection.order_by(None).order_by(entity.created_at.desc(), entity.id.desc())
+        else:
+            selection = selection.order_by(None).order_by(entity.created_at, entity.id)
+
+        page_index = 1
+        if after:
+            after_at, after_id, page_index = decode_index_cursor(after)
+            cursor_key = tuple_(entity.created_at, entity.id)
+            after_key = tuple_(literal(after_at), literal(after_id))
+            selection = selection.where(
+                cursor_key < after_key if descending else cursor_key > after_key
+            )
+
+        # Fetch one more than the page to determine whether there is a next page
+        models = list(await db.scalars(selection.limit(page_size + 1)))
+        if len(models) > page_size:
+            models = models[:page_size]
+            next_cursor = encode_index_cursor(models[-1], page_index + 1)
+        else:
+            next_cursor = None
+
+        items = await cls._items_from_models(models)
+
+        return cls(
+            items=items,
             page_index=page_index,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, override
 from uuid import UUID
 
 from db import LocalSession, local_object_session
+from db.loader import model_loader
 from db.models.equipment import (
     EquipmentInstallation,
 )
@@ -38,6 +39,8 @@ TParams = TypeVar("TParams", bound=EquipmentProvisionParams)
 
 
 class EquipmentInstallationProvisionDetail(LabInstallationProvisionDetail[EquipmentInstallation, TParams], Generic[TParams]):
+    equipment_id: UUID
+
     @classmethod
     @override
     async def _from_lab_provision(
@@ -265,10 +268,15 @@ class EquipmentInstallationDetail(LabInstallationDetail[EquipmentInstallation]):
         async def index(db: LocalSession):
             return await EquipmentLeaseIndexPage.from_selection(
                 db,
-                query_equipment_leases(installation=installation.id, only_pending=True),
+                cls._select_allocations(installation),
             )
         return index
 
+    @classmethod
+    @override
+    def _select_allocations(cls, installation: LabInstallation[Any]):
+        return query_equipment_leases(installation=installation.id, only_pending=True)
+
 
     @classmethod
     @override
@@ -284,7 +292,10 @@ class EquipmentInstallationDetail(LabInstallationDetail[EquipmentInstallation]):
         cls,
         model: EquipmentInstallation,
     ):
-        equipment_ = await model.awaitable_attrs.equipment
+        loader = model_loader(local_object_session(model))
+        equipment_ = await loader.load(Equipment, model.equipment_id)
+        if equipment_ is None:
+            raise TypeError("Installation has no equipment")
 
         return await cls._from_lab_installation(
             model,
@@ -11,14 +11,16 @@ from fastapi import HTTPException
 from sqlalchemy import not_, select
 
 from db import LocalSession, local_object_session
+from db.loader import model_loader
 from db.models.base.base import model_id
 from db.models.equipment.equipment import query_equipments
-from db.models.equipment.equipment_installation import query_equipment_installations
+from db.models.equipment.equipment_installation import EquipmentInstallation, query_equipment_installations
 from db.models.lab import Lab
 from db.models.lab.provisionable import ProvisionStatus
 from db.models.equipment import (
     Equipment,
 )
+from db.models.software import Software
 from db.models.uni.campus import Campus
 from db.models.uni.discipline import Discipline
 from db.models.user import User
@@ -31,6 +33,8 @@ from ..base_schemas import (
     ModelUpdateRequest,
     ModelDetail,
     ModelLookup,
+    ModelRef,
+    ModelRefIndexPage,
 )
 
 from api.schemas.software import SoftwareDetail
@@ -49,26 +53,47 @@ class EquipmentDetail(ModelDetail[Equipment]):
 
     disciplines: list[Discipline]
 
-    installations: EquipmentInstallationIndexPage
+    installations: EquipmentInstallationIndexPage | ModelRefIndexPage | None = None
 
-    packaged_software: SoftwareDetail | None
+    packaged_software: SoftwareDetail | ModelRef | None = None
 
 
+    @classmethod
+    @override
+    def _freshness_selections(cls, model: Equipment):
+        return [
+            query_equipment_installations(equipment=model),
+            select(Software).where(Software.id == model.packaged_software_id),
+        ]
+
     @classmethod
     async def from_model(cls, model: Equipment):
         from .equipment_installation_schemas import EquipmentInstallationIndexPage, EquipmentInstallationDetail
-        db = local_object_session(model)
+        loader = model_loader(local_object_session(model))
 
-        installations = await EquipmentInstallationIndexPage.from_selection(
-            db,
-            query_equipment_installations(equipment=model),
-        )
+        async def load_installations():
+            return await EquipmentInstallationIndexPage.from_items(
+                await loader.load_related(EquipmentInstallation.equipment_id, model.id),
+            )
 
-        software_model = await model.awaitable_attrs.packaged_software
-        if software_model:
-            packaged_software = await SoftwareDetail.from_model(software_model)
-        else:
-            packaged_software = None
+        async def installation_refs():
+            return ModelRefIndexPage.from_models(
+                await loader.load_related(EquipmentInstallation.equipment_id, model.id),
+            )
+
+        async def load_packaged_software():
+            software_model = await loader.load(Software, model.packaged_software_id)
+            if software_model:
+                return await SoftwareDetail.from_model(software_model)
+            return None
+
+        installations = await cls._hydrate("installations", load_installations, ref=installation_refs)
+        packaged_software = await cls._hydrate_ref(
+            "packaged_software",
+            Software,
+            model.packaged_software_id,
+            load_packaged_software
+        )
 
         return cls(
             id=cast(UUID, model.id),
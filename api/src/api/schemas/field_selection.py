@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import HTTPException
+from humps import decamelize
+
+from api.settings import api_settings
+
+
+class FieldSelection:
+    """
+    The (possibly nested) fields of a detail which were requested by the client.
+
+    A selection is built from the `fields` and `exclude` query parameters,
+    each of which is a comma separated list of (dotted) field paths.
+    eg. `fields=name,supervisors.name&exclude=storages`
+
+    Paths traverse index pages transparently, so `supervisors.name`
+    selects the name of each of the items of the `supervisors` page.
+
+    Nested relations are returned as references unless the relation is
+    expanded by the `expand` query parameter, a list of dotted paths
+    which may be nested at most `api_expand_max_depth` levels deep.
+    eg. `expand=supervised_labs.supervisors`
+    """
+
+    def __init__(
+        self,
+        includes: dict[str, FieldSelection] | None = None,
+        excludes: dict[str, FieldSelection | None] | None = None,
+        expands: dict[str, Any] | None = None,
+    ):
+        # If `None`, all fields are included
+        self.includes = includes
+        # Maps excluded fields to `None`, or to the fields excluded from the nested detail.
+        self.excludes = excludes or {}
+        # Maps expanded fields to the expansions of the nested detail
+        self.expands: dict[str, Any] = expands or {}
+
+    @classmethod
+    def from_params(
+        cls,
+        fields: str | None,
+        exclude: str | None,
+        expand: str | None = None,
+    ) -> FieldSelection:
+        selection = FieldSelection()
+        for path in _split_paths(fields):
+            selection._include(path)
+        for path in _split_paths(exclude):
+            selection._exclude(path)
+        for path in _split_paths(expand):
+            expand_depth = len([segment for segment in path if segment != "items"])
+            if expand_depth > api_settings.api_expand_max_depth:
+                raise HTTPException(
+                    HTTPStatus.BAD_REQUEST,
+                    detail=f"Cannot expand '{'.'.join(path)}'. Maximum expansion depth is {api_settings.api_expand_max_depth}"
+                )
+            expands = selection.expands
+            for segment in path:
+                expands = expands.setdefault(segment, {})
+        return selection
+
+    def _include(self, path: list[str]):
+        head, *rest = path
+        if self.includes is None:
+            self.includes = {}
+        child = self.includes.setdefault(head, FieldSelection())
+        if rest:
+            child._include(rest)
+
+    def _exclude(self, path: list[str]):
+        head, *rest = path
+        if not rest:
+            self.excludes[head] = None
+            return
+        if head in self.excludes and self.excludes[head] is None:
+            return
+        child = self.excludes.setdefault(head, FieldSelection())
+        assert child is not None
+        child._exclude(rest)
+
+    def is_selected(self, field_name: str) -> bool:
+        if field_name in self.excludes and self.excludes[field_name] is None:
+            return False
+        return self.includes is None or field_name in self.includes
+
+    def is_expanded(self, field_name: str) -> bool:
+        return field_name in self.expands
+
+    def child(self, field_name: str) -> FieldSelection:
+        """
+        The selection of the fields of the nested detail
+        """
+        includes = None
+        if self.includes is not None and field_name in self.includes:
+            includes = self.includes[field_name].includes
+
+        nested_excludes = self.excludes.get(field_name)
+        excludes = nested_excludes.excludes if nested_excludes else {}
+        return FieldSelection(includes, excludes, self.expands.get(field_name))
+
+    def items(self) -> FieldSelection:
+        """
+        The selection of the items of an index page.
+
+        An explicit `items` path segment is accepted, but not required.
+        """
+        includes = self.includes
+        if includes is not None and "items" in includes:
+            includes = includes["items"].includes
+
+        excludes = self.excludes
+        nested_excludes = excludes.get("items")
+        if nested_excludes is not None:
+            excludes = nested_excludes.excludes
+
+        expands = self.expands.get("items", self.expands)
+        return FieldSelection(includes, excludes, expands)
+
+
+def _split_paths(paths: str | None) -> list[list[str]]:
+    if not paths:
+        return []
+    return [
+        [decamelize(segment.strip()) for segment in path.split(".")]
+        for path in paths.split(",")
+        if path.strip()
+    ]
+
+
+ALL_FIELDS = FieldSelection()
+
+_field_selection: ContextVar[FieldSelection] = ContextVar(
+    "field_selection", default=ALL_FIELDS
+)
+
+
+def current_field_selection() -> FieldSelection:
+    return _field_selection.get()
+
+
+async def select_fields(
+    fields: str | None = None,
+    exclude: str | None = None,
+    expand: str | None = None,
+):
+    """
+    Dependency which sets the fields selected by the current request.
+    """
+    _field_selection.set(FieldSelection.from_params(fields, exclude, expand))
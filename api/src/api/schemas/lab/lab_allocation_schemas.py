@@ -63,7 +63,7 @@ class LabAllocationDetail(ModelDetail[TAllocation], Generic[TAllocation]):
 
     is_finalised: bool
     finalised_at: datetime | None
-    finalised_by_id: str | None
+    finalised_by_id: UUID | None
 
     @classmethod
     async def _from_lab_allocation(cls, model: LabAllocation[Any], **kwargs):
@@ -98,9 +98,12 @@ class LabAllocationDetail(ModelDetail[TAllocation], Generic[TAllocation]):
             approved_by_id=model.approved_by_id,
             is_approved=model.is_approved,
 
-            setup_at=model.setup_begin_at,
+            setup_begin_at=model.setup_begin_at,
             setup_by_id=model.setup_by_id,
 
+            prepared_at=model.prepared_at,
+            is_prepared=model.is_prepared,
+
             commenced_at=model.commenced_at,
             commenced_by_id=model.commenced_by_id,
             is_commenced=model.is_commenced,
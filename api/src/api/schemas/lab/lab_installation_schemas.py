@@ -17,7 +17,7 @@ from db.models.lab.provisionable import LabProvision
 from db.models.uni.funding import Budget
 from db.models.user import User
 
-from ..base_schemas import ModelCreateRequest, ModelDetail, ModelIndexPage, ModelRequestContextError, ModelUpdateRequest
+from ..base_schemas import ModelCreateRequest, ModelDetail, ModelIndexPage, ModelRefIndexPage, ModelRequestContextError, ModelUpdateRequest
 from .lab_provision_schemas import LabProvisionCreateRequest, LabProvisionDetail, LabProvisionIndexPage
 from .lab_allocation_schemas import LabAllocationDetail
 
@@ -29,15 +29,20 @@ class LabInstallationDetail(ModelDetail[TInstallation], Generic[TInstallation]):
     type: str
     lab_id: UUID
 
-    active_provisions: LabProvisionIndexPage
+    active_provisions: LabProvisionIndexPage | ModelRefIndexPage | None = None
     allocation_type: str
-    active_allocations: ModelIndexPage[LabAllocation, Any]
+    active_allocations: ModelIndexPage[LabAllocation, Any] | ModelRefIndexPage | None = None
 
     @classmethod
     @abstractmethod
     def _allocation_index_from_installation(cls, installation: LabInstallation[Any]) -> Callable[[LocalSession], Awaitable[ModelIndexPage[Any, Any]]]:
         ...
 
+    @classmethod
+    @abstractmethod
+    def _select_allocations(cls, installation: LabInstallation[Any]) -> Select[tuple[LabAllocation[Any]]]:
+        ...
+
     @classmethod
     @abstractmethod
     def _select_provisions(cls, installation: LabInstallation[Any]) -> Select[tuple[LabProvision[TInstallation, Any]]]:
@@ -50,10 +55,16 @@ class LabInstallationDetail(ModelDetail[TInstallation], Generic[TInstallation]):
         db = local_object_session(lab_installation)
 
         allocation_index = cls._allocation_index_from_installation(lab_installation)
-        active_allocations = await allocation_index(db)
-        active_provisions = await LabProvisionIndexPage.from_selection(
+        active_allocations = await cls._hydrate(
+            "active_allocations",
+            lambda: allocation_index(db),
+            ref=lambda: ModelRefIndexPage.from_selection(db, cls._select_allocations(lab_installation))
+        )
+        active_provisions = await cls._hydrate_index(
+            "active_provisions",
+            LabProvisionIndexPage,
             db,
-            cls._select_provisions(lab_installation)
+            cls._select_provisions(lab_installation),
         )
 
         return await cls._from_base(
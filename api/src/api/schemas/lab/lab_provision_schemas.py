@@ -10,7 +10,8 @@ from fastapi import Depends
 from api.auth.context import (
     get_current_authenticated_user,
 )
-from db import LocalSession, get_db
+from db import LocalSession, get_db, local_object_session
+from db.loader import model_loader
 from db.models.lab.lab import Lab
 from db.models.lab.provisionable import (
     Provisionable,
@@ -19,14 +20,16 @@ from db.models.lab.provisionable import (
     ProvisionTransition,
 )
 from db.models.user import User
-from db.models.uni.funding import Budget
+from db.models.uni.funding import Budget, Purchase
 
 from .lab_work_schemas import LabWorkDetail
 from api.schemas.uni import PurchaseDetail, PurchaseOrderCreate, PurchaseOrderDetail
+from api.schemas.uni.funding_schemas import BudgetSummary
 from ..base_schemas import (
     ModelCreateRequest,
     ModelDetail,
     ModelIndexPage,
+    ModelRef,
     ModelRequestContextError,
     ModelUpdateRequest,
 )
@@ -54,7 +57,7 @@ class LabProvisionDetail(PurchaseOrderDetail, Generic[TProvisionable, TParams]):
     budget_id: UUID | None
     purchase: PurchaseDetail | None
 
-    work: LabWorkDetail | None
+    work: LabWorkDetail | None = None
 
     requested_by_id: UUID
     requested_at: datetime
@@ -99,7 +102,18 @@ class LabProvisionDetail(PurchaseOrderDetail, Generic[TProvisionable, TParams]):
         action_params: TParams,
         **kwargs
     ):
-        purchase = await PurchaseDetail.from_model(await lab_provision.awaitable_attrs.purchase)
+        loader = model_loader(local_object_session(lab_provision))
+        purchase_model = await loader.load(Purchase, lab_provision.purchase_id)
+        if purchase_model:
+            purchase = await PurchaseDetail.from_model(purchase_model)
+        else:
+            purchase = None
+
+        async def load_budget():
+            budget_model = await loader.load(Budget, lab_provision.budget_id)
+            return await BudgetSummary.from_model(budget_model) if budget_model else None
+
+        budget = await cls._hydrate_ref("budget", Budget, lab_provision.budget_id, load_budget)
 
         return await cls._from_base(
             lab_provision,
@@ -110,6 +124,9 @@ class LabProvisionDetail(PurchaseOrderDetail, Generic[TProvisionable, TParams]):
             lab_id=lab_provision.lab_id,
 
             budget_id=lab_provision.budget_id,
+            budget=budget,
+            ordered_by_id=lab_provision.created_by_id,
+            estimated_cost=lab_provision.estimated_cost,
             purchase=purchase,
             requested_by_id=lab_provision.requested_by_id,
             requested_at=lab_provision.requested_at,
@@ -7,6 +7,7 @@ from pydantic import Field
 from sqlalchemy import select
 
 from db import LocalSession, local_object_session
+from db.loader import model_loader
 from db.models.lab.disposable.lab_disposal import query_lab_disposals
 from db.models.lab.lab import query_labs
 from db.models.lab.storable.lab_storage import query_lab_storages
@@ -19,7 +20,7 @@ from db.models.user import User, query_users
 from api.schemas.user import UserDetail, UserIndexPage
 from api.schemas.uni import CampusDetail
 
-from ..base_schemas import ModelLookup, ModelIndexPage, ModelDetail
+from ..base_schemas import ModelLookup, ModelIndexPage, ModelDetail, ModelRef, ModelRefIndexPage
 from .lab_storage_schemas import LabStorageIndexPage
 from .lab_disposal_schemas import LabDisposalIndexPage
 
@@ -27,29 +28,51 @@ from .lab_disposal_schemas import LabDisposalIndexPage
 class LabDetail(ModelDetail[Lab]):
     id: UUID
     discipline: Discipline
-    campus: CampusDetail
+    campus: CampusDetail | ModelRef | None = None
 
-    supervisors: UserIndexPage
+    supervisors: UserIndexPage | ModelRefIndexPage | None = None
 
-    storages: LabStorageIndexPage
-    disposals: LabDisposalIndexPage
+    storages: LabStorageIndexPage | ModelRefIndexPage | None = None
+    disposals: LabDisposalIndexPage | ModelRefIndexPage | None = None
+
+    @classmethod
+    @override
+    def _freshness_selections(cls, model: Lab):
+        return [
+            select(Campus).where(Campus.id == model.campus_id),
+            query_users(supervises_lab=model),
+            query_lab_storages(lab=model),
+            query_lab_disposals(lab=model),
+        ]
 
     @classmethod
     async def from_model(cls, model: Lab) -> LabDetail:
         db = local_object_session(model)
 
-        campus = await CampusDetail.from_model(await model.awaitable_attrs.campus)
+        async def load_campus():
+            campus_model = await model_loader(db).load(Campus, model.campus_id)
+            if campus_model is None:
+                raise TypeError("Lab has no campus")
+            return await CampusDetail.from_model(campus_model)
+
+        campus = await cls._hydrate_ref("campus", Campus, model.campus_id, load_campus)
 
-        supervisors = await UserIndexPage.from_selection(
+        supervisors = await cls._hydrate_index(
+            "supervisors",
+            UserIndexPage,
             db,
             query_users(supervises_lab=model),
         )
 
-        lab_storages = await LabStorageIndexPage.from_selection(
+        lab_storages = await cls._hydrate_index(
+            "storages",
+            LabStorageIndexPage,
             db,
             query_lab_storages(lab=model),
         )
-        lab_disposals = await LabDisposalIndexPage.from_selection(
+        lab_disposals = await cls._hydrate_index(
+            "disposals",
+            LabDisposalIndexPage,
             db,
             query_lab_disposals(lab=model),
         )
@@ -11,7 +11,7 @@ from db.models.lab.storable import (
     query_lab_storage_containers,
 )
 
-from ..base_schemas import ModelDetail, ModelIndexPage
+from ..base_schemas import ModelDetail, ModelIndexPage, ModelRefIndexPage
 
 
 class LabStorageStrategyDetail(ModelDetail[LabStorageStrategy]):
@@ -48,14 +48,16 @@ class LabStorageDetail(ModelDetail[LabStorage]):
 
     strategy: LabStorageStrategyDetail
 
-    items: LabStorageContainerIndexPage
+    items: LabStorageContainerIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def from_model(cls, model: LabStorage):
         db = local_object_session(model)
         strategy = await model.awaitable_attrs.strategy
 
-        items = await LabStorageContainerIndexPage.from_selection(
+        items = await cls._hydrate_index(
+            "items",
+            LabStorageContainerIndexPage,
             db,
             query_lab_storage_containers(storage=model_id(model)),
         )
@@ -7,7 +7,7 @@ from db.models.material import MaterialAllocation, Material, MaterialInventory,
 from db.models.material.material_allocation import query_material_allocations, query_material_consumptions, query_material_productions
 
 from api.schemas.lab import LabAllocationDetail
-from ..base_schemas import ModelDetail, ModelIndexPage
+from ..base_schemas import ModelDetail, ModelIndexPage, ModelRefIndexPage
 
 class MaterialProductionDetail(ModelDetail[MaterialProduction]):
     output_material_id: UUID
@@ -61,19 +61,23 @@ class MaterialAllocationDetail(LabAllocationDetail[MaterialAllocation]):
     is_input: bool
     is_output: bool
 
-    productions: MaterialProductionIndexPage
-    consumptions: MaterialConsumptionIndexPage
+    productions: MaterialProductionIndexPage | ModelRefIndexPage | None = None
+    consumptions: MaterialConsumptionIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def from_model(cls, model: MaterialAllocation):
         db = local_object_session(model)
         material: Material = await model.awaitable_attrs.material
 
-        productions = await MaterialProductionIndexPage.from_selection(
+        productions = await cls._hydrate_index(
+            "productions",
+            MaterialProductionIndexPage,
             db,
             query_material_productions(output_material=model.id),
         )
-        consumptions = await MaterialConsumptionIndexPage.from_selection(
+        consumptions = await cls._hydrate_index(
+            "consumptions",
+            MaterialConsumptionIndexPage,
             db,
             query_material_consumptions(input_material=model.id),
         )
@@ -10,6 +10,7 @@ class MaterialInventoryDetail(ModelDetail[MaterialInventory]):
     material_name: str
 
     unit_of_measurement: str
+    estimated_quantity: float
 
     @classmethod
     async def from_model(cls, model: MaterialInventory):
@@ -19,7 +20,8 @@ class MaterialInventoryDetail(ModelDetail[MaterialInventory]):
             model,
             material_id=material.id,
             material_name=material.name,
-            unit_of_measurement=material.unit_of_measurement
+            unit_of_measurement=material.unit_of_measurement,
+            estimated_quantity=model.estimated_quantity,
         )
 
 
@@ -5,7 +5,7 @@ from db.models.material import Material, query_materials
 from db.models.material.material_inventory import query_material_inventories
 
 
-from ..base_schemas import ModelDetail, ModelIndexPage
+from ..base_schemas import ModelDetail, ModelIndexPage, ModelRefIndexPage
 from .material_inventory_schemas import MaterialInventoryIndexPage, MaterialInventoryIndexPage
 
 
@@ -13,17 +13,19 @@ class MaterialDetail(ModelDetail[Material]):
     name: str
     unit_of_measurement: str
 
-    inventories: MaterialInventoryIndexPage
+    inventories: MaterialInventoryIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def from_model(cls, model: Material):
         db = local_object_session(model)
-        inventories = MaterialInventoryIndexPage.from_selection(
+        inventories = await cls._hydrate_index(
+            "inventories",
+            MaterialInventoryIndexPage,
             db,
-            query_material_inventories(material=model.id)
+            query_material_inventories(material=model.id),
         )
 
-        return cls._from_base(
+        return await cls._from_base(
             model,
             name=model.name,
             unit_of_measurement=model.unit_of_measurement,
@@ -6,10 +6,12 @@ from typing import TYPE_CHECKING, Any, Coroutine, Optional, override
 from uuid import UUID, uuid4
 
 from pydantic import Field
-from sqlalchemy import Select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import LocalSession, local_object_session
+from db.forks import gather_forked
+from db.loader import model_loader
 from db.models.base.errors import DoesNotExist
 from db.models.equipment.equipment_lease import query_equipment_leases
 from db.models.lab.lab import Lab
@@ -32,6 +34,8 @@ from ..base_schemas import (
     ModelCreateRequest,
     ModelUpdateRequest,
     ModelLookup,
+    ModelRef,
+    ModelRefIndexPage,
 )
 
 from api.schemas.uni import (
@@ -176,57 +180,105 @@ class ResearchPlanDetail(ModelDetail[ResearchPlan]):
     description: str
     discipline: Discipline
 
-    funding: FundingDetail
+    funding: FundingDetail | ModelRef | None = None
 
-    researcher: UserDetail
-    coordinator: UserDetail
+    researcher: UserDetail | ModelRef | None = None
+    coordinator: UserDetail | ModelRef | None = None
     lab_id: UUID
 
-    tasks: ResearchPlanTaskIndexPage
-    attachments: ResearchPlanAttachmentIndexPage
+    tasks: ResearchPlanTaskIndexPage | ModelRefIndexPage | None = None
+    attachments: ResearchPlanAttachmentIndexPage | ModelRefIndexPage | None = None
 
-    equipment_leases: EquipmentLeaseIndexPage
-    software_leases: SoftwareLeaseIndexPage
-    input_materials: MaterialAllocationIndexPage
-    output_materials: MaterialAllocationIndexPage
+    equipment_leases: EquipmentLeaseIndexPage | ModelRefIndexPage | None = None
+    software_leases: SoftwareLeaseIndexPage | ModelRefIndexPage | None = None
+    input_materials: MaterialAllocationIndexPage | ModelRefIndexPage | None = None
+    output_materials: MaterialAllocationIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
-    async def from_model(cls, model: ResearchPlan) -> ResearchPlanDetail:
-        db = local_object_session(model)
-
-        funding = await FundingDetail.from_model(
-            await model.awaitable_attrs.funding
-        )
-        researcher = await UserDetail.from_model(await model.awaitable_attrs.researcher)
-        coordinator = await UserDetail.from_model(
-            await model.awaitable_attrs.coordinator
-        )
-
-        tasks = await ResearchPlanTaskIndexPage.from_selection(
-            db,
+    @override
+    def _freshness_selections(cls, model: ResearchPlan):
+        return [
+            select(Funding).where(Funding.id == model.funding_id),
+            select(User).where(User.id.in_([model.researcher_id, model.coordinator_id])),
             query_research_plan_tasks(plan=model),
-        )
-        attachments = await ResearchPlanAttachmentIndexPage.from_selection(
-            db,
             query_research_plan_attachments(plan=model.id),
-        )
-
-        equipment_leases = await EquipmentLeaseIndexPage.from_selection(
-            db,
             query_equipment_leases(consumer=model),
-        )
-        software_leases = await SoftwareLeaseIndexPage.from_selection(
-            db,
             query_software_leases(consumer=model),
-        )
+            query_material_allocations(consumer=model),
+        ]
 
-        input_materials = await MaterialAllocationIndexPage.from_selection(
-            db,
-            query_material_allocations(consumer=model, only_inputs=True),
-        )
-        output_materials = await MaterialAllocationIndexPage.from_selection(
+    @classmethod
+    async def from_model(cls, model: ResearchPlan) -> ResearchPlanDetail:
+        db = local_object_session(model)
+
+        async def load_funding(fork: LocalSession):
+            funding_model = await model_loader(fork).load(Funding, model.funding_id)
+            if funding_model is None:
+                raise TypeError("Research plan has no funding")
+            return await FundingDetail.from_model(funding_model)
+
+        async def load_user(fork: LocalSession, user_id: UUID):
+            user_model = await model_loader(fork).load(User, user_id)
+            if user_model is None:
+                raise TypeError(f"Research plan user {user_id} does not exist")
+            return await UserDetail.from_model(user_model)
+
+        def hydrate_index(field_name: str, index_cls: type[ModelIndexPage], selection: Select):
+            return lambda fork: cls._hydrate_index(field_name, index_cls, fork, selection)
+
+        # The sub-resources of the plan are independent, so each is
+        # hydrated concurrently against its own fork of the session.
+        (
+            funding,
+            researcher,
+            coordinator,
+            tasks,
+            attachments,
+            equipment_leases,
+            software_leases,
+            input_materials,
+            output_materials,
+        ) = await gather_forked(
             db,
-            query_material_allocations(consumer=model, only_inputs=True),
+            lambda fork: cls._hydrate_ref(
+                "funding", Funding, model.funding_id, lambda: load_funding(fork)
+            ),
+            lambda fork: cls._hydrate_ref(
+                "researcher", User, model.researcher_id, lambda: load_user(fork, model.researcher_id)
+            ),
+            lambda fork: cls._hydrate_ref(
+                "coordinator", User, model.coordinator_id, lambda: load_user(fork, model.coordinator_id)
+            ),
+            hydrate_index(
+                "tasks",
+                ResearchPlanTaskIndexPage,
+                query_research_plan_tasks(plan=model),
+            ),
+            hydrate_index(
+                "attachments",
+                ResearchPlanAttachmentIndexPage,
+                query_research_plan_attachments(plan=model.id),
+            ),
+            hydrate_index(
+                "equipment_leases",
+                EquipmentLeaseIndexPage,
+                query_equipment_leases(consumer=model),
+            ),
+            hydrate_index(
+                "software_leases",
+                SoftwareLeaseIndexPage,
+                query_software_leases(consumer=model),
+            ),
+            hydrate_index(
+                "input_materials",
+                MaterialAllocationIndexPage,
+                query_material_allocations(consumer=model, only_inputs=True),
+            ),
+            hydrate_index(
+                "output_materials",
+                MaterialAllocationIndexPage,
+                query_material_allocations(consumer=model, only_outputs=True),
+            ),
         )
 
         return await super()._from_base(
@@ -0,0 +1,8 @@
+__all__ = (
+    "SearchHit",
+    "SearchResultPage",
+    "TypeaheadItem",
+    "TagCount",
+)
+
+from .search_schemas import SearchHit, SearchResultPage, TypeaheadItem, TagCount
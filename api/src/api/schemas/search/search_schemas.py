@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import Select
+
+from db import LocalSession
+from db.models.search import query_search_documents, query_search_facets
+
+from ..base_schemas import BaseModel, ModelRef
+
+
+class SearchHit(ModelRef):
+    title: str
+    rank: float
+
+
+class SearchResultPage(BaseModel):
+    items: list[SearchHit]
+    # The number of matching documents of each type, regardless of the type filter.
+    facets: dict[str, int]
+    total_item_count: int
+    page_index: int
+    page_size: int
+
+    @classmethod
+    async def from_search(
+        cls,
+        db: LocalSession,
+        search: str,
+        types: list[str] | None = None,
+        page_index: int = 1,
+        page_size: int = 20,
+    ) -> SearchResultPage:
+        facets = {
+            doc_type: count
+            for doc_type, count in await db.execute(query_search_facets(search))
+        }
+
+        hits = await db.execute(
+            query_search_documents(search, types=types)
+            .offset((page_index - 1) * page_size)
+            .limit(page_size)
+        )
+
+        return cls(
+            items=[
+                SearchHit(id=doc_id, type=doc_type, title=title, rank=rank)
+                for doc_type, doc_id, title, rank in hits
+            ],
+            facets=facets,
+            total_item_count=sum(
+                count for doc_type, count in facets.items()
+                if not types or doc_type in types
+            ),
+            page_index=page_index,
+            page_size=page_size,
+        )
+
+
+class TypeaheadItem(ModelRef):
+    label: str
+    similarity: float
+
+    @classmethod
+    async def from_selection(
+        cls,
+        db: LocalSession,
+        model_type: str,
+        selection: Select[tuple[UUID, str, float]],
+    ) -> list[TypeaheadItem]:
+        return [
+            cls(id=id, type=model_type, label=label, similarity=similarity)
+            for id, label, similarity in await db.execute(selection)
+        ]
+
+
+class TagCount(BaseModel):
+    tag: str
+    item_count: int
+
+    @classmethod
+    async def from_selection(
+        cls,
+        db: LocalSession,
+        selection: Select[tuple[str, int]],
+    ) -> list[TagCount]:
+        return [
+            cls(tag=tag, item_count=item_count)
+            for tag, item_count in await db.execute(selection)
+        ]
@@ -1,7 +1,8 @@
 from typing import Any, Generic, TypeVar, cast, override
 from uuid import UUID
 
-from db import LocalSession
+from db import LocalSession, local_object_session
+from db.loader import model_loader
 from db.models.lab.installable.lab_installation import LabInstallation
 from db.models.lab.provisionable.lab_provision import LabProvision
 from db.models.uni.funding import Budget
@@ -43,10 +44,15 @@ class SoftwareInstallationDetail(LabInstallationDetail[SoftwareInstallation]):
         async def index(db: LocalSession):
             return await SoftwareLeaseIndexPage.from_selection(
                 db,
-                query_software_leases(installation=cast(SoftwareInstallation, installation), only_pending=True),
+                cls._select_allocations(installation),
             )
         return index
 
+    @classmethod
+    @override
+    def _select_allocations(cls, installation: LabInstallation[Any]):
+        return query_software_leases(installation=cast(SoftwareInstallation, installation), only_pending=True)
+
     @classmethod
     @override
     def _select_provisions(cls, installation: LabInstallation[Any]):
@@ -57,11 +63,14 @@ class SoftwareInstallationDetail(LabInstallationDetail[SoftwareInstallation]):
         cls,
         model: SoftwareInstallation,
     ):
-        software: Software = await model.awaitable_attrs.software
+        loader = model_loader(local_object_session(model))
+        software = await loader.load(Software, model.software_id)
+        if software is None:
+            raise TypeError("Installation has no software")
 
         return await cls._from_lab_installation(
             model,
-            software=model.software_id,
+            software_id=model.software_id,
             software_name=software.name,
             installed_version=model.installed_version
         )
@@ -5,11 +5,12 @@ from uuid import UUID, uuid4
 
 from pydantic import Field
 from db import LocalSession, local_object_session
+from db.loader import model_loader
 from db.models.equipment.equipment import Equipment
 from db.models.software import Software, query_softwares
-from db.models.software.software_installation import query_software_installations
+from db.models.software.software_installation import SoftwareInstallation
 from db.models.user import User
-from ..base_schemas import ModelCreateRequest, ModelDetail, ModelIndexPage, ModelRequestContextError, ModelUpdateRequest
+from ..base_schemas import ModelCreateRequest, ModelDetail, ModelIndexPage, ModelRefIndexPage, ModelRequestContextError, ModelUpdateRequest
 
 if TYPE_CHECKING:
     from .software_installation_schemas import SoftwareInstallationIndexPage
@@ -23,17 +24,24 @@ class SoftwareDetail(ModelDetail[Software]):
     requires_license: bool
     is_paid_software: bool
 
-    installations: SoftwareInstallationIndexPage
+    installations: SoftwareInstallationIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def from_model(cls, model: Software):
         from .software_installation_schemas import SoftwareInstallationIndexPage, SoftwareInstallationDetail
-        db = local_object_session(model)
+        loader = model_loader(local_object_session(model))
 
-        installations = SoftwareInstallationIndexPage.from_selection(
-            db,
-            query_software_installations(software=model),
-        )
+        async def load_installations():
+            return await SoftwareInstallationIndexPage.from_items(
+                await loader.load_related(SoftwareInstallation.software_id, model.id),
+            )
+
+        async def installation_refs():
+            return ModelRefIndexPage.from_models(
+                await loader.load_related(SoftwareInstallation.software_id, model.id),
+            )
+
+        installations = await cls._hydrate("installations", load_installations, ref=installation_refs)
 
         return await cls._from_base(
             model,
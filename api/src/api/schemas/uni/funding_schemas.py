@@ -24,6 +24,8 @@ from ..base_schemas import (
     ModelDetail,
     ModelLookup,
     ModelIndexPage,
+    ModelRef,
+    ModelRefIndexPage,
 )
 
 
@@ -102,7 +104,7 @@ class PurchaseDetail(ModelDetail[Purchase]):
     async def from_model(cls, model: Purchase):
         return await super()._from_base(
             model,
-            budget=model.budget_id,
+            budget_id=model.budget_id,
             purchase_order_type=model.purchase_order_type,
             purchase_order_id=model.purchase_order_id,
             index=model.index,
@@ -115,8 +117,10 @@ class PurchaseDetail(ModelDetail[Purchase]):
             is_ready=model.is_ready,
             paid_by_id=model.paid_by_id,
             paid_at=model.paid_at,
+            is_paid=model.is_paid,
             reviewed_by_id=model.reviewed_by_id,
             reviewed_at=model.reviewed_at,
+            is_reviewed=model.is_reviewed,
             is_finalised=model.is_finalised
         )
 
@@ -156,12 +160,14 @@ class BudgetSummary(ModelDetail[Budget]):
 
 
 class BudgetDetail(BudgetSummary):
-    purchases: PurchaseIndexPage
+    purchases: PurchaseIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def _from_research_budget(cls, model: Budget, **kwargs) -> Self:
         db = local_object_session(model)
-        purchases = await PurchaseIndexPage.from_selection(
+        purchases = await cls._hydrate_index(
+            "purchases",
+            PurchaseIndexPage,
             db,
             query_purchases(budget=model),
         )
@@ -179,7 +185,7 @@ class BudgetIndexPage(ModelIndexPage[Budget, BudgetDetail]):
 
 
 class PurchaseOrderDetail(ModelDetail[PurchaseOrder]):
-    budget: BudgetSummary
+    budget: BudgetSummary | ModelRef | None = None
 
     ordered_by_id: UUID
     estimated_cost: float
@@ -194,10 +200,11 @@ class PurchaseOrderDetail(ModelDetail[PurchaseOrder]):
             await purchase_order.get_or_create_purchase()
         )
 
-        return cls._from_base(
+        return await cls._from_base(
             purchase_order,
             budget=budget,
             ordered_by_id=purchase_order.created_by_id,
+            estimated_cost=purchase_order.estimated_cost,
             purchase=purchase
         )
 
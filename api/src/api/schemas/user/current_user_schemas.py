@@ -13,6 +13,7 @@ from db.models.lab import Lab
 from api.schemas.lab import LabDetail, LabIndexPage
 from api.schemas.research import ResearchPlanDetail, ResearchPlanIndexPage
 
+from ..base_schemas import ModelRefIndexPage
 from .user_schemas import UserDetail
 
 
@@ -22,19 +23,23 @@ class CurrentUserDetail(UserDetail):
     Includes extra attributes relevant only to the current user
     """
 
-    supervised_labs: LabIndexPage
-    plans: ResearchPlanIndexPage
+    supervised_labs: LabIndexPage | ModelRefIndexPage | None = None
+    plans: ResearchPlanIndexPage | ModelRefIndexPage | None = None
 
     @classmethod
     async def from_model(cls, model: User) -> CurrentUserDetail:
         db = local_object_session(model)
 
-        supervised_labs = await LabIndexPage.from_selection(
+        supervised_labs = await cls._hydrate_index(
+            "supervised_labs",
+            LabIndexPage,
             db,
             query_labs(supervised_by=model.id),
         )
 
-        plans = await ResearchPlanIndexPage.from_selection(
+        plans = await cls._hydrate_index(
+            "plans",
+            ResearchPlanIndexPage,
             db,
             query_research_plans(coordinator=model_id(model)),
         )
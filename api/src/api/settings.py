@@ -6,9 +6,46 @@ class ApiSettings(BaseSettings):
 
     api_page_size_default: int = 20
 
+    # The maximum number of index page counts to cache.
+    api_count_cache_size: int = 1024
+    # Unfiltered indexes of tables with more than this number of (estimated)
+    # rows report the planner's estimate as the total item count.
+    api_count_estimate_threshold: int = 100_000
+
+    # The maximum depth of nested relations which can be expanded by a request.
+    api_expand_max_depth: int = 3
+
+    # The number of rows fetched from the server side cursor at a time when exporting.
+    api_export_yield_per: int = 500
+
+    # The maximum number of ids which can be fetched by a single batch-get request.
+    api_batch_get_max_ids: int = 100
+
+    # The maximum number of suggestions returned by a typeahead request.
+    api_typeahead_max_limit: int = 50
+
+    # The maximum number of catalogue index responses to cache in process.
+    api_response_cache_size: int = 256
+    # The number of seconds a cached catalogue index response is served for.
+    # Cached responses are also discarded when a write to any table they read is committed.
+    api_response_cache_ttl_seconds: float = 60.0
+
+    # Requests which execute the same statement (up to its parameters) more than
+    # this number of times are logged as likely N+1 queries.
+    api_query_repeat_threshold: int = 10
+
+    # Users with this role can access the admin routes and the exports.
+    # Lab techs are the only users assigned a role by the seeds.
+    api_admin_role: str = "lab-tech"
+
     api_auth_secret_key: str = "abcdef12345"
     api_auth_access_token_expire_minutes: int = 86400
 
+    # The maximum number of authenticated access tokens to cache.
+    api_auth_principal_cache_size: int = 4096
+    # The number of seconds the user authenticated by an access token is cached for.
+    api_auth_principal_cache_ttl_seconds: float = 300.0
+
     user_temporary_access_token_expire_minutes: int = 86400
 
 
@@ -4,6 +4,7 @@ import json
 from alembic import command
 from alembic.config import Config
 import debugpy
+from fastapi import Request
 from fastapi.encoders import jsonable_encoder
 
 from sqlalchemy.ext.asyncio import (
@@ -13,19 +14,47 @@ from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     async_object_session,
 )
+from sqlalchemy import text
 from sqlalchemy.dialects import postgresql
 
+from .changes import on_tables_committed
+from .pool_metrics import InstrumentedQueuePool
+from .replicas import ReplicaRouter, RoutingSession, route_to_replica
 from .settings import DbSettings
 
 db_settings = DbSettings()
 url = db_settings.db_url
 
-engine = create_async_engine(
-    url,
-    json_serializer=lambda d: json.dumps(jsonable_encoder(d)),
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        json_serializer=lambda d: json.dumps(jsonable_encoder(d)),
+        poolclass=InstrumentedQueuePool,
+        pool_size=db_settings.db_pool_size,
+        max_overflow=db_settings.db_max_overflow,
+        pool_timeout=db_settings.db_pool_timeout,
+        pool_recycle=db_settings.db_pool_recycle,
+        pool_pre_ping=db_settings.db_pool_pre_ping,
+    )
+
+
+engine = _create_engine(url)
+
+replica_router = ReplicaRouter(
+    [
+        _create_engine(replica_url).execution_options(postgresql_readonly=True)
+        for replica_url in db_settings.db_replica_urls
+    ],
+    retry_seconds=db_settings.db_replica_retry_seconds,
+    lag_seconds=db_settings.db_replica_lag_seconds,
 )
 
 
+@on_tables_committed
+def _read_primary_after_commit(tables: set[str]):
+    replica_router.note_commit()
+
+
 class LocalSession(AsyncSession):
     """
     An async session that is local to the current api request.
@@ -35,7 +64,18 @@ class LocalSession(AsyncSession):
 
 
 local_sessionmaker = async_sessionmaker(
-    engine, class_=LocalSession, expire_on_commit=False
+    engine,
+    class_=LocalSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+)
+
+# Sessions which are only used to read, which run in read only transactions.
+readonly_sessionmaker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=LocalSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
 )
 
 
@@ -46,8 +86,11 @@ def local_object_session(obj) -> LocalSession:
     return session
 
 
-async def get_db():
+async def get_db(request: Request):
     db = local_sessionmaker()
+    if request.method in ("GET", "HEAD"):
+        # Sessions of read requests read from a replica until they write
+        route_to_replica(db.sync_session, replica_router, replica_router.choose())
     try:
         yield db
     finally:
@@ -100,6 +143,7 @@ def _import_models():
     import db.models.research.plan
     import db.models.software
     import db.models.equipment
+    import db.models.search
 
 async def init_db():
     from db.models.base import Base
@@ -107,6 +151,7 @@ async def init_db():
     alembic_cfg = _get_alembic_config()
 
     async with engine.begin() as db:
+        await db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await create_db_types(db)
         await db.run_sync(Base.metadata.create_all)
         command.stamp(alembic_cfg, "head")
@@ -0,0 +1,91 @@
+"""
+Tracks the tables written to by each session and notifies listeners
+once the writes have been committed.
+
+Used to invalidate process local caches of query results.
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+TablesCommittedListener = Callable[[set[str]], None]
+
+_tables_committed_listeners: list[TablesCommittedListener] = []
+
+# Incremented whenever a write to the table is committed.
+_table_versions: dict[str, int] = {}
+
+
+def on_tables_committed(listener: TablesCommittedListener) -> TablesCommittedListener:
+    """
+    Registers a listener which will be called with the names of the tables
+    written by a session whenever the session commits.
+    """
+    _tables_committed_listeners.append(listener)
+    return listener
+
+
+def table_versions(tables: Iterable[str]) -> tuple[int, ...]:
+    """
+    The versions of the tables, in order of table name.
+
+    A cache should record the versions of the tables read by a result
+    before reading it, and not store the result if the versions have changed
+    by the time it is read (as a write may have been committed in between).
+    """
+    return tuple(_table_versions.get(t, 0) for t in sorted(tables))
+
+
+def table_versions_snapshot() -> dict[str, int]:
+    """
+    The versions of every table, for a cache which only learns which tables
+    a result was read from once the result has been read.
+    """
+    return dict(_table_versions)
+
+
+def _written_tables(session: Session) -> set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session: Session, flush_context: UOWTransaction):
+    written = _written_tables(session)
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        mapper = getattr(obj, "__mapper__", None)
+        if mapper is not None:
+            written.update(t.name for t in mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed_tables(orm_execute_state: ORMExecuteState):
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if name is not None:
+        _written_tables(orm_execute_state.session).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_tables_committed(session: Session):
+    written = session.info.pop("written_tables", None)
+    if not written:
+        return
+    for table in written:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+    for listener in _tables_committed_listeners:
+        listener(set(written))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tables(session: Session):
+    session.info.pop("written_tables", None)
@@ -0,0 +1,140 @@
+"""
+A cache of the row counts of selections, invalidated whenever one
+of the tables read by a cached selection is written.
+
+A count which was computed while a write to one of its tables was
+committed is not stored.
+
+The cache is local to the process, so only observes writes which
+are committed by sessions of the current process.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import Select, Table, func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.visitors import iterate
+
+from .changes import on_tables_committed, table_versions
+
+if TYPE_CHECKING:
+    from db import LocalSession
+
+
+class SelectionCount(NamedTuple):
+    item_count: int
+    is_estimate: bool
+
+
+def selection_tables(selection: Select[Any]) -> set[str]:
+    return {
+        element.name for element in iterate(selection) if isinstance(element, Table)
+    }
+
+
+def _selection_cache_key(selection: Select[Any]) -> str:
+    compiled = selection.compile(dialect=postgresql.dialect())
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return f"{compiled}\n{params!r}"
+
+
+class CountCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._counts: OrderedDict[str, tuple[SelectionCount, set[str]]] = OrderedDict()
+
+    def get(self, key: str) -> SelectionCount | None:
+        try:
+            self._counts.move_to_end(key)
+            return self._counts[key][0]
+        except KeyError:
+            return None
+
+    def put(self, key: str, count: SelectionCount, tables: set[str], versions: tuple[int, ...]):
+        if table_versions(tables) != versions:
+            return
+        self._counts[key] = (count, tables)
+        self._counts.move_to_end(key)
+        while len(self._counts) > self.max_size:
+            self._counts.popitem(last=False)
+
+    def invalidate(self, tables: set[str]):
+        stale = [k for k, (_, ts) in self._counts.items() if ts & tables]
+        for k in stale:
+            del self._counts[k]
+
+    def clear(self):
+        self._counts.clear()
+
+
+async def estimate_table_count(db: LocalSession, table: str) -> int:
+    """
+    The planner's estimate of the number of rows in the table.
+    Returns -1 if the table has never been analyzed.
+    """
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": table},
+    )
+    return -1 if estimate is None else int(estimate)
+
+
+async def count_selection(
+    db: LocalSession,
+    selection: Select[Any],
+    cache: CountCache | None = None,
+    estimate_threshold: int | None = None,
+) -> SelectionCount:
+    """
+    Count the rows of the selection.
+
+    If the selection is an unfiltered selection of a single table and
+    the planner estimates that the table has more than `estimate_threshold`
+    rows, the estimate is returned instead of an exact count.
+    """
+    count_selection = selection.order_by(None).with_only_columns(
+        func.count(), maintain_column_froms=True
+    )
+    tables = selection_tables(selection)
+
+    key = _selection_cache_key(count_selection)
+    versions = table_versions(tables)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    result: SelectionCount | None = None
+    if (
+        estimate_threshold is not None
+        and selection.whereclause is None
+        and len(tables) == 1
+    ):
+        estimate = await estimate_table_count(db, next(iter(tables)))
+        if estimate > estimate_threshold:
+            result = SelectionCount(estimate, is_estimate=True)
+
+    if result is None:
+        count = await db.scalar(count_selection) or 0
+        result = SelectionCount(count, is_estimate=False)
+
+    if cache is not None:
+        cache.put(key, result, tables, versions)
+    return result
+
+
+_count_caches: list[CountCache] = []
+
+
+def create_count_cache(max_size: int) -> CountCache:
+    cache = CountCache(max_size)
+    _count_caches.append(cache)
+    return cache
+
+
+@on_tables_committed
+def _invalidate_count_caches(tables: set[str]):
+    for cache in _count_caches:
+        cache.invalidate(tables)
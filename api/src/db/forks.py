@@ -0,0 +1,160 @@
+"""
+Concurrent reads against sibling sessions of a request session.
+
+An `AsyncSession` cannot run more than one statement at a time, so
+independent loads made against the request session are run one after
+another. A fork is a short lived, read only session which runs on its
+own pooled connection, so independent loads made against forks of the
+request session run concurrently.
+
+The number of forks of a request session which are in flight at the
+same time is bounded by `db_fork_max_concurrency`, and the number of forks
+of all request sessions which hold a connection at the same time is bounded
+by `db_fork_pool_slots` (see `fork_slots`).
+
+The forks of a request session share an identity cache, so a model
+which has been loaded by one fork (or by the request session itself)
+is copied into the other forks without being loaded again.
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_object_session
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from db import LocalSession, db_settings, readonly_sessionmaker, replica_router
+from db.replicas import is_pinned_to_primary, route_to_replica
+
+T = TypeVar("T")
+
+SessionLoad = Callable[[LocalSession], Awaitable[T]]
+
+
+_fork_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+def fork_slots() -> asyncio.Semaphore:
+    """
+    The process wide bound on the connections held by forks, shared by every
+    request session running on the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _fork_slots.get(loop)
+    if slots is None:
+        slots = _fork_slots[loop] = asyncio.Semaphore(db_settings.db_fork_pool_slots)
+    return slots
+
+
+class SessionForks:
+    """
+    The forks of a single request session.
+    """
+
+    def __init__(self, root: LocalSession, max_concurrency: int):
+        self.root = root
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._identity_cache: dict[Any, Any] = {}
+
+    async def run(self, load: SessionLoad[T]) -> T:
+        async with self._semaphore, fork_slots():
+            async with readonly_sessionmaker() as fork:
+                fork.info["fork_of"] = self.root
+                fork.info["session_forks"] = self
+                if not is_pinned_to_primary(self.root.sync_session):
+                    route_to_replica(fork.sync_session, replica_router, self.root.info.get("replica_engine"))
+                return await load(fork)
+
+    def get_shared(self, key: Any) -> Any | None:
+        """
+        A model with the identity key which has been loaded by the
+        request session or by any of its forks.
+        """
+        shared = self._identity_cache.get(key)
+        if shared is None:
+            shared = self.root.sync_session.identity_map.get(key)
+        return shared
+
+    def share(self, models: Iterable[Any]):
+        for model in models:
+            self._identity_cache[identity_key(instance=model)] = model
+
+    def clear(self):
+        self._identity_cache.clear()
+
+
+def is_fork(db: LocalSession) -> bool:
+    return "fork_of" in db.info
+
+
+def has_pending_writes(db: LocalSession) -> bool:
+    """
+    Whether the session has written (or is about to write) changes which have
+    not yet been committed, and so would not be visible to a fork of the session.
+    """
+    return bool(db.new or db.dirty or db.deleted or db.info.get("written_tables"))
+
+
+def shared_model(db: LocalSession, key: Any) -> Any | None:
+    """
+    A model with the identity key which was loaded by another fork of the
+    same request session, or `None` if the session has no forks.
+    """
+    forks = db.info.get("session_forks")
+    if forks is None:
+        return None
+    return forks.get_shared(key)
+
+
+def share_models(db: LocalSession, models: Iterable[Any]):
+    """
+    Makes the models available to the other forks of the same request session.
+    """
+    forks = db.info.get("session_forks")
+    if forks is not None:
+        forks.share(models)
+
+
+async def adopt(db: LocalSession, model: T) -> T:
+    """
+    The copy of the model in the session. The model must be unmodified.
+    """
+    if async_object_session(model) is db:
+        return model
+    return await db.merge(model, load=False)
+
+
+def session_forks(db: LocalSession) -> SessionForks:
+    forks = db.info.get("session_forks")
+    if forks is None:
+        forks = db.info["session_forks"] = SessionForks(
+            db, db_settings.db_fork_max_concurrency
+        )
+    return forks
+
+
+async def gather_forked(db: LocalSession, *loads: SessionLoad[T]) -> list[T]:
+    """
+    Runs each of the loads concurrently, each against its own fork of the session.
+
+    Loads are run one after another against the session itself if the session is
+    already a fork (so that a fork never waits on the forks of its own loads)
+    or if the session has uncommitted writes.
+    """
+    if is_fork(db) or has_pending_writes(db):
+        return [await load(db) for load in loads]
+
+    forks = session_forks(db)
+    return list(await asyncio.gather(*[forks.run(load) for load in loads]))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_shared_identities(session: Session):
+    forks = session.info.get("session_forks")
+    if forks is not None and "fork_of" not in session.info:
+        forks.clear()
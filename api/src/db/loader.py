@@ -0,0 +1,206 @@
+"""
+A request scoped loader which batches model lookups.
+
+Detail schemas hydrate their relationships one model at a time, which
+means an index page of N items issues N queries for each relationship
+on the item. The loader collects the lookups made by all concurrently
+hydrating items and resolves each kind of lookup with a single
+`IN (...)` query on the next tick of the event loop.
+
+An `AsyncSession` does not support concurrent operations, so the queries
+of the different kinds of lookup are issued one after another.
+
+The forks of a request session (see `db.forks`) batch their lookups with
+the loader of the request session, so that items which are hydrated on
+separate forks are still loaded together. The loaded models are adopted
+into the fork which requested them.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Hashable, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, event, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.orm.util import identity_key
+
+from db.forks import adopt, share_models, shared_model
+
+if TYPE_CHECKING:
+    from db import LocalSession
+    from db.models.base import Base
+
+TModel = TypeVar("TModel", bound="Base")
+
+
+class _Batch:
+    def __init__(self):
+        self.futures: dict[Any, asyncio.Future] = {}
+
+
+class _PageSelection:
+    """
+    The first page of ids of a selection. Each call to `load_page` is its
+    own lookup, so instances are compared by identity.
+    """
+    def __init__(self, selection: Select[Any], limit: int):
+        self.selection = selection
+        self.limit = limit
+
+
+class ModelLoader:
+    """
+    Batches primary key and foreign key lookups made against a single session.
+    """
+
+    def __init__(self, db: LocalSession, batch_loader: ModelLoader | None = None):
+        self.db = db
+        # The loader which batches and issues the lookups made against this loader.
+        self.batch_loader = batch_loader or self
+        self._batches: dict[Hashable, _Batch] = {}
+        # Keyed by the (possibly aliased) model type, column name and key.
+        self._related_cache: dict[tuple[Any, str, Any], list[Any]] = {}
+        self._dispatch_lock = asyncio.Lock()
+
+    def clear(self):
+        self._related_cache.clear()
+
+    def _enqueue(self, batch_key: Hashable, key: Any, dispatch) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = self._batches[batch_key] = _Batch()
+            loop.call_soon(self._schedule_dispatch, batch_key, dispatch)
+
+        if key not in batch.futures:
+            batch.futures[key] = loop.create_future()
+        return batch.futures[key]
+
+    def _schedule_dispatch(self, batch_key: Hashable, dispatch):
+        batch = self._batches.pop(batch_key)
+        asyncio.ensure_future(self._run_dispatch(batch, dispatch))
+
+    async def _run_dispatch(self, batch: _Batch, dispatch):
+        try:
+            async with self._dispatch_lock:
+                results = await dispatch(list(batch.futures.keys()))
+        except Exception as e:
+            for f in batch.futures.values():
+                if not f.done():
+                    f.set_exception(e)
+            return
+        for key, f in batch.futures.items():
+            if not f.done():
+                f.set_result(results.get(key))
+
+    async def load(self, model_type: type[TModel], id: UUID | None) -> TModel | None:
+        """
+        Load the model with the given id, or `None` if no such model exists.
+        """
+        if id is None:
+            return None
+
+        key = identity_key(model_type, id)
+        existing = self.db.sync_session.identity_map.get(key)
+        if existing is not None:
+            return existing
+
+        shared = shared_model(self.db, key)
+        if shared is not None:
+            return await adopt(self.db, shared)
+
+        batch_loader = self.batch_loader
+
+        async def dispatch(ids: list[UUID]):
+            models = list(await batch_loader.db.scalars(
+                select(model_type).where(model_type.id.in_(ids))
+            ))
+            share_models(batch_loader.db, models)
+            return {m.id: m for m in models}
+
+        model = await batch_loader._enqueue(("load", model_type), id, dispatch)
+        if model is None:
+            return None
+        return await adopt(self.db, model)
+
+    async def load_related(self, column: InstrumentedAttribute, key: UUID) -> list[Any]:
+        """
+        Load all models where the (foreign key) column is equal to the key.
+        The models are returned in creation order.
+        """
+        model_type = column.class_
+        cache_key = (model_type, column.key)
+        batch_loader = self.batch_loader
+
+        models = batch_loader._related_cache.get((*cache_key, key))
+        if models is None:
+            async def dispatch(keys: list[UUID]):
+                models = await batch_loader.db.scalars(
+                    select(model_type)
+                    .where(column.in_(keys))
+                    .order_by(model_type.created_at)
+                )
+                grouped: dict[Any, list[Any]] = defaultdict(list)
+                for m in models:
+                    grouped[getattr(m, column.key)].append(m)
+
+                results = {k: grouped.get(k, []) for k in keys}
+                for k, ms in results.items():
+                    batch_loader._related_cache[(*cache_key, k)] = ms
+                return results
+
+            models = await batch_loader._enqueue(("load_related", *cache_key), key, dispatch)
+
+        if batch_loader is self:
+            return models
+        return [await adopt(self.db, m) for m in models]
+
+    async def load_page(self, selection: Select[Any], limit: int) -> tuple[list[UUID], int]:
+        """
+        Load the ids of the first `limit` models of the selection (in the order
+        of the selection) and the count of the selection. The pages of all
+        concurrent lookups are fetched together as the columns of a single row.
+        """
+        batch_loader = self.batch_loader
+
+        async def dispatch(pages: list[_PageSelection]):
+            columns = []
+            for page in pages:
+                entity = page.selection.column_descriptions[0]["entity"]
+                ids = page.selection.with_only_columns(entity.id).limit(page.limit)
+                count = select(func.count()).select_from(page.selection.order_by(None).subquery())
+                columns.extend([
+                    func.array(ids.scalar_subquery(), type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True))),
+                    count.scalar_subquery(),
+                ])
+            row = (await batch_loader.db.execute(select(*columns))).one()
+            return {
+                page: (list(row[2 * i]), row[2 * i + 1])
+                for i, page in enumerate(pages)
+            }
+
+        return await batch_loader._enqueue(("load_page",), _PageSelection(selection, limit), dispatch)
+
+
+def model_loader(db: LocalSession) -> ModelLoader:
+    """
+    The loader associated with the session.
+    """
+    loader = db.info.get("model_loader")
+    if loader is None:
+        root = db.info.get("fork_of")
+        batch_loader = model_loader(root) if root is not None else None
+        loader = db.info["model_loader"] = ModelLoader(db, batch_loader)
+    return loader
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_loader_cache(session: Session, *args: Any):
+    loader = session.info.get("model_loader")
+    if loader is not None:
+        loader.clear()
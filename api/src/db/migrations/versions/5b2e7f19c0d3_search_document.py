@@ -0,0 +1,42 @@
+"""search document
+
+Revision ID: 5b2e7f19c0d3
+Revises: d81b5e0c4a96
+Create Date: 2024-10-18 10:41:09.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from db.models.search import refresh_statements, searchable_types
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e7f19c0d3'
+down_revision: Union[str, None] = 'd81b5e0c4a96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('search_document',
+    sa.Column('doc_type', postgresql.VARCHAR(length=32), nullable=False),
+    sa.Column('doc_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.TEXT(), nullable=False),
+    sa.Column('document', postgresql.TSVECTOR(), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"), nullable=True),
+    sa.PrimaryKeyConstraint('doc_type', 'doc_id')
+    )
+    op.create_index('ix_search_document_document', 'search_document', ['document'], unique=False, postgresql_using='gin')
+
+    for searchable in searchable_types().values():
+        for statement in refresh_statements(searchable):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_document_document', table_name='search_document', postgresql_using='gin')
+    op.drop_table('search_document')
@@ -0,0 +1,40 @@
+"""tag frequency
+
+Revision ID: 7a3d5c8e2b61
+Revises: c6a91d3e08f2
+Create Date: 2024-10-23 09:17:45.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from db.models.search import refresh_tag_frequency_statements, tagged_types
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d5c8e2b61'
+down_revision: Union[str, None] = 'c6a91d3e08f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tag_frequency',
+    sa.Column('item_type', postgresql.VARCHAR(length=32), nullable=False),
+    sa.Column('tag', sa.TEXT(), nullable=False),
+    sa.Column('item_count', sa.INTEGER(), nullable=False),
+    sa.PrimaryKeyConstraint('item_type', 'tag')
+    )
+    op.create_index('ix_tag_frequency_tag_prefix', 'tag_frequency', ['item_type', 'tag'], unique=False, postgresql_ops={'tag': 'text_pattern_ops'})
+
+    for tagged in tagged_types().values():
+        for statement in refresh_tag_frequency_statements(tagged):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_frequency_tag_prefix', table_name='tag_frequency', postgresql_ops={'tag': 'text_pattern_ops'})
+    op.drop_table('tag_frequency')
@@ -0,0 +1,61 @@
+"""trigram and prefix indexes
+
+Revision ID: 9e4c2a7b1f58
+Revises: 5b2e7f19c0d3
+Create Date: 2024-10-21 16:27:45.118390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c2a7b1f58'
+down_revision: Union[str, None] = '5b2e7f19c0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_trigram_indexes = [
+    ('equipment', 'name'),
+    ('user', 'name'),
+    ('user', 'email'),
+    ('uni_campus', 'name'),
+]
+
+_prefix_indexes = [
+    ('equipment', 'name'),
+    ('software', 'name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table, column in _trigram_indexes:
+        op.create_index(
+            f'ix_{table}_{column}_trgm',
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+    for table, column in _prefix_indexes:
+        op.create_index(
+            f'ix_{table}_{column}_prefix',
+            table,
+            [sa.text(f'lower({column}) text_pattern_ops')],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(_prefix_indexes):
+        op.drop_index(f'ix_{table}_{column}_prefix', table_name=table)
+
+    for table, column in reversed(_trigram_indexes):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
@@ -0,0 +1,69 @@
+"""index query builder foreign keys
+
+Revision ID: a3f1c9d2e7b4
+Revises: 334b0a27183f
+Create Date: 2024-10-14 09:12:37.214563
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d2e7b4'
+down_revision: Union[str, None] = '334b0a27183f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_foreign_key_indexes = [
+    ('equipment_installation', 'equipment_id'),
+    ('equipment_lease', 'installation_id'),
+    ('lab_allocation', 'lab_id'),
+    ('lab_allocation', 'consumer_id'),
+    ('lab_disposal', 'lab_id'),
+    ('lab_provision', 'lab_id'),
+    ('lab_storage', 'lab_id'),
+    ('lab_supervisor', 'user_id'),
+    ('material_allocation', 'inventory_id'),
+    ('material_consumption', 'input_material_id'),
+    ('material_inventory', 'material_id'),
+    ('output_material_production', 'output_material_id'),
+    ('research_plan', 'researcher_id'),
+    ('research_plan', 'funding_id'),
+    ('research_plan', 'coordinator_id'),
+    ('research_plan', 'lab_id'),
+    ('research_plan_attachment', 'plan_id'),
+    ('software_lease', 'installation_id'),
+    ('uni_budget', 'funding_id'),
+    ('uni_budget', 'lab_id'),
+]
+
+
+def upgrade() -> None:
+    for table, column in _foreign_key_indexes:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+    op.create_index(
+        'ix_lab_provision_provisionable',
+        'lab_provision',
+        ['provisionable_type', 'provisionable_id', 'created_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_uni_budget_research_plan_id',
+        'uni_budget',
+        ['research_plan_id'],
+        unique=False,
+        postgresql_where=sa.text('research_plan_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_uni_budget_research_plan_id', table_name='uni_budget')
+    op.drop_index('ix_lab_provision_provisionable', table_name='lab_provision')
+
+    for table, column in reversed(_foreign_key_indexes):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,37 @@
+"""array gin indexes
+
+Revision ID: c6a91d3e08f2
+Revises: 9e4c2a7b1f58
+Create Date: 2024-10-22 11:52:13.640871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a91d3e08f2'
+down_revision: Union[str, None] = '9e4c2a7b1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_array_indexes = [
+    ('equipment', 'tags'),
+    ('equipment', 'disciplines'),
+    ('software', 'tags'),
+    ('user', 'roles'),
+    ('user', 'disciplines'),
+]
+
+
+def upgrade() -> None:
+    for table, column in _array_indexes:
+        op.create_index(f'ix_{table}_{column}', table, [column], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table, column in reversed(_array_indexes):
+        op.drop_index(f'ix_{table}_{column}', table_name=table, postgresql_using='gin')
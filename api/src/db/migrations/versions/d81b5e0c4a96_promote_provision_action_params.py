@@ -0,0 +1,44 @@
+"""promote provision action params
+
+Revision ID: d81b5e0c4a96
+Revises: a3f1c9d2e7b4
+Create Date: 2024-10-16 14:03:51.829104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81b5e0c4a96'
+down_revision: Union[str, None] = 'a3f1c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_promoted_params = ['installation_id', 'equipment_id', 'destination_lab_id']
+
+
+def upgrade() -> None:
+    for param in _promoted_params:
+        op.add_column('lab_provision', sa.Column(param, postgresql.UUID(), nullable=True))
+
+    op.execute(
+        "UPDATE lab_provision SET "
+        + ", ".join(
+            f"{param} = NULLIF(action_params_json ->> '{param}', '')::uuid"
+            for param in _promoted_params
+        )
+    )
+
+    for param in _promoted_params:
+        op.create_index(op.f(f'ix_lab_provision_{param}'), 'lab_provision', [param], unique=False)
+
+
+def downgrade() -> None:
+    for param in reversed(_promoted_params):
+        op.drop_index(op.f(f'ix_lab_provision_{param}'), table_name='lab_provision')
+        op.drop_column('lab_provision', param)
@@ -0,0 +1,41 @@
+"""material inventory estimated quantity
+
+Revision ID: e2f8a6c14d37
+Revises: 7a3d5c8e2b61
+Create Date: 2024-10-24 14:06:31.752940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from db.models.material import recount_estimated_quantities
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f8a6c14d37'
+down_revision: Union[str, None] = '7a3d5c8e2b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_quantity_tables = [
+    'material_inventory_import',
+    'material_inventory_export',
+]
+
+
+def upgrade() -> None:
+    op.add_column('material_inventory', sa.Column('estimated_quantity', postgresql.FLOAT(), server_default='0', nullable=False))
+    for table in _quantity_tables:
+        op.create_index(f'ix_{table}_inventory_id_created_at', table, ['inventory_id', 'created_at'], unique=False)
+
+    op.execute(recount_estimated_quantities())
+
+
+def downgrade() -> None:
+    for table in reversed(_quantity_tables):
+        op.drop_index(f'ix_{table}_inventory_id_created_at', table_name=table)
+    op.drop_column('material_inventory', 'estimated_quantity')
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Select, select, or_
+from sqlalchemy import ForeignKey, Index, Select, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects import postgresql as psql
 
@@ -13,6 +13,7 @@ from db.models.base.base import model_id
 from db.models.fields import uuid_pk
 from db.models.lab import Lab, query_labs
 from db.models.lab.installable import LabInstallation, Installable
+from db.models.search import query_search_document_ids, trigram_index, prefix_index, istartswith
 from db.models.software import Software
 from db.models.uni.campus import Campus
 from db.models.uni.discipline import DISCIPLINE_ENUM, Discipline
@@ -25,12 +26,20 @@ if TYPE_CHECKING:
 
 class Equipment(Installable, Base):
     __tablename__ = "equipment"
+    __table_args__ = (
+        Index("ix_equipment_tags", "tags", postgresql_using="gin"),
+        Index("ix_equipment_disciplines", "disciplines", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid_pk] = mapped_column()
     name: Mapped[str] = mapped_column(psql.VARCHAR(128), index=True)
     description: Mapped[str] = mapped_column(psql.TEXT, default="")
 
-    tags: Mapped[list[str]] = mapped_column(psql.ARRAY(psql.TEXT), server_default="{}")
+    # Replaced tags which were never loaded are read before the flush, to maintain
+    # the tag frequencies (see `db.models.search.tag_frequency`).
+    tags: Mapped[list[str]] = mapped_column(
+        psql.ARRAY(psql.TEXT), server_default="{}"
+    )
     training_descriptions: Mapped[list[str]] = mapped_column(
         psql.ARRAY(psql.TEXT), server_default="{}"
     )
@@ -58,6 +67,10 @@ class Equipment(Installable, Base):
 
         return await EquipmentInstallation.get_for_installable_lab(db, self, lab)
 
+trigram_index(Equipment.name)
+prefix_index(Equipment.name)
+
+
 def query_equipments(
     search: str | None = None,
     name_eq: str | None = None,
@@ -71,12 +84,8 @@ def query_equipments(
     clauses: list = []
 
     if search:
-        # TODO: Implement full text search properly.
         clauses.append(
-            or_(
-                Equipment.name.ilike(f"%{search}%"),
-                Equipment.description.ilike(f"%{search}%")
-            )
+            Equipment.id.in_(query_search_document_ids(Equipment.__tablename__, search))
         )
 
     if (lab is not None) or (installed_campus is not None) or (installed_discipline is not None):
@@ -86,15 +95,15 @@ def query_equipments(
             installed_discipline=installed_discipline
         )
         clauses.append(Equipment.id.in_(
-            installations.select(EquipmentInstallation.equipment_id).scalar_subquery())
+            installations.with_only_columns(EquipmentInstallation.equipment_id).scalar_subquery())
         )
 
     if name_eq is not None:
         clauses.append(Equipment.name == name_eq)
     elif name_istartswith:
-        clauses.append(Equipment.name._ilike(f"{name_istartswith}%"))
+        clauses.append(istartswith(Equipment.name, name_istartswith))
 
     if has_tags:
-        clauses.append(*[Equipment.tags.contains(tag) for tag in has_tags])
+        clauses.append(Equipment.tags.contains(sorted(has_tags)))
 
     return select(Equipment).where(*clauses)
@@ -47,8 +47,8 @@ class NewEquipmentProvisionParams(EquipmentProvisionParams):
 def _new_equipment_params_to_json(params: NewEquipmentProvisionParams) -> dict[str, Any]:
     return {
         "action": "new_equipment",
-        "installation_id": params["installation_id"],
-        "equipment_id": params["equipment_id"],
+        "installation_id": str(params["installation_id"]),
+        "equipment_id": str(params["equipment_id"]),
         "num_required": params["num_required"]
     }
 
@@ -69,8 +69,8 @@ class TransferEquipmentParams(EquipmentProvisionParams):
 def _transfer_equipment_params_to_json(params: TransferEquipmentParams):
     return {
         "action": "equipment_transfer",
-        "equipment_id": params["equipment_id"],
-        "installation_id": params["installation_id"],
+        "equipment_id": str(params["equipment_id"]),
+        "installation_id": str(params["installation_id"]),
         "destination_lab_id": str(params["destination_lab_id"]),
         "num_transferred": int(params["num_transferred"])
     }
@@ -97,7 +97,7 @@ class EquipmentInstallation(LabInstallation[Equipment], Base):
         ForeignKey("lab_installation.id"), primary_key=True
     )
 
-    equipment_id: Mapped[UUID] = mapped_column(ForeignKey("equipment.id"))
+    equipment_id: Mapped[UUID] = mapped_column(ForeignKey("equipment.id"), index=True)
     equipment = relationship(Equipment, back_populates="equipment_installations")
 
     installed_model_name: Mapped[str] = mapped_column(psql.TEXT, default='')
@@ -159,8 +159,8 @@ class EquipmentInstallation(LabInstallation[Equipment], Base):
             "num_transferred": num_transferred
         }
 
-        return self.create_provision(
-            "new_equipment",
+        return await self.create_provision(
+            "transfer_equipment",
             params=params,
             lab=lab,
             budget=budget,
@@ -209,15 +209,12 @@ def query_equipment_installations(
 ) -> Select[tuple[EquipmentInstallation]]:
     where_clauses: list = []
 
-    if lab is not None:
-        if installed_discipline is not None:
-            lab = query_labs(discipline=installed_discipline)
-        elif installed_campus is not None:
-            lab = query_labs(campus=installed_campus)
+    if lab is None and (installed_campus is not None or installed_discipline is not None):
+        lab = query_labs(campus=installed_campus, discipline=installed_discipline)
 
     if isinstance(lab, Select):
         where_clauses.append(
-            EquipmentInstallation.lab_id.in_(lab.scalar_subquery())
+            EquipmentInstallation.lab_id.in_(lab.with_only_columns(Lab.id).scalar_subquery())
         )
     elif isinstance(lab, list):
         where_clauses.append(
@@ -255,17 +252,19 @@ def query_equipment_installation_provisions(
     ]
 
     if equipment:
-        installation = query_equipment_installations(equipment=equipment)
+        where_clauses.append(
+            LabProvision.equipment_id == model_id(equipment)
+        )
 
     if isinstance(installation, Select):
         where_clauses.append(
-            LabProvision.action_params_json["installation_id"].in_(
-                select(installation.c.id)
+            LabProvision.installation_id.in_(
+                installation.with_only_columns(EquipmentInstallation.id).scalar_subquery()
             )
         )
     elif installation is not None:
         where_clauses.append(
-            LabProvision.action_params_json["installation_id"].astext == str(model_id(installation))
+            LabProvision.installation_id == model_id(installation)
         )
 
     if action:
@@ -20,7 +20,7 @@ class EquipmentLease(LabAllocation[EquipmentInstallation]):
     id: Mapped[UUID] = mapped_column(ForeignKey("lab_allocation.id"), primary_key=True)
 
     installation_id: Mapped[UUID] = mapped_column(
-        ForeignKey("equipment_installation.id")
+        ForeignKey("equipment_installation.id"), index=True
     )
     installation: Mapped[EquipmentInstallation] = relationship()
 
@@ -72,11 +72,11 @@ class LabAllocation(Base, Generic[TAllocatable]):
         ALLOCATION_STATUS_ENUM, default=AllocationStatus.REQUESTED
     )
 
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
     lab: Mapped[Lab] = relationship()
 
     consumer_type: Mapped[str] = mapped_column(postgresql.VARCHAR(64))
-    consumer_id: Mapped[UUID] = mapped_column(ForeignKey("lab_allocation_consumer.id"))
+    consumer_id: Mapped[UUID] = mapped_column(ForeignKey("lab_allocation_consumer.id"), index=True)
     consumer: Mapped[LabAllocationConsumer] = relationship()
 
     start_date: Mapped[date | None] = mapped_column(postgresql.DATE, nullable=True)
@@ -271,6 +271,10 @@ class LabAllocation(Base, Generic[TAllocatable]):
     def prepared_at(self):
         return self.prepared['at'] if self.prepared else None
 
+    @property
+    def is_prepared(self):
+        return self.prepared is not None
+
     async def mark_as_prepared(self, note: str):
         if self.status != AllocationStatus.SETUP:
             raise AllocationStatusError(self.status, AllocationStatus.PREPARED, f"")
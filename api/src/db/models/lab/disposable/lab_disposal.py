@@ -30,7 +30,7 @@ class LabDisposal(Base):
     strategy_id: Mapped[UUID] = mapped_column(ForeignKey("disposal_strategy.id"))
     strategy: Mapped[DisposalStrategy] = relationship()
 
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
     lab: Mapped[Lab] = relationship(back_populates='disposals')
 
     @classmethod
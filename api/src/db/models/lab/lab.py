@@ -26,7 +26,7 @@ lab_supervisor = Table(
     "lab_supervisor",
     Base.metadata,
     Column("lab_id", ForeignKey("lab.id"), primary_key=True),
-    Column("user_id", ForeignKey("user.id"), primary_key=True),
+    Column("user_id", ForeignKey("user.id"), primary_key=True, index=True),
 )
 
 
@@ -129,8 +129,6 @@ def query_labs(
             lab_supervisor.c.user_id == model_id(supervised_by)
         )
 
-        Lab.id.in_(supervisors.scalar_subquery())
+        clauses.append(Lab.id.in_(supervisors.scalar_subquery()))
 
-    query = select(Lab).where(*clauses)
-    print('lab query', query)
-    return query
+    return select(Lab).where(*clauses)
@@ -7,7 +7,7 @@ from datetime import datetime, timezone, tzinfo
 from typing import TYPE_CHECKING, Any, Awaitable, ClassVar, Collection, Generic, Iterable, Self, TypeVar, TypedDict
 from uuid import UUID, uuid4
 
-from sqlalchemy import ForeignKey, Select, insert, select
+from sqlalchemy import ForeignKey, Index, Select, insert, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects import postgresql as psql
 
@@ -27,7 +27,7 @@ from .errors import (
     UnapprovedProvision,
     UnpurchasedProvision,
 )
-from .provisionable import Provisionable, get_provisionable_type
+from .provisionable import Provisionable, ProvisionableTypeAction, get_provisionable_type
 from .provision_status import (
     PROVISION_STATUS_ENUM,
     PROVISION_STATUS_TRANSITION,
@@ -78,6 +78,15 @@ class LabProvision(
     """
 
     __tablename__ = "lab_provision"
+    __table_args__ = (
+        # Provisions are looked up by their target, most recent first.
+        Index(
+            "ix_lab_provision_provisionable",
+            "provisionable_type",
+            "provisionable_id",
+            "created_at",
+        ),
+    )
     id: Mapped[uuid_pk] = mapped_column()
 
     # The action being performed by this provision.
@@ -85,16 +94,26 @@ class LabProvision(
     # A json object containing parameters for this provision
     action_params_json: Mapped[dict[str, Any]] = mapped_column(psql.JSON, server_default="{}")
 
+    # Promoted from the action params (see PROMOTED_ACTION_PARAMS)
+    installation_id: Mapped[UUID | None] = mapped_column(psql.UUID, nullable=True, index=True)
+    equipment_id: Mapped[UUID | None] = mapped_column(psql.UUID, nullable=True, index=True)
+    destination_lab_id: Mapped[UUID | None] = mapped_column(psql.UUID, nullable=True, index=True)
+
     @property
     def action_params(self) -> TParams:
         p_type = get_provisionable_type(self.provisionable_type)
         action = p_type.actions[self.action]
         return action.from_json(self.action_params_json)
 
+    def _set_action_params(self, action_type: ProvisionableTypeAction[Any, TParams], params: TParams):
+        self.action_params_json = action_type.to_json(params)
+        for name, value in action_type.promoted_params(self.action_params_json).items():
+            setattr(self, name, value)
+
     status: Mapped[ProvisionStatus] = mapped_column(PROVISION_STATUS_ENUM)
 
     # The target of the provision. Can be any Provisionable
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
 
     lab: Mapped[Lab] = relationship()
 
@@ -144,7 +163,7 @@ class LabProvision(
             raise ProvisionActionError(p_type.name, action)
 
         self.action = action
-        self.action_params_json = action_type.to_json(action_params)
+        self._set_action_params(action_type, action_params)
         self.lab_id = model_id(lab)
 
         if budget.lab_id != self.lab_id:
@@ -490,4 +509,4 @@ def query_lab_provisions(
             LabProvision.status.in_([s for s in ProvisionStatus if not s.is_final])
         )
 
-    return select(LabProvision).where(*where_clauses).order_by(LabProvision.created_at, 'reversed')
\ No newline at end of file
+    return select(LabProvision).where(*where_clauses).order_by(LabProvision.created_at.desc())
\ No newline at end of file
@@ -116,12 +116,25 @@ def get_provisionable_type(py_type_or_name: TProvisionable | type[TProvisionable
 
 TParams = TypeVar('TParams')
 
+# Action parameters which are also stored in the indexed column of
+# the same name on the provision, so provisions can be queried by them.
+PROMOTED_ACTION_PARAMS = ("installation_id", "equipment_id", "destination_lab_id")
+
 @dataclasses.dataclass(frozen=True)
 class ProvisionableTypeAction(Generic[TProvisionable, TParams]):
     name: str
     to_json: Callable[[TParams], dict]
     from_json: Callable[[dict], TParams]
 
+    def promoted_params(self, params_json: dict) -> dict[str, UUID | None]:
+        """
+        The values of the promoted parameters in the output of `to_json`.
+        """
+        return {
+            name: UUID(str(params_json[name])) if params_json.get(name) else None
+            for name in PROMOTED_ACTION_PARAMS
+        }
+
 def provisionable_action(name: str, to_json: Callable[[TParams], dict], from_json: Callable[[dict], TParams]):
     """
     Decorates a method on a Provisionable instance as creating a provision
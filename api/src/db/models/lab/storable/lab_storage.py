@@ -31,7 +31,7 @@ class LabStorage(Base, Generic[TStorable]):
 
     id: Mapped[uuid_pk] = mapped_column()
 
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
     lab: Mapped[Lab] = relationship(back_populates="storages")
 
     strategy_id: Mapped[UUID] = mapped_column(ForeignKey("lab_storage_strategy.id"))
@@ -3,6 +3,7 @@ __all__ = (
     "query_materials",
     "MaterialInventory",
     "query_material_inventories",
+    "recount_estimated_quantities",
     "MaterialConsumption",
     "MaterialProduction",
     "MaterialAllocation",
@@ -14,7 +15,8 @@ __all__ = (
 from .material import Material, query_materials
 from .material_inventory import (
     MaterialInventory,
-    query_material_inventories
+    query_material_inventories,
+    recount_estimated_quantities,
 )
 
 from .material_allocation import (
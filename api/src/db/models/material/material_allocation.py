@@ -35,7 +35,7 @@ class MaterialAllocation(LabAllocation[MaterialInventory]):
 
     material: Mapped[Material] = relationship(secondary="material_inventory", viewonly=True)
 
-    inventory_id: Mapped[UUID] = mapped_column(ForeignKey("material_inventory.id"))
+    inventory_id: Mapped[UUID] = mapped_column(ForeignKey("material_inventory.id"), index=True)
     inventory: Mapped[MaterialInventory] = relationship(overlaps="material")
 
     is_input: Mapped[bool] = mapped_column(postgresql.BOOLEAN)
@@ -120,7 +120,7 @@ class MaterialConsumption(MaterialInventoryExport):
 
     id: Mapped[UUID] = mapped_column(ForeignKey('material_inventory_export.id'), primary_key=True)
 
-    input_material_id: Mapped[UUID] = mapped_column(ForeignKey('material_allocation.id'))
+    input_material_id: Mapped[UUID] = mapped_column(ForeignKey('material_allocation.id'), index=True)
     input_material: Mapped[MaterialAllocation] = relationship(back_populates="consumptions")
 
     def __init__(
@@ -153,7 +153,7 @@ class MaterialProduction(MaterialInventoryImport):
 
     id: Mapped[UUID] = mapped_column(ForeignKey("material_inventory_import.id"), primary_key=True)
 
-    output_material_id: Mapped[UUID] = mapped_column(ForeignKey("material_allocation.id"))
+    output_material_id: Mapped[UUID] = mapped_column(ForeignKey("material_allocation.id"), index=True)
     output_material: Mapped[MaterialAllocation] = relationship(back_populates="productions")
 
     def __init__(
@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 import functools
 from typing import TYPE_CHECKING, ClassVar, TypedDict, cast, override
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, ForeignKey, ScalarResult, Select, Table, UniqueConstraint, select
-from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
+from sqlalchemy import Column, Connection, ForeignKey, Index, ScalarResult, Select, Table, UniqueConstraint, event, func, select, update
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, relationship, declared_attr, object_session
+from sqlalchemy.orm.attributes import instance_state, set_committed_value
 from sqlalchemy.dialects import postgresql
 
 from db import LocalSession, local_object_session
 from db.models.base import Base, model_id, DoesNotExist
 from db.models.base.errors import ModelException
 from db.models.fields import uuid_pk
+from db.func import utcnow
 
 from db.models.lab.allocatable import Allocatable
 from db.models.lab.disposable.lab_disposal import LabDisposal
@@ -81,7 +83,7 @@ class MaterialInventory(Allocatable, Base):
     lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
     lab: Mapped[Lab] = relationship()
 
-    material_id: Mapped[UUID] = mapped_column(ForeignKey("material.id"))
+    material_id: Mapped[UUID] = mapped_column(ForeignKey("material.id"), index=True)
     material: Mapped[Material] = relationship(back_populates="inventories")
 
     imports: Mapped[list[MaterialInventoryImport]] = relationship(back_populates="inventory")
@@ -138,13 +140,10 @@ class MaterialInventory(Allocatable, Base):
     last_measured_by_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
     last_measured_note: Mapped[str] = mapped_column(postgresql.TEXT)
 
-    async def estimated_quantity(self) -> float:
-        quantity = self.last_measured_quantity
-        for import_ in await self.imports_since_last_measured():
-            quantity += import_.quantity
-        for export_ in await self.exports_since_last_measured():
-            quantity -= export_.quantity
-        return quantity
+    # The last measured quantity, plus the quantity of every import and less the
+    # quantity of every export recorded since. Maintained by the imports and exports
+    # as they are written (see `_apply_quantity_delta`).
+    estimated_quantity: Mapped[float] = mapped_column(postgresql.FLOAT, server_default="0")
 
     # An inventory can occupy an ordered list of storage containers
     # within a lab.
@@ -199,10 +198,11 @@ class MaterialInventory(Allocatable, Base):
                 _inventory_measurement_to_json(previous)
             )
 
-        self.last_measured_at = datetime.now(tz=timezone.utc)
+        self.last_measured_at = utcnow()
         self.last_measured_quantity = quantity
         self.last_measured_by_id = measured_by.id
         self.last_measured_note = note
+        self.estimated_quantity = quantity
 
         self.previous_measurement_jsons = []
 
@@ -246,9 +246,11 @@ class MaterialInventory(Allocatable, Base):
     @override
     async def __save(self):
         db = local_object_session(self)
-        del self.previous_inventory_measurements
+        self.__dict__.pop("previous_inventory_measurements", None)
         db.add(self)
         await db.commit()
+        # The measurement is timestamped by the database
+        await db.refresh(self, ["last_measured_at"])
         return self
 
 
@@ -267,6 +269,42 @@ def query_material_inventories(
 
     return select(MaterialInventory).where(*where_clauses)
 
+
+def _summed_since_last_measured(model: type[MaterialInventoryImport] | type[MaterialInventoryExport]):
+    return (
+        select(func.coalesce(func.sum(model.quantity), 0.0))
+        .where(
+            model.inventory_id == MaterialInventory.id,
+            model.created_at >= MaterialInventory.last_measured_at,
+        )
+        .correlate(MaterialInventory)
+        .scalar_subquery()
+    )
+
+
+def summed_estimated_quantity():
+    """
+    The estimated quantity of the inventory, summed from the imports and exports
+    recorded since it was last measured.
+    """
+    return (
+        MaterialInventory.last_measured_quantity
+        + _summed_since_last_measured(MaterialInventoryImport)
+        - _summed_since_last_measured(MaterialInventoryExport)
+    )
+
+
+def recount_estimated_quantities():
+    """
+    Resets the maintained `estimated_quantity` of every inventory to the sum
+    of its imports and exports.
+    """
+    return update(MaterialInventory).values(
+        estimated_quantity=summed_estimated_quantity(),
+        updated_at=MaterialInventory.updated_at,
+    )
+
+
 class MaterialInventoryImportType(Enum):
     PROCUREMENT = "procurement"
     PRODUCTION = "production"
@@ -293,13 +331,18 @@ class MaterialInventoryImport(Base):
 
         super().__init_subclass__(**kw)
 
+    __table_args__ = (
+        Index("ix_material_inventory_import_inventory_id_created_at", "inventory_id", "created_at"),
+    )
+
     id: Mapped[uuid_pk] = mapped_column()
     type: Mapped[MaterialInventoryImportType] = mapped_column(MATERIAL_INVENTORY_IMPORT_TYPE_ENUM)
 
     inventory_id: Mapped[UUID] = mapped_column(ForeignKey("material_inventory.id"))
     inventory: Mapped[MaterialInventory] = relationship()
 
-    quantity: Mapped[float] = mapped_column(postgresql.FLOAT, default=0.0)
+    # The previous quantity is loaded before it is replaced, to adjust the estimated quantity of the inventory.
+    quantity: Mapped[float] = mapped_column(postgresql.FLOAT, default=0.0, active_history=True)
 
     recorded_by_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
     recorded_by: Mapped[User] = relationship()
@@ -366,13 +409,18 @@ class MaterialInventoryExport(Base):
         }
         super().__init_subclass__(**kwargs)
 
+    __table_args__ = (
+        Index("ix_material_inventory_export_inventory_id_created_at", "inventory_id", "created_at"),
+    )
+
     id: Mapped[uuid_pk] = mapped_column()
     type: Mapped[MaterialInventoryExportType] = mapped_column(MATERIAL_INVENTORY_EXPORT_TYPE_ENUM)
 
     inventory_id: Mapped[UUID] = mapped_column(ForeignKey("material_inventory.id"))
     inventory: Mapped[MaterialInventory] = relationship()
 
-    quantity: Mapped[float] = mapped_column(postgresql.FLOAT, default=0.0)
+    # The previous quantity is loaded before it is replaced, to adjust the estimated quantity of the inventory.
+    quantity: Mapped[float] = mapped_column(postgresql.FLOAT, default=0.0, active_history=True)
 
     recorded_by_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
     recorded_by: Mapped[User] = relationship()
@@ -403,3 +451,68 @@ class MaterialInventoryDisposition(MaterialInventoryExport):
     def __init__(self, inventory: MaterialInventory | UUID, lab_disposal: LabDisposal | UUID, recorded_by: User | UUID, quantity: float):
         self.disposal_id = model_id(lab_disposal)
         super().__init__(inventory, quantity=quantity, recorded_by=recorded_by)
+
+
+
+def _apply_quantity_delta(connection: Connection, target: MaterialInventoryImport | MaterialInventoryExport, delta: float):
+    """
+    Adds the delta to the estimated quantity of the inventory, in the
+    transaction which writes the import or export.
+
+    The addition is made by the database, so concurrent writes to the same
+    inventory are not lost.
+    """
+    if not delta:
+        return
+
+    where_clauses: list = [MaterialInventory.id == target.inventory_id]
+
+    # An import or export recorded before the last measurement is already
+    # accounted for by the measurement.
+    recorded_at = instance_state(target).dict.get("created_at")
+    if recorded_at is not None:
+        where_clauses.append(MaterialInventory.last_measured_at <= recorded_at)
+
+    estimated_quantity = connection.scalar(
+        update(MaterialInventory)
+        .where(*where_clauses)
+        .values(estimated_quantity=MaterialInventory.estimated_quantity + delta)
+        .returning(MaterialInventory.estimated_quantity)
+    )
+    if estimated_quantity is None:
+        return
+
+    # Keep a loaded inventory in step with the database.
+    session = object_session(target)
+    if session is not None:
+        inventory = session.identity_map.get(
+            session.identity_key(MaterialInventory, target.inventory_id)
+        )
+        if inventory is not None:
+            set_committed_value(inventory, "estimated_quantity", estimated_quantity)
+
+
+def _quantity_sign(target: MaterialInventoryImport | MaterialInventoryExport) -> float:
+    return 1.0 if isinstance(target, MaterialInventoryImport) else -1.0
+
+
+@event.listens_for(MaterialInventoryImport, "after_insert", propagate=True)
+@event.listens_for(MaterialInventoryExport, "after_insert", propagate=True)
+def _add_inserted_quantity(mapper: Mapper, connection: Connection, target: MaterialInventoryImport | MaterialInventoryExport):
+    _apply_quantity_delta(connection, target, _quantity_sign(target) * target.quantity)
+
+
+@event.listens_for(MaterialInventoryImport, "after_update", propagate=True)
+@event.listens_for(MaterialInventoryExport, "after_update", propagate=True)
+def _add_updated_quantity(mapper: Mapper, connection: Connection, target: MaterialInventoryImport | MaterialInventoryExport):
+    history = instance_state(target).attrs.quantity.history
+    if not history.deleted:
+        return
+    delta = sum(history.added) - sum(history.deleted)
+    _apply_quantity_delta(connection, target, _quantity_sign(target) * delta)
+
+
+@event.listens_for(MaterialInventoryImport, "after_delete", propagate=True)
+@event.listens_for(MaterialInventoryExport, "after_delete", propagate=True)
+def _remove_deleted_quantity(mapper: Mapper, connection: Connection, target: MaterialInventoryImport | MaterialInventoryExport):
+    _apply_quantity_delta(connection, target, -_quantity_sign(target) * target.quantity)
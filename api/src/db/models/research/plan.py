@@ -212,7 +212,7 @@ class ResearchPlanAttachment(Base):
 
     id: Mapped[uuid_pk] = mapped_column()
 
-    plan_id: Mapped[UUID] = mapped_column(ForeignKey("research_plan.id"))
+    plan_id: Mapped[UUID] = mapped_column(ForeignKey("research_plan.id"), index=True)
     plan: Mapped[ResearchPlan] = relationship(back_populates="attachments")
 
     file: Mapped[list[File]] = mapped_column(
@@ -247,19 +247,19 @@ class ResearchPlan(LabAllocationConsumer, Base):
     description: Mapped[str] = mapped_column(postgresql.TEXT(), default="{}")
 
     # The principal researcher.
-    researcher_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
+    researcher_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"), index=True)
     researcher: Mapped[User] = relationship(foreign_keys=[researcher_id])
 
     # The funding that is applicable to this plan
-    funding_id: Mapped[UUID] = mapped_column(ForeignKey("uni_funding.id"))
+    funding_id: Mapped[UUID] = mapped_column(ForeignKey("uni_funding.id"), index=True)
     funding: Mapped[Funding] = relationship()
 
     # The lab tech who is responsible for allocating the tasks associated with this plan
-    coordinator_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
+    coordinator_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"), index=True)
     coordinator: Mapped[User] = relationship(foreign_keys=[coordinator_id])
 
     # The default lab to conduct tasks in. Must be the default lab for the researcher's discipline and campus.
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
     lab: Mapped[Lab] = relationship(foreign_keys=[lab_id])
 
     tasks: Mapped[list[ResearchPlanTask]] = relationship(
@@ -0,0 +1,40 @@
+__all__ = (
+    "search_document",
+    "SearchableType",
+    "searchable_types",
+    "refresh_statements",
+    "reindex_search_documents",
+    "query_search_document_ids",
+    "query_search_documents",
+    "query_search_facets",
+    "trigram_index",
+    "prefix_index",
+    "istartswith",
+    "query_typeahead",
+    "tag_frequency",
+    "TaggedType",
+    "tagged_types",
+    "refresh_tag_frequency_statements",
+    "reindex_tag_frequency",
+    "query_tag_counts",
+)
+
+from .search_document import (
+    search_document,
+    SearchableType,
+    searchable_types,
+    refresh_statements,
+    reindex_search_documents,
+    query_search_document_ids,
+    query_search_documents,
+    query_search_facets,
+)
+from .typeahead import trigram_index, prefix_index, istartswith, query_typeahead
+from .tag_frequency import (
+    tag_frequency,
+    TaggedType,
+    tagged_types,
+    refresh_tag_frequency_statements,
+    reindex_tag_frequency,
+    query_tag_counts,
+)
@@ -0,0 +1,298 @@
+"""
+A full text search index over the catalogue.
+
+Each searchable model has a row in `search_document`, holding its title
+and a weighted `tsvector` of its title (A), keywords (B) and body (C),
+which is covered by a GIN index.
+
+The documents of the models which are inserted, updated or deleted by
+a flush are rebuilt in the same transaction, from the same selection
+which is used to build the index from scratch (see `refresh_statements`).
+Documents which are derived from related models (eg. the campus name of a lab)
+are only rebuilt when the model itself is written.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    Index,
+    Select,
+    Table,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session, UOWTransaction
+
+from db.func import utcnow
+from db.models.base import Base
+
+SEARCH_CONFIG = "english"
+
+search_document = Table(
+    "search_document",
+    Base.metadata,
+    Column("doc_type", postgresql.VARCHAR(32), primary_key=True),
+    Column("doc_id", postgresql.UUID(as_uuid=True), primary_key=True),
+    Column("title", postgresql.TEXT, nullable=False),
+    Column("document", postgresql.TSVECTOR, nullable=False),
+    Column(
+        "updated_at",
+        postgresql.TIMESTAMP(timezone=True),
+        server_default=utcnow(),
+        onupdate=utcnow(),
+    ),
+    Index("ix_search_document_document", "document", postgresql_using="gin"),
+)
+
+
+@dataclass(frozen=True)
+class SearchableType:
+    # The table name of the model (as the type of a `ModelRef`).
+    name: str
+    model: type[Base]
+    # Selects the `id`, `title`, `keywords` and `body` of each model of the type.
+    documents: Callable[[], Select[Any]]
+
+
+def _tags(column):
+    return func.array_to_string(column, " ")
+
+
+def _equipment_documents():
+    from db.models.equipment import Equipment
+
+    return select(
+        Equipment.id,
+        Equipment.name.label("title"),
+        _tags(Equipment.tags).label("keywords"),
+        Equipment.description.label("body"),
+    )
+
+
+def _software_documents():
+    from db.models.software import Software
+
+    return select(
+        Software.id,
+        Software.name.label("title"),
+        _tags(Software.tags).label("keywords"),
+        Software.description.label("body"),
+    )
+
+
+def _user_documents():
+    from db.models.user import User
+
+    return select(
+        User.id,
+        User.name.label("title"),
+        User.email.label("keywords"),
+        User.title.label("body"),
+    ).where(User.disabled.is_(False))
+
+
+def _lab_documents():
+    from db.models.lab import Lab
+    from db.models.uni import Campus
+
+    return select(
+        Lab.id,
+        func.concat(Campus.name, " ", cast(Lab.discipline, postgresql.TEXT)).label("title"),
+        Campus.code.label("keywords"),
+        literal("").label("body"),
+    ).join(Campus, Lab.campus_id == Campus.id)
+
+
+def _research_plan_documents():
+    from db.models.research.plan import ResearchPlan
+
+    return select(
+        ResearchPlan.id,
+        ResearchPlan.title,
+        cast(ResearchPlan.discipline, postgresql.TEXT).label("keywords"),
+        ResearchPlan.description.label("body"),
+    )
+
+
+def _campus_documents():
+    from db.models.uni import Campus
+
+    return select(
+        Campus.id,
+        Campus.name.label("title"),
+        Campus.code.label("keywords"),
+        literal("").label("body"),
+    )
+
+
+def _funding_documents():
+    from db.models.uni.funding import Funding
+
+    return select(
+        Funding.id,
+        Funding.name.label("title"),
+        literal("").label("keywords"),
+        Funding.description.label("body"),
+    )
+
+
+_searchable_types: dict[str, SearchableType] = {}
+
+
+def searchable_types() -> dict[str, SearchableType]:
+    if not _searchable_types:
+        from db.models.equipment import Equipment
+        from db.models.lab import Lab
+        from db.models.research.plan import ResearchPlan
+        from db.models.software import Software
+        from db.models.uni import Campus
+        from db.models.uni.funding import Funding
+        from db.models.user import User
+
+        for model, documents in (
+            (Equipment, _equipment_documents),
+            (Software, _software_documents),
+            (User, _user_documents),
+            (Lab, _lab_documents),
+            (ResearchPlan, _research_plan_documents),
+            (Campus, _campus_documents),
+            (Funding, _funding_documents),
+        ):
+            _searchable_types[model.__tablename__] = SearchableType(
+                model.__tablename__, model, documents
+            )
+    return _searchable_types
+
+
+def _document_vector(title, keywords, body):
+    def weighted(column, weight: str):
+        # setweight takes a "char", which a bound (varchar) weight is not cast to.
+        return func.setweight(
+            func.to_tsvector(SEARCH_CONFIG, func.coalesce(column, "")), literal_column(f"'{weight}'")
+        )
+
+    return (
+        weighted(title, "A")
+        .op("||", return_type=postgresql.TSVECTOR)(weighted(keywords, "B"))
+        .op("||", return_type=postgresql.TSVECTOR)(weighted(body, "C"))
+    )
+
+
+def refresh_statements(searchable: SearchableType, ids: list[UUID] | None = None):
+    """
+    Statements which rebuild the documents of the models with the given ids
+    (or of every model of the type).
+    """
+    documents = searchable.documents()
+    if ids is not None:
+        documents = documents.where(documents.selected_columns.id.in_(ids))
+    docs = documents.subquery()
+
+    remove = delete(search_document).where(search_document.c.doc_type == searchable.name)
+    if ids is not None:
+        remove = remove.where(search_document.c.doc_id.in_(ids))
+
+    add = insert(search_document).from_select(
+        ["doc_type", "doc_id", "title", "document"],
+        select(
+            literal(searchable.name),
+            docs.c.id,
+            docs.c.title,
+            _document_vector(docs.c.title, docs.c.keywords, docs.c.body),
+        ),
+    )
+    return remove, add
+
+
+async def reindex_search_documents(db: AsyncConnection):
+    """
+    Rebuilds the documents of every searchable model.
+    """
+    for searchable in searchable_types().values():
+        for statement in refresh_statements(searchable):
+            await db.execute(statement)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_documents(session: Session, flush_context: UOWTransaction):
+    types = searchable_types()
+    written: dict[str, set[UUID]] = {}
+
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        for searchable in types.values():
+            if isinstance(obj, searchable.model):
+                if obj in session.dirty and not session.is_modified(obj):
+                    break
+                written.setdefault(searchable.name, set()).add(obj.id)
+                break
+
+    if not written:
+        return
+
+    connection = session.connection()
+    for name, ids in written.items():
+        for statement in refresh_statements(types[name], list(ids)):
+            connection.execute(statement)
+
+
+def search_query(search: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
+
+
+def query_search_document_ids(doc_type: str, search: str) -> Select[tuple[UUID]]:
+    """
+    The ids of the models of the type whose documents match the search.
+    """
+    return select(search_document.c.doc_id).where(
+        search_document.c.doc_type == doc_type,
+        search_document.c.document.op("@@")(search_query(search)),
+    )
+
+
+def query_search_documents(
+    search: str,
+    types: list[str] | None = None,
+) -> Select[tuple[str, UUID, str, float]]:
+    """
+    The documents matching the search, most relevant first.
+    """
+    query = search_query(search)
+    rank = func.ts_rank_cd(search_document.c.document, query).label("rank")
+
+    where_clauses: list = [search_document.c.document.op("@@")(query)]
+    if types:
+        where_clauses.append(search_document.c.doc_type.in_(types))
+
+    return (
+        select(
+            search_document.c.doc_type,
+            search_document.c.doc_id,
+            search_document.c.title,
+            rank,
+        )
+        .where(*where_clauses)
+        .order_by(rank.desc(), search_document.c.title)
+    )
+
+
+def query_search_facets(search: str) -> Select[tuple[str, int]]:
+    """
+    The number of documents of each type which match the search.
+    """
+    return (
+        select(search_document.c.doc_type, func.count())
+        .where(search_document.c.document.op("@@")(search_query(search)))
+        .group_by(search_document.c.doc_type)
+    )
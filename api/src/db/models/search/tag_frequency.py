@@ -0,0 +1,284 @@
+"""
+Counts of the tags carried by the items of the catalogue.
+
+The number of items of each type which carry each tag is maintained in
+`tag_frequency`, so that the tags of the whole catalogue can be listed
+(and completed from a prefix) without reading every item. A flush which
+adds or removes tags from items adjusts the counts of those tags by the
+number of items which gained or lost them, with an atomic
+`INSERT ... ON CONFLICT DO UPDATE` in the same transaction, so that
+concurrent flushes which write the same tags do not conflict. The counts
+are only recounted from the items by `reindex_tag_frequency`.
+
+Counts over a filtered set of items are computed from the items
+themselves, in a single `unnest ... GROUP BY` query.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Index,
+    Select,
+    Table,
+    delete,
+    event,
+    exists,
+    func,
+    inspect,
+    literal,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import InstrumentedAttribute, Session, UOWTransaction
+from sqlalchemy.orm.base import NO_VALUE
+
+from db.models.base import Base
+
+tag_frequency = Table(
+    "tag_frequency",
+    Base.metadata,
+    Column("item_type", postgresql.VARCHAR(32), primary_key=True),
+    Column("tag", postgresql.TEXT, primary_key=True),
+    Column("item_count", postgresql.INTEGER, nullable=False),
+    Index(
+        "ix_tag_frequency_tag_prefix",
+        "item_type",
+        "tag",
+        postgresql_ops={"tag": "text_pattern_ops"},
+    ),
+)
+
+
+@dataclass(frozen=True)
+class TaggedType:
+    # The table name of the model.
+    name: str
+    model: type[Base]
+    tags: InstrumentedAttribute[list[str]]
+
+
+_tagged_types: dict[str, TaggedType] = {}
+
+
+def tagged_types() -> dict[str, TaggedType]:
+    if not _tagged_types:
+        from db.models.equipment import Equipment
+        from db.models.software import Software
+
+        for model in (Equipment, Software):
+            _tagged_types[model.__tablename__] = TaggedType(
+                model.__tablename__, model, model.tags
+            )
+    return _tagged_types
+
+
+def _unnest_tags(items: Select[Any], tagged: TaggedType):
+    item_tags = items.with_only_columns(func.unnest(tagged.tags).label("tag")).subquery()
+    return item_tags, item_tags.c.tag
+
+
+def refresh_tag_frequency_statements(tagged: TaggedType, tags: list[str] | None = None):
+    """
+    Statements which recount the items of the type carrying each of the tags
+    (or every tag carried by an item of the type).
+    """
+    items = select(tagged.model)
+    if tags is not None:
+        items = items.where(tagged.tags.overlap(tags))
+    item_tags, tag = _unnest_tags(items, tagged)
+
+    counts = select(literal(tagged.name), tag, func.count()).select_from(item_tags)
+    if tags is not None:
+        counts = counts.where(tag.in_(tags))
+    counts = counts.group_by(tag).order_by(tag)
+
+    recount = postgresql.insert(tag_frequency).from_select(["item_type", "tag", "item_count"], counts)
+    recount = recount.on_conflict_do_update(
+        index_elements=[tag_frequency.c.item_type, tag_frequency.c.tag],
+        set_={"item_count": recount.excluded.item_count},
+    )
+
+    # Tags which are no longer carried by any item
+    remove = delete(tag_frequency).where(
+        tag_frequency.c.item_type == tagged.name,
+        ~exists().where(tagged.tags.contains(postgresql.array([tag_frequency.c.tag]))),
+    )
+    if tags is not None:
+        remove = remove.where(tag_frequency.c.tag.in_(tags))
+
+    return recount, remove
+
+
+def adjust_tag_frequency_statements(tagged: TaggedType, deltas: dict[str, int]):
+    """
+    Statements which add the (possibly negative) number of items of the type
+    which gained each of the tags to the count of the tag.
+    """
+    # Rows are locked in order of tag, so that concurrent adjustments cannot deadlock
+    tags = sorted(tag for tag, delta in deltas.items() if delta)
+    if not tags:
+        return ()
+
+    adjust = postgresql.insert(tag_frequency).values(
+        [{"item_type": tagged.name, "tag": tag, "item_count": deltas[tag]} for tag in tags]
+    )
+    adjust = adjust.on_conflict_do_update(
+        index_elements=[tag_frequency.c.item_type, tag_frequency.c.tag],
+        set_={"item_count": tag_frequency.c.item_count + adjust.excluded.item_count},
+    )
+    remove = delete(tag_frequency).where(
+        tag_frequency.c.item_type == tagged.name,
+        tag_frequency.c.tag.in_(tags),
+        tag_frequency.c.item_count <= 0,
+    )
+    return adjust, remove
+
+
+async def reindex_tag_frequency(db: AsyncConnection):
+    """
+    Recounts every tag of every tagged type.
+    """
+    for tagged in tagged_types().values():
+        for statement in refresh_tag_frequency_statements(tagged):
+            await db.execute(statement)
+
+
+def _item_key(tagged: TaggedType, obj: Base) -> tuple[str, Any]:
+    # Only persistent items (which have an identity) have previous tags.
+    identity = inspect(obj).identity
+    return (tagged.name, identity[0] if identity else None)
+
+
+def _previous_tags_unknown(session: Session, obj: Base, tagged: TaggedType) -> bool:
+    """
+    Whether the object overwrites or deletes tags which were never loaded.
+    """
+    attr = inspect(obj).attrs[tagged.tags.key]
+    if obj in session.deleted:
+        return attr.loaded_value is NO_VALUE
+    history = attr.history
+    return history.has_changes() and not history.deleted
+
+
+@event.listens_for(Session, "before_flush")
+def _load_previous_tags(session: Session, flush_context: UOWTransaction, instances: Any):
+    """
+    Reads the stored tags of the items which are about to be flushed without
+    their previous tags having been loaded, so that the counts of those tags
+    can be adjusted once the items are flushed.
+    """
+    types = tagged_types()
+    unknown: dict[str, list[Any]] = {}
+    for obj in [*session.dirty, *session.deleted]:
+        for tagged in types.values():
+            if not isinstance(obj, tagged.model):
+                continue
+            if _previous_tags_unknown(session, obj, tagged):
+                unknown.setdefault(tagged.name, []).append(_item_key(tagged, obj)[1])
+            break
+
+    previous_tags: dict[tuple[str, Any], list[str]] = {}
+    session.info["previous_tags"] = previous_tags
+    if not unknown:
+        return
+
+    connection = session.connection()
+    for name, ids in unknown.items():
+        tagged = types[name]
+        rows = connection.execute(
+            select(tagged.model.id, tagged.tags).where(tagged.model.id.in_(ids))
+        )
+        for id, tags in rows:
+            previous_tags[(name, id)] = tags or []
+
+
+def _tag_deltas(session: Session, obj: Base, tagged: TaggedType) -> Counter[str]:
+    """
+    The tags which were added to (+1) or removed from (-1) the object.
+    """
+    attr = inspect(obj).attrs[tagged.tags.key]
+    previous_tags = session.info.get("previous_tags", {})
+
+    if obj in session.deleted:
+        if attr.loaded_value is NO_VALUE:
+            removed = set(previous_tags.get(_item_key(tagged, obj), []))
+        else:
+            removed = set(attr.loaded_value or [])
+        return Counter({tag: -1 for tag in removed})
+
+    history = attr.history
+    added = {tag for tags in history.added for tag in tags or []}
+    if obj in session.new:
+        return Counter({tag: 1 for tag in added})
+    if not history.has_changes():
+        return Counter()
+
+    if history.deleted:
+        removed = {tag for tags in history.deleted for tag in tags or []}
+    else:
+        removed = set(previous_tags.get(_item_key(tagged, obj), []))
+    deltas = Counter({tag: 1 for tag in added - removed})
+    deltas.subtract(removed - added)
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_tags(session: Session, flush_context: UOWTransaction):
+    types = tagged_types()
+    deltas: dict[str, Counter[str]] = {}
+
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        for tagged in types.values():
+            if not isinstance(obj, tagged.model):
+                continue
+            deltas.setdefault(tagged.name, Counter()).update(_tag_deltas(session, obj, tagged))
+            break
+    session.info.pop("previous_tags", None)
+
+    if not deltas:
+        return
+
+    connection = session.connection()
+    for name, tag_deltas in deltas.items():
+        for statement in adjust_tag_frequency_statements(types[name], tag_deltas):
+            connection.execute(statement)
+
+
+def query_tag_counts(
+    item_type: str,
+    items: Select[Any] | None = None,
+    prefix: str | None = None,
+    limit: int | None = None,
+) -> Select[tuple[str, int]]:
+    """
+    The tags carried by the items of the type, along with the number of
+    items which carry each tag, most frequent first.
+
+    When no selection of items is given, the counts are read from `tag_frequency`.
+    """
+    tag: ColumnElement[str]
+    item_count: ColumnElement[int]
+    if items is None:
+        tag = tag_frequency.c.tag
+        item_count = tag_frequency.c.item_count
+        counts = select(tag, item_count).where(
+            tag_frequency.c.item_type == item_type
+        )
+    else:
+        item_tags, tag = _unnest_tags(items, tagged_types()[item_type])
+        item_count = func.count().label("item_count")
+        counts = select(tag, item_count).select_from(item_tags).group_by(tag)
+
+    if prefix:
+        counts = counts.where(tag.startswith(prefix, autoescape=True))
+
+    counts = counts.order_by(item_count.desc(), tag)
+    if limit is not None:
+        counts = counts.limit(limit)
+    return counts
@@ -0,0 +1,68 @@
+"""
+Indexes and queries for matching the text typed into a filter or
+typeahead against the names of models.
+
+Substring (`ILIKE '%text%'`) and similarity matches are served by a
+trigram (pg_trgm) GIN index. Case insensitive prefix matches are served
+by a `text_pattern_ops` btree index of the lowercased column, and must
+be written with `istartswith` so that they match the indexed expression.
+"""
+from __future__ import annotations
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Index, Select, func, or_, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def _index_name(column: InstrumentedAttribute[Any], suffix: str):
+    return f"ix_{column.class_.__tablename__}_{column.key}_{suffix}"
+
+
+def trigram_index(column: InstrumentedAttribute[Any]) -> Index:
+    return Index(
+        _index_name(column, "trgm"),
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column.key: "gin_trgm_ops"},
+    )
+
+
+def prefix_index(column: InstrumentedAttribute[Any]) -> Index:
+    lowered = func.lower(column).label(f"lower_{column.key}")
+    return Index(
+        _index_name(column, "prefix"),
+        lowered,
+        postgresql_ops={lowered.name: "text_pattern_ops"},
+    )
+
+
+def istartswith(column: InstrumentedAttribute[str], prefix: str) -> ColumnElement[bool]:
+    return func.lower(column).startswith(prefix.lower(), autoescape=True)
+
+
+def query_typeahead(
+    columns: list[InstrumentedAttribute[str]],
+    text: str,
+    limit: int,
+    *where_clauses: Any,
+) -> Select[tuple[UUID, str, float]]:
+    """
+    The ids of the models with any of the columns containing the text,
+    labelled with the first column, most similar to the text first.
+    """
+    model = columns[0].class_
+    similarity = func.greatest(
+        *(func.similarity(column, text) for column in columns)
+    ).label("similarity")
+
+    return (
+        select(model.id, columns[0].label("label"), similarity)
+        .where(
+            or_(*(column.icontains(text, autoescape=True) for column in columns)),
+            *where_clauses,
+        )
+        .order_by(similarity.desc(), columns[0])
+        .limit(limit)
+    )
@@ -2,50 +2,79 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import Index, Select, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects import postgresql
 
+from db import local_object_session
 from db.models.base import Base
 from db.models.fields import uuid_pk
 from db.models.lab import Lab
 from db.models.lab.installable import Installable
+from db.models.search import prefix_index, istartswith
+from db.models.uni.campus import Campus
+from db.models.uni.discipline import Discipline
 
 if TYPE_CHECKING:
+    from db.models.lab.installable import LabInstallation
     from .software_installation import SoftwareInstallation
 
 
 class Software(Installable, Base):
     __tablename__ = "software"
+    __table_args__ = (
+        Index("ix_software_tags", "tags", postgresql_using="gin"),
+    )
     id: Mapped[uuid_pk] = mapped_column()
 
     name: Mapped[str] = mapped_column(postgresql.VARCHAR(64), unique=True, index=True)
     description: Mapped[str] = mapped_column(postgresql.TEXT)
 
-    tags: Mapped[list[str]] = mapped_column(postgresql.ARRAY(postgresql.TEXT), server_default="{}")
+    # Replaced tags which were never loaded are read before the flush, to maintain
+    # the tag frequencies (see `db.models.search.tag_frequency`).
+    tags: Mapped[list[str]] = mapped_column(
+        postgresql.ARRAY(postgresql.TEXT), server_default="{}"
+    )
 
     requires_license: Mapped[bool] = mapped_column(postgresql.BOOLEAN, default=False)
     is_paid_software: Mapped[bool] = mapped_column(postgresql.BOOLEAN, default=False)
 
+    async def get_installation(self, lab: Lab | UUID) -> LabInstallation[Software]:
+        from .software_installation import SoftwareInstallation
+
+        db = local_object_session(self)
+
+        return await SoftwareInstallation.get_for_installable_lab(db, self, lab)
+
+prefix_index(Software.name)
+
 def query_softwares(
     lab: Lab | UUID | None = None,
     name_eq: str | None = None,
     name_istartswith: str | None = None,
-    has_tags: set[str] | None = None
+    has_tags: set[str] | None = None,
+    installed_campus: Campus | UUID | None = None,
+    installed_discipline: Discipline | None = None,
 ) -> Select[tuple[Software]]:
-    from .software_installation import query_software_installations
+    from .software_installation import SoftwareInstallation, query_software_installations
     where_clauses: list = []
 
-    if lab is not None:
-        installed_labs = query_software_installations(lab=lab)
-        where_clauses.append(Software.id.in_(installed_labs.scalar_subquery()))
+    if (lab is not None) or (installed_campus is not None) or (installed_discipline is not None):
+        installed_labs = query_software_installations(
+            lab=lab,
+            installed_campus=installed_campus,
+            installed_discipline=installed_discipline,
+        )
+        where_clauses.append(Software.id.in_(
+            installed_labs.with_only_columns(SoftwareInstallation.software_id).scalar_subquery()
+        ))
 
     if name_eq is not None:
         where_clauses.append(Software.name == name_eq)
     elif name_istartswith:
-        where_clauses.append(Software.name._ilike(f"{name_istartswith}%"))
+        where_clauses.append(istartswith(Software.name, name_istartswith))
 
     if has_tags:
-        where_clauses.append(*[Software.tags.contains(tag) for tag in has_tags])
+        where_clauses.append(Software.tags.contains(sorted(has_tags)))
 
-    return select(Software)
\ No newline at end of file
+    return select(Software).where(*where_clauses)
\ No newline at end of file
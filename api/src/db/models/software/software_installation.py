@@ -7,14 +7,16 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects import postgresql
 
 from db import LocalSession
-from db.models.base import model_id
+from db.models.base import DoesNotExist, model_id
 from db.models.fields import uuid_pk
 
-from db.models.lab import Lab
-from db.models.lab.installable import LabInstallation
+from db.models.lab import Lab, query_labs
+from db.models.lab.installable import Installable, LabInstallation
 from db.models.lab.installable.lab_installation import LabInstallationProvisionParams
 from db.models.lab.provisionable import LabProvision, ProvisionStatus, provisionable_action
 from db.models.lab.provisionable.provisionable import ProvisionableTypeAction
+from db.models.uni.campus import Campus
+from db.models.uni.discipline import Discipline
 from db.models.user import User
 from .software import Software
 
@@ -114,6 +116,29 @@ class SoftwareInstallation(LabInstallation[Software]):
 
     installed_version: Mapped[str] = mapped_column(postgresql.VARCHAR(64), index=True)
 
+    async def apply_provision(
+        self, provision: LabProvision[SoftwareInstallation, Any], *, by: User, note: str, **kwargs
+    ):
+        raise NotImplementedError
+
+    @classmethod
+    async def get_for_installable_lab(cls, db: LocalSession, installable: Installable | UUID, lab: Lab | UUID) -> SoftwareInstallation:
+        r = await db.scalar(
+            select(SoftwareInstallation).where(
+                SoftwareInstallation.software_id == model_id(installable),
+                SoftwareInstallation.lab_id == model_id(lab)
+            )
+        )
+        if not r:
+            raise DoesNotExist(
+                'SoftwareInstallation',
+                f'Not found for installable {model_id(installable)} in lab {model_id(lab)}'
+            )
+        return r
+
+    async def get_installable(self):
+        return await self.awaitable_attrs.software
+
     @provisionable_action("new_software", _new_software_params_to_json, _new_software_params_from_json)
     async def new_software(
         self,
@@ -190,9 +215,19 @@ class SoftwareInstallation(LabInstallation[Software]):
 def query_software_installations(
     lab: Lab | UUID | None = None,
     software: Software | UUID | None = None,
+    installed_campus: Campus | UUID | None = None,
+    installed_discipline: Discipline | None = None,
 ) -> Select[tuple[SoftwareInstallation]]:
     where_clauses: list = []
-    if lab is not None:
+    if lab is None and (installed_campus is not None or installed_discipline is not None):
+        where_clauses.append(
+            SoftwareInstallation.lab_id.in_(
+                query_labs(campus=installed_campus, discipline=installed_discipline)
+                .with_only_columns(Lab.id)
+                .scalar_subquery()
+            )
+        )
+    elif lab is not None:
         where_clauses.append(
             SoftwareInstallation.lab_id == model_id(lab)
         )
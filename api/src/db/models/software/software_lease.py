@@ -23,7 +23,7 @@ class SoftwareLease(LabAllocation[SoftwareInstallation]):
     )
 
     installation_id: Mapped[UUID] = mapped_column(
-        ForeignKey("software_installation.id")
+        ForeignKey("software_installation.id"), index=True
     )
     installation: Mapped[SoftwareInstallation] = relationship()
 
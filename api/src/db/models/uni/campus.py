@@ -8,6 +8,7 @@ from sqlalchemy.dialects import postgresql
 
 from db import LocalSession
 from db.models.fields import uuid_pk
+from db.models.search import trigram_index
 from ..base import Base, DoesNotExist
 
 
@@ -49,6 +50,9 @@ class Campus(Base):
         self.name = name
 
 
+trigram_index(Campus.name)
+
+
 def query_campuses(
     code_eq: str | None = None,
     search: str | None = None,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from uuid import UUID
-from sqlalchemy import Select, func, ForeignKey, select
+from sqlalchemy import Index, Select, func, ForeignKey, select, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db import local_object_session
@@ -22,13 +22,21 @@ if TYPE_CHECKING:
 
 class Budget(Base):
     __tablename__ = "uni_budget"
+    __table_args__ = (
+        # Most budgets are lab budgets, which have no research plan.
+        Index(
+            "ix_uni_budget_research_plan_id",
+            "research_plan_id",
+            postgresql_where=text("research_plan_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid_pk] = mapped_column()
 
-    funding_id: Mapped[UUID] = mapped_column(ForeignKey("uni_funding.id"))
+    funding_id: Mapped[UUID] = mapped_column(ForeignKey("uni_funding.id"), index=True)
     funding: Mapped[Funding] = relationship()
 
-    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"))
+    lab_id: Mapped[UUID] = mapped_column(ForeignKey("lab.id"), index=True)
     # lab: Mapped[Lab] = relationship()
 
     research_plan_id: Mapped[UUID | None] = mapped_column(ForeignKey("research_plan.id"), nullable=True)
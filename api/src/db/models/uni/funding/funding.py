@@ -56,7 +56,7 @@ def query_fundings(
     if name_eq is not None:
         clauses.append(Funding.name.ilike(name_eq))
 
-    if text is not None:
+    if text:
         clauses.append(
             or_(
                 Funding.name.ilike(f"%{text}%"),
@@ -239,6 +239,10 @@ class Purchase(Base):
     def reviewed_at(self):
         return self.review_mark["at"] if self.review_mark else None
 
+    @property
+    def is_reviewed(self):
+        return self.review_mark is not None
+
     @property
     def is_finalised(self):
         return self.review_mark is not None
@@ -8,16 +8,18 @@ from uuid import UUID, uuid4
 
 from passlib.hash import pbkdf2_sha256
 
-from sqlalchemy import ForeignKey, Select, TypeDecorator, func, or_, select
+from sqlalchemy import ForeignKey, Index, Select, TypeDecorator, func, or_, select
 from sqlalchemy.ext.declarative import AbstractConcreteBase
 from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
 from sqlalchemy.dialects import postgresql
 
 from db import LocalSession, local_object_session
 from db.models.base.base import model_id
+from db.password_hashing import password_hasher
 
 from .base import Base, DoesNotExist
 from .fields import uuid_pk
+from .search import trigram_index
 
 from ..models.uni import Campus, Discipline
 
@@ -54,6 +56,10 @@ user_domain = Annotated[
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        Index("ix_user_roles", "roles", postgresql_using="gin"),
+        Index("ix_user_disciplines", "disciplines", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid_pk] = mapped_column()
     domain: Mapped[user_domain]
@@ -140,6 +146,10 @@ class User(Base):
         )
 
 
+trigram_index(User.name)
+trigram_index(User.email)
+
+
 def query_users(
     id_in: list[UUID] | None = None,
     search: str | None = None,
@@ -163,7 +173,9 @@ def query_users(
         where_clauses.append(User.roles.overlap(list(include_roles)))
 
     if discipline:
-        where_clauses.append(User.disciplines.contains([discipline]))
+        if not isinstance(discipline, set):
+            discipline = {discipline}
+        where_clauses.append(User.disciplines.contains(list(discipline)))
 
     if supervises_lab:
         from db.models.lab.lab import lab_supervisor
@@ -232,9 +244,20 @@ class NativeUserCredentials(UserCredentials):
     user_id = mapped_column(ForeignKey("user.id"))
     password_hash: Mapped[str] = mapped_column(postgresql.VARCHAR(256))
 
-    def __init__(self, *, user: User, password: str):
+    def __init__(
+        self,
+        *,
+        user: User,
+        password: str | None = None,
+        password_hash: str | None = None,
+    ):
         self.user_id = user.id
-        self.set_password(password)
+        if password_hash is not None:
+            self.password_hash = password_hash
+        elif password is not None:
+            self.set_password(password)
+        else:
+            raise ValueError("Either password or password_hash must be provided")
         super().__init__()
 
     def set_password(self, password: str):
@@ -243,6 +266,18 @@ class NativeUserCredentials(UserCredentials):
     def verify_password(self, password: str):
         return pbkdf2_sha256.verify(password, self.password_hash)
 
+    async def set_password_async(self, password: str):
+        """
+        Sets the password, hashing it on the password hasher threads.
+        """
+        self.password_hash = await password_hasher.hash(password)
+
+    async def verify_password_async(self, password: str) -> bool:
+        """
+        Verifies the password on the password hasher threads.
+        """
+        return await password_hasher.verify(password, self.password_hash)
+
 
 class ExternalUserCredentials(UserCredentials):
     __tablename__ = "external_user_credentials"
@@ -299,7 +334,10 @@ class TemporaryAccessToken(Base):
         user = await db.get(User, self.user_id)
         assert user is not None
 
-        credentials = NativeUserCredentials(user=user, password=password)
+        credentials = NativeUserCredentials(
+            user=user,
+            password_hash=await password_hasher.hash(password)
+        )
         db.add(credentials)
 
         self.consumed_at = datetime.now(tz=timezone.utc)
@@ -0,0 +1,63 @@
+"""
+Hashing and verification of passwords on a dedicated thread pool.
+
+pbkdf2 is deliberately slow, so hashing on the event loop stalls every
+other request being served by the process. The hash is computed on
+worker threads instead, and when more than `db_password_hash_max_queued`
+operations are waiting for a worker, further operations are refused
+with `PasswordHasherBusy` rather than queueing without bound.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from passlib.hash import pbkdf2_sha256
+
+from db import db_settings
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    def __init__(self):
+        super().__init__("Too many password hashing operations in progress")
+
+
+class PasswordHasher:
+    def __init__(self, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._in_progress = 0
+
+    @property
+    def in_progress(self) -> int:
+        return self._in_progress
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        if self._in_progress >= self.max_workers + self.max_queued:
+            raise PasswordHasherBusy()
+
+        self._in_progress += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            self._in_progress -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pbkdf2_sha256.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(pbkdf2_sha256.verify, password, password_hash)
+
+
+password_hasher = PasswordHasher(
+    max_workers=db_settings.db_password_hash_workers,
+    max_queued=db_settings.db_password_hash_max_queued,
+)
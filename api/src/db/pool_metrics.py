@@ -0,0 +1,88 @@
+"""
+Metrics of the connection pool of the database engine, used to size the pool.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds (in seconds) of the buckets of the checkout wait time histogram
+CHECKOUT_WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@dataclass
+class CheckoutWaitStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    # The number of checkouts which waited no longer than the corresponding
+    # bucket bound. The final count is of waits longer than every bound.
+    wait_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)
+    )
+
+    def record(self, wait_seconds: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.wait_buckets[bisect_left(CHECKOUT_WAIT_BUCKETS, wait_seconds)] += 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    A queue pool which records the time spent waiting to check out
+    each connection from the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = CheckoutWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+@dataclass
+class PoolMetrics:
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+
+    wait_stats: CheckoutWaitStats | None
+
+
+def pool_metrics(pool) -> PoolMetrics:
+    """
+    A snapshot of the current state of the pool.
+    """
+    return PoolMetrics(
+        pool_size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        wait_stats=getattr(pool, "wait_stats", None),
+    )
@@ -0,0 +1,449 @@
+"""
+Query plan diagnostics for the `query_*` builders.
+
+Each builder is called with representative parameters (the ids of rows
+sampled from the database, or random ids for empty tables) and the
+resulting statement is executed under `EXPLAIN (ANALYZE, BUFFERS)`.
+
+Sequential scans of tables with more than `min_rows` rows are reported,
+along with an index (as an alembic `op.create_index` call) covering the
+columns filtered by the scan.
+
+The shape of each plan (the nested node types and the relations or indexes
+they scan) can be recorded to a baseline file and compared on subsequent
+runs, so that changes to a builder or the schema which change a plan
+are caught. Plans depend on the table statistics, so a baseline is only
+meaningful when compared against a database of the same size. The baseline
+in `test/query_plans.json` is recorded against a database created by
+`db init`, `db seed` and `db seed-synthetic` (at the default scale).
+
+A case which cannot be explained (because its builder raises, or its
+statement fails) is reported as a failure, without preventing the other
+cases from being explained.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import re
+from typing import Any, Callable, Iterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import Select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext import compiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from db import LocalSession
+
+
+class explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiler.compiles(explain, "postgresql")
+def _pg_explain(element: explain, compiler, **kw):
+    return "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + compiler.process(
+        element.statement, **kw
+    )
+
+
+# Tables whose ids are used as the parameters of the query cases.
+SAMPLED_TABLES = (
+    "user",
+    "uni_campus",
+    "uni_funding",
+    "uni_budget",
+    "lab",
+    "lab_allocation_consumer",
+    "lab_storage",
+    "research_plan",
+    "equipment",
+    "equipment_installation",
+    "software",
+    "software_installation",
+    "material",
+    "material_inventory",
+    "material_allocation",
+)
+
+
+async def sample_ids(db: LocalSession) -> dict[str, UUID]:
+    ids: dict[str, UUID] = {}
+    for table in SAMPLED_TABLES:
+        id = await db.scalar(text(f'SELECT id FROM "{table}" LIMIT 1'))
+        ids[table] = id or uuid4()
+    return ids
+
+
+QueryCase = Callable[[dict[str, UUID]], Select]
+
+
+def _query_cases() -> dict[str, QueryCase]:
+    from db.models.equipment import (
+        query_equipments,
+        query_equipment_installations,
+        query_equipment_installation_provisions,
+        query_equipment_leases,
+    )
+    from db.models.lab import query_labs
+    from db.models.lab.disposable import query_lab_disposals
+    from db.models.lab.provisionable.lab_provision import query_lab_provisions
+    from db.models.lab.storable import query_lab_storages, query_lab_storage_containers
+    from db.models.material import (
+        query_material_inventories,
+        query_material_allocations,
+        query_material_consumptions,
+        query_material_productions,
+    )
+    from db.models.search import query_search_documents, query_search_facets, query_tag_counts, query_typeahead
+    from db.models.research.plan import (
+        query_research_plans,
+        query_research_plan_tasks,
+        query_research_plan_attachments,
+    )
+    from db.models.software import (
+        query_softwares,
+        query_software_installations,
+        query_software_installation_provisions,
+        query_software_leases,
+    )
+    from db.models.uni import query_campuses
+    from db.models.uni.discipline import Discipline
+    from db.models.uni.funding import query_fundings, query_budgets, query_purchases
+    from db.models.user import User, query_users
+
+    return {
+        "search.documents": lambda ids: query_search_documents("microscope"),
+        "search.facets": lambda ids: query_search_facets("microscope"),
+        "users.search": lambda ids: query_users(search="smith"),
+        "users.typeahead": lambda ids: query_typeahead([User.name, User.email], "smi", 10),
+        "users.discipline": lambda ids: query_users(discipline=Discipline.ICT),
+        "users.supervises_lab": lambda ids: query_users(supervises_lab=ids["lab"]),
+        "campuses.search": lambda ids: query_campuses(search="rock"),
+        "labs.campus": lambda ids: query_labs(campus=ids["uni_campus"]),
+        "labs.supervised_by": lambda ids: query_labs(supervised_by=ids["user"]),
+        "labs.search": lambda ids: query_labs(search="ict"),
+        "fundings.text": lambda ids: query_fundings(text="grant"),
+        "budgets.funding": lambda ids: query_budgets(funding=ids["uni_funding"]),
+        "budgets.lab": lambda ids: query_budgets(lab=ids["lab"]),
+        "budgets.research_plan": lambda ids: query_budgets(research_plan=ids["research_plan"]),
+        "purchases.budget": lambda ids: query_purchases(budget=ids["uni_budget"]),
+        "research_plans.researcher": lambda ids: query_research_plans(researcher=ids["user"]),
+        "research_plans.coordinator": lambda ids: query_research_plans(coordinator=ids["user"]),
+        "research_plan_tasks.plan": lambda ids: query_research_plan_tasks(plan=ids["research_plan"]),
+        "research_plan_attachments.plan": lambda ids: query_research_plan_attachments(plan=ids["research_plan"]),
+        "equipments.search": lambda ids: query_equipments(search="microscope"),
+        "equipments.name_startswith": lambda ids: query_equipments(name_istartswith="micro"),
+        "equipments.has_tags": lambda ids: query_equipments(has_tags={"electronics"}),
+        "equipments.lab": lambda ids: query_equipments(lab=ids["lab"]),
+        "equipments.tag_counts": lambda ids: query_tag_counts("equipment", prefix="elec", limit=10),
+        "equipments.tag_counts.lab": lambda ids: query_tag_counts(
+            "equipment", query_equipments(lab=ids["lab"]), limit=10
+        ),
+        "equipment_installations.equipment": lambda ids: query_equipment_installations(equipment=ids["equipment"]),
+        "equipment_installations.lab": lambda ids: query_equipment_installations(lab=ids["lab"]),
+        "equipment_installation_provisions.installation": lambda ids: query_equipment_installation_provisions(
+            installation=ids["equipment_installation"], only_pending=True
+        ),
+        "equipment_installation_provisions.equipment": lambda ids: query_equipment_installation_provisions(
+            equipment=ids["equipment"]
+        ),
+        "equipment_leases.consumer": lambda ids: query_equipment_leases(
+            consumer=ids["lab_allocation_consumer"], only_pending=True
+        ),
+        "equipment_leases.installation": lambda ids: query_equipment_leases(installation=ids["equipment_installation"]),
+        "lab_provisions.provisionable": lambda ids: query_lab_provisions(
+            provisionable_type="equipment_installation",
+            provisionable_id=ids["equipment_installation"],
+            only_pending=True,
+        ),
+        "lab_storages.lab": lambda ids: query_lab_storages(lab=ids["lab"]),
+        "lab_storage_containers.storage": lambda ids: query_lab_storage_containers(storage=ids["lab_storage"]),
+        "lab_disposals.lab": lambda ids: query_lab_disposals(lab=ids["lab"]),
+        "softwares.lab": lambda ids: query_softwares(lab=ids["lab"]),
+        "software_installations.software": lambda ids: query_software_installations(software=ids["software"]),
+        "software_installation_provisions.installation": lambda ids: query_software_installation_provisions(
+            installation=ids["software_installation"], only_pending=True
+        ),
+        "software_leases.consumer": lambda ids: query_software_leases(consumer=ids["lab_allocation_consumer"]),
+        "material_inventories.material": lambda ids: query_material_inventories(material=ids["material"]),
+        "material_allocations.consumer": lambda ids: query_material_allocations(consumer=ids["lab_allocation_consumer"]),
+        "material_allocations.inventory": lambda ids: query_material_allocations(inventory=ids["material_inventory"]),
+        "material_consumptions.input_material": lambda ids: query_material_consumptions(
+            input_material=ids["material_allocation"]
+        ),
+        "material_productions.output_material": lambda ids: query_material_productions(
+            output_material=ids["material_allocation"]
+        ),
+    }
+
+
+@dataclass
+class SeqScan:
+    table: str
+    table_rows: int
+    filter: str | None
+
+    @property
+    def index_proposal(self) -> IndexProposal | None:
+        if self.filter is None:
+            return None
+        return IndexProposal.from_filter(self.table, self.filter)
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    plan: dict[str, Any]
+    planning_ms: float
+    execution_ms: float
+
+    def nodes(self) -> Iterator[dict[str, Any]]:
+        stack = [self.plan]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.get("Plans", [])))
+
+    @property
+    def shape(self) -> str:
+        """
+        The nested node types of the plan, along with the relation or
+        index scanned by each node. Costs, timings and row counts are omitted.
+        """
+        def node_shape(node: dict[str, Any]) -> str:
+            target = node.get("Index Name") or node.get("Relation Name")
+            s = node["Node Type"] + (f"({target})" if target else "")
+            children = node.get("Plans", [])
+            if children:
+                s += "[" + ", ".join(node_shape(c) for c in children) + "]"
+            return s
+
+        return node_shape(self.plan)
+
+    @property
+    def shared_blocks(self) -> int:
+        return self.plan.get("Shared Hit Blocks", 0) + self.plan.get("Shared Read Blocks", 0)
+
+    def seq_scans(self, table_rows: dict[str, int], min_rows: int) -> list[SeqScan]:
+        scans = []
+        for node in self.nodes():
+            if node["Node Type"] != "Seq Scan":
+                continue
+            table = node["Relation Name"]
+            scanned = (
+                node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+            ) * node.get("Actual Loops", 1)
+            rows = max(table_rows.get(table, 0), scanned)
+            if rows >= min_rows:
+                scans.append(SeqScan(table, rows, node.get("Filter")))
+        return scans
+
+
+_json_key_equality = re.compile(r"\(+\"?(\w+)\"? ->> '(\w+)'::text\)\s*=")
+_equality = re.compile(r"\(+\"?(\w+)\"?\)?(?:::[\w ]+)?\s*=\s*(ANY\b)?")
+_nullness = re.compile(r"\(\"?(\w+)\"? IS (NOT )?NULL\)")
+
+
+@dataclass
+class IndexProposal:
+    table: str
+    columns: list[str] = field(default_factory=list)
+    where: str | None = None
+
+    @classmethod
+    def from_filter(cls, table: str, filter: str) -> IndexProposal | None:
+        """
+        Proposes an index on the columns compared by the filter of a
+        sequential scan, with the columns compared for equality leading
+        the columns compared for membership. Null checks become the
+        predicate of a partial index.
+        """
+        equal: list[str] = []
+        member: list[str] = []
+
+        for m in _json_key_equality.finditer(filter):
+            expr = f"({m.group(1)} ->> '{m.group(2)}')"
+            if expr not in equal:
+                equal.append(expr)
+
+        for m in _equality.finditer(_json_key_equality.sub("", filter)):
+            column, is_any = m.group(1), m.group(2)
+            columns = member if is_any else equal
+            if column not in equal + member:
+                columns.append(column)
+
+        nullness = [
+            f"{m.group(1)} IS {m.group(2) or ''}NULL" for m in _nullness.finditer(filter)
+        ]
+
+        if not (equal or member):
+            return None
+        return cls(
+            table,
+            equal + member,
+            " AND ".join(nullness) if nullness else None,
+        )
+
+    @property
+    def name(self) -> str:
+        columns = [re.sub(r"\W+", "_", c).strip("_") for c in self.columns]
+        return f"ix_{self.table}_" + "_".join(columns)
+
+    def as_migration(self) -> str:
+        columns = ", ".join(
+            f"sa.text({c!r})" if c.startswith("(") else repr(c) for c in self.columns
+        )
+        args = f"{self.name!r}, {self.table!r}, [{columns}], unique=False"
+        if self.where:
+            args += f", postgresql_where=sa.text({self.where!r})"
+        return f"op.create_index({args})"
+
+
+async def table_row_estimates(db: LocalSession) -> dict[str, int]:
+    result = await db.execute(
+        text(
+            "SELECT relname, reltuples FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        )
+    )
+    return {name: max(int(rows), 0) for name, rows in result}
+
+
+async def explain_query(db: LocalSession, name: str, query: Select) -> QueryPlan:
+    result = await db.execute(explain(query))
+    explained = result.scalar_one()
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    explained = explained[0]
+    return QueryPlan(
+        name,
+        explained["Plan"],
+        planning_ms=explained.get("Planning Time", 0.0),
+        execution_ms=explained.get("Execution Time", 0.0),
+    )
+
+
+async def explain_query_cases(
+    db: LocalSession, only: list[str] | None = None
+) -> tuple[list[QueryPlan], dict[str, str]]:
+    """
+    The plans of the query cases, along with the error which prevented
+    each of the remaining cases from being explained.
+    """
+    ids = await sample_ids(db)
+    plans = []
+    failures: dict[str, str] = {}
+    try:
+        for name, case in _query_cases().items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            try:
+                async with db.begin_nested():
+                    plans.append(await explain_query(db, name, case(ids)))
+            except (NotImplementedError, DBAPIError) as e:
+                message = str(e).splitlines()[0] if str(e) else ""
+                failures[name] = f"{type(e).__name__}: {message}"
+    finally:
+        # ANALYZE executes the statements, which only read.
+        await db.rollback()
+    return plans, failures
+
+
+@dataclass
+class QueryPlanReport:
+    plans: list[QueryPlan]
+    seq_scans: dict[str, list[SeqScan]]
+    failures: dict[str, str] = field(default_factory=dict)
+    changed_shapes: dict[str, tuple[str | None, str]] = field(default_factory=dict)
+
+    @property
+    def index_proposals(self) -> list[IndexProposal]:
+        proposals: dict[str, IndexProposal] = {}
+        for scans in self.seq_scans.values():
+            for scan in scans:
+                proposal = scan.index_proposal
+                if proposal is not None:
+                    proposals.setdefault(proposal.name, proposal)
+        return list(proposals.values())
+
+    def lines(self) -> Iterator[str]:
+        for plan in self.plans:
+            yield (
+                f"{plan.name:<50}"
+                f"{plan.execution_ms:9.2f} ms  "
+                f"{plan.shared_blocks:7d} blocks"
+            )
+            for scan in self.seq_scans.get(plan.name, []):
+                yield f"    seq scan on {scan.table} (~{scan.table_rows} rows) filter: {scan.filter}"
+
+        if self.failures:
+            yield ""
+            yield "Query cases which could not be explained:"
+            for name, error in self.failures.items():
+                yield f"    {name}: {error}"
+
+        proposals = self.index_proposals
+        if proposals:
+            yield ""
+            yield "Proposed indexes:"
+            for proposal in proposals:
+                yield "    " + proposal.as_migration()
+
+        if self.changed_shapes:
+            yield ""
+            yield "Plans which differ from the baseline:"
+            for name, (expected, actual) in self.changed_shapes.items():
+                yield f"    {name}"
+                yield f"        expected: {expected}"
+                yield f"        actual:   {actual}"
+
+
+async def query_plan_report(
+    db: LocalSession,
+    min_rows: int,
+    baseline: Path | None = None,
+    update_baseline: bool = False,
+    only: list[str] | None = None,
+) -> QueryPlanReport:
+    """
+    Explains the query cases and reports their sequential scans.
+
+    If a baseline file is given, the plan shapes are compared against it
+    (and recorded to it, if it does not exist or `update_baseline` is set).
+    """
+    table_rows = await table_row_estimates(db)
+    plans, failures = await explain_query_cases(db, only=only)
+
+    report = QueryPlanReport(
+        plans,
+        seq_scans={
+            plan.name: scans
+            for plan in plans
+            if (scans := plan.seq_scans(table_rows, min_rows))
+        },
+        failures=failures,
+    )
+
+    if baseline is None:
+        return report
+
+    shapes = {plan.name: plan.shape for plan in plans}
+    if update_baseline or not baseline.exists():
+        recorded = json.loads(baseline.read_text()) if baseline.exists() else {}
+        recorded.update(shapes)
+        baseline.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+        return report
+
+    expected = json.loads(baseline.read_text())
+    report.changed_shapes = {
+        name: (expected.get(name), shape)
+        for name, shape in shapes.items()
+        if expected.get(name) != shape
+    }
+    return report
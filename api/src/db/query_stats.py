@@ -0,0 +1,107 @@
+"""
+Attributes the statements executed by the engines to the current request.
+
+Each statement is reduced to a fingerprint (the statement with its parameter
+lists collapsed), so that statements which have the same shape (eg. the same
+lookup executed once per item of an index page) are counted together.
+
+The tables read or written by each compiled statement are also collected,
+so that the results of a request can be attributed to the tables they were
+built from.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import re
+import time
+from typing import Iterator
+
+from sqlalchemy import Table, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.util import find_tables
+
+_parameter_list = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)")
+_parameter = re.compile(r"%\(\w+\)s")
+_whitespace = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    fingerprint = _parameter_list.sub("(?)", statement)
+    fingerprint = _parameter.sub("?", fingerprint)
+    return _whitespace.sub(" ", fingerprint).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+    tables: set[str] = field(default_factory=set)
+
+    # The stats collected by an enclosing context, which also record the statement.
+    parent: QueryStats | None = None
+
+    def record(self, statement: str, elapsed_seconds: float, tables: set[str]):
+        self.count += 1
+        self.total_seconds += elapsed_seconds
+        self.fingerprints[statement_fingerprint(statement)] += 1
+        self.tables.update(tables)
+        if self.parent is not None:
+            self.parent.record(statement, elapsed_seconds, tables)
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        The fingerprints of statements which were executed more than `threshold` times.
+        """
+        return [(f, n) for f, n in self.fingerprints.most_common() if n > threshold]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """
+    Collects the statements executed (by any task spawned) within the context.
+
+    Statements are also recorded by the stats of any enclosing context.
+    """
+    stats = QueryStats(parent=_query_stats.get())
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["statement_started_at"].pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at, _statement_tables(context))
+
+
+def _statement_tables(context) -> set[str]:
+    compiled = getattr(context, "compiled", None)
+    if compiled is None or compiled.statement is None:
+        return set()
+    return {
+        t.name for t in find_tables(compiled.statement, include_crud=True)
+        if isinstance(t, Table)
+    }
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_statement_timer(context):
+    started = context.connection.info.get("statement_started_at") if context.connection else None
+    if started:
+        started.pop()
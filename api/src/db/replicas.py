@@ -0,0 +1,168 @@
+"""
+Routing of read only sessions to read replicas of the primary database.
+
+A session which is routed to a replica executes every statement against
+the replica until the session writes. Once the session has flushed (or
+executed an insert, update or delete) it is pinned to the primary.
+
+Statements which fail because the replica is unavailable are retried against
+the primary. For a short time after any write is committed, every session reads
+from the primary, so that process local caches invalidated by the write are not
+refilled from a replica which has not yet replayed it.
+"""
+from __future__ import annotations
+
+import itertools
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+
+class ReplicaRouter:
+    """
+    Chooses a replica for each read only session, round robin between
+    the replicas which are currently healthy.
+
+    A replica which fails to connect (or loses its connection) is skipped
+    for `retry_seconds`, during which sessions fall back to the primary.
+
+    Once a write has been committed, replicas are skipped for `lag_seconds`.
+    """
+
+    def __init__(self, replicas: list[AsyncEngine], retry_seconds: float, lag_seconds: float):
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self.lag_seconds = lag_seconds
+        self._unhealthy_until: dict[AsyncEngine, float] = {}
+        self._read_primary_until = 0.0
+        self._next_index = itertools.count()
+
+        for replica in replicas:
+            self._listen_for_errors(replica)
+
+    def _listen_for_errors(self, replica: AsyncEngine):
+        @event.listens_for(replica.sync_engine, "handle_error")
+        def mark_unhealthy_on_disconnect(context: ExceptionContext):
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(replica)
+
+    def mark_unhealthy(self, replica: AsyncEngine):
+        self._unhealthy_until[replica] = time.monotonic() + self.retry_seconds
+
+    def is_healthy(self, replica: AsyncEngine) -> bool:
+        return self._unhealthy_until.get(replica, 0.0) <= time.monotonic()
+
+    def note_commit(self):
+        self._read_primary_until = time.monotonic() + self.lag_seconds
+
+    def is_readable(self, replica: AsyncEngine) -> bool:
+        """
+        Whether reads can currently be routed to the replica.
+        """
+        return self.is_healthy(replica) and self._read_primary_until <= time.monotonic()
+
+    def choose(self) -> AsyncEngine | None:
+        """
+        The next healthy replica, or `None` if there are no healthy replicas.
+        """
+        if not self.replicas:
+            return None
+
+        start = next(self._next_index)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self.is_readable(replica):
+                return replica
+        return None
+
+
+def route_to_replica(session: Session, router: ReplicaRouter, replica: AsyncEngine | None):
+    if replica is not None:
+        session.info["replica_router"] = router
+        session.info["replica_engine"] = replica
+
+
+def is_pinned_to_primary(session: Session) -> bool:
+    return session.info.get("pinned_to_primary", False)
+
+
+def _readable_replica(session: Session) -> AsyncEngine | None:
+    """
+    The replica which the next read of the session should execute against,
+    or `None` if it should read from the primary.
+    """
+    replica = session.info.get("replica_engine")
+    if replica is None or is_pinned_to_primary(session):
+        return None
+    router: ReplicaRouter = session.info["replica_router"]
+    return replica if router.is_readable(replica) else None
+
+
+class RoutingSession(Session):
+    """
+    A session which executes statements against the replica it was routed to,
+    unless it has been pinned to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = _readable_replica(self)
+        if replica is not None:
+            return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _fall_back_to_primary(orm_execute_state: ORMExecuteState):
+    session = orm_execute_state.session
+    if _readable_replica(session) is None:
+        return None
+    try:
+        return orm_execute_state.invoke_statement()
+    except DBAPIError:
+        # The router marks a replica which failed to connect (or lost its
+        # connection) as unhealthy, in which case the statement is retried
+        # against the primary.
+        if _readable_replica(session) is not None:
+            raise
+        _discard_invalidated_connection(session, session.info["replica_engine"])
+        return orm_execute_state.invoke_statement()
+
+
+def _discard_invalidated_connection(session: Session, replica: AsyncEngine):
+    """
+    Removes the connection to a replica which lost its connection from the
+    transaction of the session.
+
+    The transaction of an invalidated connection can only be rolled back, which
+    would otherwise prevent the session from committing its writes to the primary.
+    """
+    transaction = session.get_transaction()
+    if transaction is None:
+        return
+    # Session has no public api to release a single bind of its transaction,
+    # which tracks each of its connections by both the engine and the connection.
+    bound = transaction._connections.get(replica.sync_engine)
+    if bound is not None and bound[0].invalidated:
+        connection = bound[0]
+        transaction._connections.pop(replica.sync_engine, None)
+        transaction._connections.pop(connection, None)
+        connection.close()
+
+
+@event.listens_for(Session, "before_flush")
+def _pin_flushing_session(session: Session, flush_context: UOWTransaction, instances):
+    session.info["pinned_to_primary"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_writing_session(orm_execute_state: ORMExecuteState):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["pinned_to_primary"] = True
@@ -0,0 +1,182 @@
+"""
+A synthetic catalogue of users, equipment, software and materials (along with
+their installations and inventories in the seeded labs), for diagnosing query
+plans against a database of a realistic size.
+
+Rows are generated by the database from `generate_series`, with a fixed
+random seed so that every run generates the same distribution of values.
+Requires the campuses, labs and users of `seed_all`.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from db.models.search import reindex_search_documents, reindex_tag_frequency
+
+SYNTHETIC_SCALE_DEFAULT = 20_000
+
+_SURNAMES = "ARRAY['Smith', 'Jones', 'Williams', 'Brown', 'Wilson', 'Taylor', 'Nguyen', 'Martin', 'Anderson', 'White']"
+_EQUIPMENT_NOUNS = "ARRAY['Microscope', 'Oscilloscope', 'Lathe', 'Spectrometer', 'Centrifuge', 'Soldering Station', 'Drill Press', 'Multimeter']"
+_SOFTWARE_NOUNS = "ARRAY['Studio', 'Designer', 'Analyser', 'Simulator', 'Workbench', 'Toolkit']"
+_MATERIAL_NOUNS = "ARRAY['Acetone', 'Ethanol', 'Copper Wire', 'Steel Plate', 'Epoxy', 'Solder', 'Resistor', 'Cement']"
+_DISCIPLINES = "ARRAY['ICT', 'ELECTRICAL', 'CIVIL', 'MECHANICAL']"
+_TAGS = "ARRAY['electronics', 'electrical', 'optics', 'mechanical', 'chemistry', 'civil', 'safety', 'computing']"
+
+
+def _pick(array: str) -> str:
+    return f"({array})[1 + floor(random() * array_length({array}, 1))::int]"
+
+
+def _tags() -> str:
+    # Correlated with the generated row, so that each row has its own tags
+    return f"ARRAY(SELECT DISTINCT {_pick(_TAGS)} FROM generate_series(0, floor(random() * 3)::int) WHERE i > 0)"
+
+
+_SYNTHETIC_STATEMENTS = [
+    f"""
+    INSERT INTO "user" (domain, email, name, disabled, title, campus_id, disciplines)
+    SELECT 'NATIVE', 'synthetic.user.' || i || '@example.com',
+        'Synthetic ' || {_pick(_SURNAMES)}, false, 'Researcher',
+        campuses[1 + i % array_length(campuses, 1)],
+        ARRAY[{_pick(_DISCIPLINES)}]::discipline[]
+    FROM generate_series(1, :scale) i,
+        (SELECT array_agg(id ORDER BY code) AS campuses FROM uni_campus) c
+    """,
+    f"""
+    INSERT INTO software (name, description, tags, requires_license, is_paid_software)
+    SELECT 'Synthetic ' || {_pick(_SOFTWARE_NOUNS)} || ' ' || i, '', {_tags()},
+        random() < 0.5, random() < 0.25
+    FROM generate_series(1, :scale / 4) i
+    """,
+    f"""
+    INSERT INTO equipment (name, description, tags)
+    SELECT 'Synthetic ' || {_pick(_EQUIPMENT_NOUNS)} || ' ' || i, '', {_tags()}
+    FROM generate_series(1, :scale) i
+    """,
+    f"""
+    INSERT INTO material (name, unit_of_measurement)
+    SELECT 'Synthetic ' || {_pick(_MATERIAL_NOUNS)} || ' ' || i, 'g'
+    FROM generate_series(1, :scale / 4) i
+    """,
+    # Each installable is installed in a single lab.
+    """
+    WITH installed AS (
+        INSERT INTO lab_installation (type, lab_id, installable_id, created_by_id)
+        SELECT 'equipment', labs[1 + floor(random() * array_length(labs, 1))::int], e.id, u.id
+        FROM equipment e,
+            (SELECT array_agg(id ORDER BY id) AS labs FROM lab) l,
+            (SELECT id FROM "user" ORDER BY email LIMIT 1) u
+        WHERE NOT EXISTS (SELECT 1 FROM lab_installation WHERE installable_id = e.id)
+        RETURNING id, installable_id
+    )
+    INSERT INTO equipment_installation (id, equipment_id, installed_model_name, num_installed)
+    SELECT id, installable_id, '', 1 + floor(random() * 4)::int FROM installed
+    """,
+    """
+    WITH installed AS (
+        INSERT INTO lab_installation (type, lab_id, installable_id, created_by_id)
+        SELECT 'software', labs[1 + floor(random() * array_length(labs, 1))::int], s.id, u.id
+        FROM software s,
+            (SELECT array_agg(id ORDER BY id) AS labs FROM lab) l,
+            (SELECT id FROM "user" ORDER BY email LIMIT 1) u
+        WHERE NOT EXISTS (SELECT 1 FROM lab_installation WHERE installable_id = s.id)
+        RETURNING id, installable_id
+    )
+    INSERT INTO software_installation (id, software_id, installed_version)
+    SELECT id, installable_id, '1.' || floor(random() * 10)::int FROM installed
+    """,
+    """
+    INSERT INTO material_inventory (
+        lab_id, material_id, last_measured_quantity, estimated_quantity,
+        last_measured_at, last_measured_by_id, last_measured_note
+    )
+    SELECT labs[1 + floor(random() * array_length(labs, 1))::int], m.id,
+        m.quantity, m.quantity, TIMEZONE('utc', CURRENT_TIMESTAMP), u.id, ''
+    FROM (SELECT id, floor(random() * 1000) AS quantity FROM material) m,
+        (SELECT array_agg(id ORDER BY id) AS labs FROM lab) l,
+        (SELECT id FROM "user" ORDER BY email LIMIT 1) u
+    WHERE NOT EXISTS (SELECT 1 FROM material_inventory WHERE material_id = m.id)
+    """,
+    # A provision (and its work) for each installation. A quarter of the
+    # equipment provisions are transfers to another lab.
+    """
+    WITH provisions AS MATERIALIZED (
+        SELECT gen_random_uuid() AS id, gen_random_uuid() AS work_id,
+            i.id AS installation_id, i.lab_id, i.type || '_installation' AS provisionable_type,
+            e.equipment_id, s.software_id,
+            CASE WHEN e.id IS NOT NULL AND random() < 0.25
+                THEN labs[1 + floor(random() * array_length(labs, 1))::int]
+            END AS destination_lab_id,
+            budgets[1 + floor(random() * array_length(budgets, 1))::int] AS budget_id,
+            u.id AS created_by_id
+        FROM lab_installation i
+            LEFT JOIN equipment_installation e ON e.id = i.id
+            LEFT JOIN software_installation s ON s.id = i.id,
+            (SELECT array_agg(id ORDER BY id) AS labs FROM lab) l,
+            (SELECT array_agg(id ORDER BY id) AS budgets FROM uni_budget) b,
+            (SELECT id FROM "user" ORDER BY email LIMIT 1) u
+        WHERE NOT EXISTS (SELECT 1 FROM lab_provision WHERE installation_id = i.id)
+    ),
+    work AS (
+        INSERT INTO lab_work (id, work_order_type, work_order_id, status, lab_id, creation)
+        SELECT p.work_id, 'lab_provision', p.id, 'CREATED', p.lab_id,
+            jsonb_build_object(
+                'work_id', p.work_id, 'status', 'WorkStatus.CREATED',
+                'at', TIMEZONE('utc', CURRENT_TIMESTAMP), 'by_id', p.created_by_id,
+                'note', 'from work order ' || p.id
+            )
+        FROM provisions p
+    )
+    INSERT INTO lab_provision (
+        id, action, action_params_json, installation_id, equipment_id, destination_lab_id,
+        status, lab_id, provisionable_type, provisionable_id,
+        previous_requests, requested_at, requested_by_id, requested_note, all_rejections,
+        work_id, budget_id, created_by_id, estimated_cost, purchase_instructions,
+        has_multiple_days, description
+    )
+    SELECT p.id,
+        CASE
+            WHEN p.software_id IS NOT NULL THEN 'new_software'
+            WHEN p.destination_lab_id IS NULL THEN 'new_equipment'
+            ELSE 'transfer_equipment'
+        END,
+        CASE
+            WHEN p.software_id IS NOT NULL THEN json_build_object(
+                'action', 'new_software', 'software_id', p.software_id,
+                'installation_id', p.installation_id, 'min_version', '1.0',
+                'requires_license', false, 'is_free_software', true
+            )
+            WHEN p.destination_lab_id IS NULL THEN json_build_object(
+                'action', 'new_equipment', 'installation_id', p.installation_id,
+                'equipment_id', p.equipment_id, 'num_required', 1
+            )
+            ELSE json_build_object(
+                'action', 'equipment_transfer', 'equipment_id', p.equipment_id,
+                'installation_id', p.installation_id,
+                'destination_lab_id', p.destination_lab_id, 'num_transferred', 1
+            )
+        END,
+        p.installation_id, p.equipment_id, p.destination_lab_id,
+        'REQUESTED', p.lab_id, p.provisionable_type, p.installation_id,
+        '[]', TIMEZONE('utc', CURRENT_TIMESTAMP), p.created_by_id, '', '[]',
+        p.work_id, p.budget_id, p.created_by_id, 0, '', false, ''
+    FROM provisions p
+    """,
+]
+
+
+async def seed_synthetic(db: AsyncConnection, scale: int = SYNTHETIC_SCALE_DEFAULT):
+    await db.execute(text("SELECT setseed(0.5)"))
+    for statement in _SYNTHETIC_STATEMENTS:
+        await db.execute(text(statement), {"scale": scale})
+
+    await reindex_search_documents(db)
+    await reindex_tag_frequency(db)
+
+
+async def vacuum_synthetic(db: AsyncConnection):
+    """
+    Vacuums and analyzes the seeded tables, so that the visibility map and
+    statistics seen by the planner do not change when autovacuum next visits
+    them. Must run on an autocommit connection after the seed is committed.
+    """
+    await db.execute(text("VACUUM ANALYZE"))
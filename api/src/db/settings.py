@@ -15,6 +15,45 @@ class DbSettings(BaseSettings):
     db_port: int = 5432
     db_name: str = "api"
 
+    # Connection pool of the engine.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # The number of seconds to wait for a connection before giving up.
+    db_pool_timeout: float = 30.0
+    # Connections older than this number of seconds are replaced when checked out.
+    # A negative value never replaces connections.
+    db_pool_recycle: int = -1
+    # Test connections for liveness when they are checked out.
+    db_pool_pre_ping: bool = False
+
+    # Urls of read replicas of the database. The sessions of GET requests
+    # read from a replica (round robin) until they write.
+    db_replica_urls: list[str] = []
+    # The number of seconds a replica which failed to connect is skipped for.
+    db_replica_retry_seconds: float = 30.0
+    # The number of seconds after a write is committed during which sessions
+    # read from the primary rather than from a (possibly lagging) replica.
+    db_replica_lag_seconds: float = 5.0
+
+    # The number of threads which hash and verify passwords.
+    db_password_hash_workers: int = 2
+    # The number of password hashing operations which can wait for a thread
+    # before further operations are refused.
+    db_password_hash_max_queued: int = 32
+
+    # The maximum number of forks of a request session which run queries concurrently.
+    db_fork_max_concurrency: int = 4
+
+    @property
+    def db_fork_pool_slots(self) -> int:
+        """
+        The maximum number of forks (of all request sessions) which hold a
+        connection at the same time. Forks take at most all but one of the
+        pooled connections, so they never grow the pool into its overflow,
+        which is left to the request sessions.
+        """
+        return max(1, self.db_pool_size - 1)
+
     @property
     def db_url(self):
         return (
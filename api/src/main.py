@@ -41,6 +41,68 @@ def db_seed():
     from db import seed_db
     return asyncio.run(seed_db())
 
+@db_group.command('seed-synthetic')
+@click.option('--scale', default=20_000, help='the number of synthetic users and equipment to generate')
+def db_seed_synthetic(scale: int):
+    """
+    Generate a synthetic catalogue in the seeded database, for diagnosing query plans.
+    """
+    from db import engine, _import_models
+    from db.seeds.seed_synthetic import seed_synthetic, vacuum_synthetic
+    _import_models()
+
+    async def seed():
+        async with engine.begin() as db:
+            await seed_synthetic(db, scale=scale)
+        async with engine.connect() as db:
+            await db.execution_options(isolation_level="AUTOCOMMIT")
+            await vacuum_synthetic(db)
+
+    return asyncio.run(seed())
+
+@db_group.command('reindex-search')
+def db_reindex_search():
+    from db import engine, _import_models
+    from db.models.search import reindex_search_documents, reindex_tag_frequency
+    _import_models()
+
+    async def reindex():
+        async with engine.begin() as db:
+            await reindex_search_documents(db)
+            await reindex_tag_frequency(db)
+
+    return asyncio.run(reindex())
+
+@db_group.command('explain')
+@click.option('--min-rows', default=10_000, help='report sequential scans of tables with at least this many rows')
+@click.option('--baseline', type=click.Path(dir_okay=False), default=None, help='compare plan shapes against this file')
+@click.option('--update-baseline/--no-update-baseline', default=False, help='record the current plan shapes to the baseline')
+@click.argument('only', nargs=-1)
+def db_explain(min_rows: int, baseline: str | None, update_baseline: bool, only: tuple[str, ...]):
+    """
+    Explain the query builders and report sequential scans and plan changes.
+    """
+    from pathlib import Path
+    from db import local_sessionmaker
+    from db.query_plans import query_plan_report
+
+    async def explain():
+        async with local_sessionmaker() as db:
+            return await query_plan_report(
+                db,
+                min_rows=min_rows,
+                baseline=Path(baseline) if baseline else None,
+                update_baseline=update_baseline,
+                only=list(only),
+            )
+
+    report = asyncio.run(explain())
+    for line in report.lines():
+        print(line)
+
+    if report.failures or report.changed_shapes:
+        raise SystemExit(1)
+
 @cli.group('api')
 def api_group():
     pass
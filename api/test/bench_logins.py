@@ -0,0 +1,85 @@
+"""
+Simulates a login storm and reports the login throughput along with the
+latency of unrelated work on the event loop (which stands in for the other
+routes served by the process), with passwords verified on the event loop
+and on the password hasher threads.
+"""
+import asyncio
+import statistics
+import time
+
+from passlib.hash import pbkdf2_sha256
+
+from db.password_hashing import PasswordHasher, PasswordHasherBusy
+
+
+async def verify_on_loop(password: str, password_hash: str) -> bool:
+    return pbkdf2_sha256.verify(password, password_hash)
+
+
+async def unrelated_requests(stop: asyncio.Event, interval: float = 0.005) -> list[float]:
+    """
+    The time taken for each of a sequence of trivial requests,
+    which only need to be scheduled on the event loop.
+    """
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_storm(verify, password_hash: str, num_logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            try:
+                assert await verify("password", password_hash)
+            except PasswordHasherBusy:
+                rejected += 1
+
+    stop = asyncio.Event()
+    unrelated = asyncio.create_task(unrelated_requests(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(num_logins)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    latencies = await unrelated
+    return elapsed, rejected, latencies
+
+
+def p99(values: list[float]) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[98]
+
+
+async def main(num_logins: int = 200, concurrency: int = 50):
+    password_hash = pbkdf2_sha256.hash("password")
+    hasher = PasswordHasher(max_workers=4, max_queued=num_logins)
+
+    for label, verify in (
+        ("event loop", verify_on_loop),
+        ("hasher threads", hasher.verify),
+    ):
+        elapsed, rejected, latencies = await login_storm(
+            verify, password_hash, num_logins, concurrency
+        )
+        print(
+            f"{label:<16}"
+            f"{(num_logins - rejected) / elapsed:8.1f} logins/s  "
+            f"rejected {rejected:4d}  "
+            f"unrelated p99 {p99(latencies) * 1000:8.2f} ms "
+            f"(max {max(latencies, default=0.0) * 1000:.2f} ms, n={len(latencies)})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
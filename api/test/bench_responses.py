@@ -0,0 +1,165 @@
+"""
+Compares the cost of encoding an index page of provision-like details
+through fastapi's default response pipeline and through `ModelResponse`.
+"""
+import json
+import timeit
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from api.responses import ModelResponse
+from api.schemas.base_schemas import BaseModel
+
+
+class BenchTransition(BaseModel):
+    status: str
+    at: datetime
+    by_id: UUID
+    note: str
+
+
+class BenchProvisionDetail(BaseModel):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+    action: str
+    status: str
+    lab_id: UUID
+    provisionable_type: str
+    provisionable_id: UUID
+    budget_id: UUID | None
+    estimated_cost: float
+    purchase_url: str | None
+    purchase_instructions: str
+
+    requested_by_id: UUID
+    requested_at: datetime
+    all_requests: list[BenchTransition]
+    all_rejections: list[BenchTransition]
+
+    is_rejected: bool
+    rejected_at: datetime | None
+    rejected_by_id: UUID | None
+    is_denied: bool
+    denied_at: datetime | None
+    denied_by_id: UUID | None
+    is_approved: bool
+    approved_at: datetime | None
+    approved_by_id: UUID | None
+    is_purchased: bool
+    purchased_at: datetime | None
+    purchased_by_id: UUID | None
+    is_completed: bool
+    completed_at: datetime | None
+    completed_by_id: UUID | None
+    is_cancelled: bool
+    cancelled_at: datetime | None
+    cancelled_by_id: UUID | None
+    is_finalised: bool
+    finalised_at: datetime | None
+    finalised_by_id: UUID | None
+
+    installation_id: UUID
+    equipment_id: UUID
+    num_required: int
+
+
+class BenchProvisionIndexPage(BaseModel):
+    items: list[BenchProvisionDetail]
+    total_item_count: int | None
+    total_page_count: int | None
+    page_index: int
+    page_size: int
+
+
+def bench_page(page_size: int = 20) -> BenchProvisionIndexPage:
+    now = datetime.now(timezone.utc)
+
+    def transition(status: str):
+        return BenchTransition(status=status, at=now, by_id=uuid4(), note="note")
+
+    items = [
+        BenchProvisionDetail(
+            id=uuid4(),
+            created_at=now,
+            updated_at=now,
+            action="new_equipment",
+            status="requested",
+            lab_id=uuid4(),
+            provisionable_type="equipment_installation",
+            provisionable_id=uuid4(),
+            budget_id=uuid4(),
+            estimated_cost=1234.5,
+            purchase_url="https://example.com/purchase",
+            purchase_instructions="Purchase instructions",
+            requested_by_id=uuid4(),
+            requested_at=now,
+            all_requests=[transition("requested") for _ in range(3)],
+            all_rejections=[transition("rejected") for _ in range(2)],
+            is_rejected=False, rejected_at=None, rejected_by_id=None,
+            is_denied=False, denied_at=None, denied_by_id=None,
+            is_approved=True, approved_at=now, approved_by_id=uuid4(),
+            is_purchased=True, purchased_at=now, purchased_by_id=uuid4(),
+            is_completed=False, completed_at=None, completed_by_id=None,
+            is_cancelled=False, cancelled_at=None, cancelled_by_id=None,
+            is_finalised=False, finalised_at=None, finalised_by_id=None,
+            installation_id=uuid4(),
+            equipment_id=uuid4(),
+            num_required=4,
+        )
+        for _ in range(page_size)
+    ]
+    return BenchProvisionIndexPage(
+        items=items,
+        total_item_count=page_size,
+        total_page_count=1,
+        page_index=1,
+        page_size=page_size,
+    )
+
+
+_page_adapter = TypeAdapter(BenchProvisionIndexPage)
+
+
+def encode_with_response_model(page: BenchProvisionIndexPage) -> bytes:
+    # Mirrors fastapi's serialize_response for a route with a declared response model
+    content = page.model_dump(by_alias=True)
+    value = _page_adapter.validate_python(content)
+    serialized = _page_adapter.dump_python(value, mode="json", by_alias=True)
+    return bytes(JSONResponse(jsonable_encoder(serialized)).body)
+
+
+def encode_without_response_model(page: BenchProvisionIndexPage) -> bytes:
+    return bytes(JSONResponse(jsonable_encoder(page)).body)
+
+
+def encode_with_model_response(page: BenchProvisionIndexPage) -> bytes:
+    return bytes(ModelResponse(page).body)
+
+
+def main(number: int = 200):
+    page = bench_page()
+
+    # The encodings differ only in the formatting of datetimes
+    expected = json.loads(encode_without_response_model(page))
+    for encode in (encode_with_response_model, encode_with_model_response):
+        encoded = json.loads(encode(page))
+        assert encoded.keys() == expected.keys(), encode.__name__
+        assert encoded["items"][0].keys() == expected["items"][0].keys(), encode.__name__
+
+    for encode in (
+        encode_with_response_model,
+        encode_without_response_model,
+        encode_with_model_response,
+    ):
+        elapsed = timeit.timeit(lambda: encode(page), number=number)
+        print(f"{encode.__name__:<36}{elapsed / number * 1000:8.3f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compares the per item cost of constructing provision and allocation details
+with validation and without it (`model_construct`).
+
+`model_construct` is slower than validating the same attributes, so details
+are always constructed with validation.
+"""
+import timeit
+from datetime import date, datetime, timezone
+from typing import Any, Callable
+from uuid import uuid4
+
+from db.models.lab.allocatable import AllocationStatus, AllocationStatusTransition
+from db.models.lab.provisionable import ProvisionStatus, ProvisionTransition
+
+from api.schemas.base_schemas import ModelDetail
+from api.schemas.lab import LabProvisionDetail
+from api.schemas.material import MaterialAllocationDetail
+
+
+def provision_fields() -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    provision_id = uuid4()
+
+    def transition(status: ProvisionStatus):
+        return ProvisionTransition(
+            provision_id=provision_id, status=status, at=now, by_id=uuid4(), note="note"
+        )
+
+    return dict(
+        id=provision_id,
+        created_at=now,
+        updated_at=now,
+        action="new_equipment",
+        status=ProvisionStatus.APPROVED,
+        lab_id=uuid4(),
+        provisionable_type="equipment_installation",
+        provisionable_id=uuid4(),
+        budget_id=uuid4(),
+        budget=None,
+        ordered_by_id=uuid4(),
+        estimated_cost=1234.5,
+        purchase=None,
+        requested_by_id=uuid4(),
+        requested_at=now,
+        all_requests=[transition(ProvisionStatus.REQUESTED) for _ in range(3)],
+        is_rejected=False, rejected_at=None, rejected_by_id=None,
+        all_rejections=[transition(ProvisionStatus.REJECTED) for _ in range(2)],
+        is_denied=False, denied_at=None, denied_by_id=None,
+        is_approved=True, approved_at=now, approved_by_id=uuid4(),
+        is_purchased=False, purchased_at=None, purchased_by_id=None,
+        is_completed=False, completed_at=None, completed_by_id=None,
+        is_cancelled=False, cancelled_at=None, cancelled_by_id=None,
+        is_finalised=False, finalised_at=None, finalised_by_id=None,
+    )
+
+
+def allocation_fields() -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    allocation_id = uuid4()
+
+    def transition(status: AllocationStatus):
+        return AllocationStatusTransition(
+            allocation_id=allocation_id, status=status, at=now, by_id=uuid4(), note="note"
+        )
+
+    return dict(
+        id=allocation_id,
+        created_at=now,
+        updated_at=now,
+        type="material_allocation",
+        lab_id=uuid4(),
+        status=AllocationStatus.IN_PROGRESS,
+        start_date=date.today(),
+        end_date=date.today(),
+        request_at=now,
+        request_by_id=uuid4(),
+        consumer_type="research_plan",
+        consumer_id=uuid4(),
+        all_requests=[transition(AllocationStatus.REQUESTED) for _ in range(3)],
+        approved_at=now, approved_by_id=uuid4(), is_approved=True,
+        rejected_at=None, rejected_by_id=None, is_rejected=False,
+        all_rejections=[transition(AllocationStatus.REJECTED) for _ in range(2)],
+        denied_at=None, denied_by_id=None, is_denied=False,
+        setup_begin_at=now, setup_by_id=uuid4(),
+        prepared_at=now, is_prepared=True,
+        commenced_at=now, commenced_by_id=uuid4(), is_commenced=True,
+        progress_events=[transition(AllocationStatus.IN_PROGRESS) for _ in range(5)],
+        completed_at=None, completed_by_id=None, is_completed=False,
+        cancelled_at=None, cancelled_by_id=None, is_cancelled=False,
+        teardown_begin_at=None, teardown_by_id=None,
+        is_finalised=False, finalised_at=None, finalised_by_id=None,
+        inventory_id=uuid4(),
+        material_id=uuid4(),
+        material_name="material",
+        is_input=True,
+        is_output=False,
+    )
+
+
+def main(number: int = 2000):
+    cases: list[tuple[type[ModelDetail[Any]], dict[str, Any]]] = [
+        (LabProvisionDetail, provision_fields()),
+        (MaterialAllocationDetail, allocation_fields()),
+    ]
+    for detail_cls, fields in cases:
+        validated: ModelDetail[Any] = detail_cls(**fields)
+        constructed: ModelDetail[Any] = detail_cls.model_construct(**fields)
+        assert validated.model_dump_json() == constructed.model_dump_json(), detail_cls.__name__
+
+        constructors: list[tuple[str, Callable[[], ModelDetail[Any]]]] = [
+            ("validated", lambda: detail_cls(**fields)),
+            ("trusted", lambda: detail_cls.model_construct(**fields)),
+        ]
+        for label, construct in constructors:
+            elapsed = timeit.timeit(construct, number=number)
+            print(f"{detail_cls.__name__:<28}{label:<12}{elapsed / number * 1_000_000:8.1f} us/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Times filtering a large equipment catalogue by tags, with the tags GIN index
+and with index scans disabled (as before the index was added).
+
+The catalogue is inserted into the configured database in a transaction
+which is rolled back once the benchmark completes. The table is then vacuumed
+and reindexed, so the dead rows of the catalogue do not skew the plans of
+later queries.
+"""
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from db import LocalSession, engine, local_sessionmaker
+from db.models.equipment import query_equipments
+
+
+async def insert_catalogue(db: LocalSession, num_equipments: int, num_tags: int):
+    await db.execute(
+        text(
+            "INSERT INTO equipment (name, description, tags) "
+            "SELECT 'bench equipment ' || i, '', ARRAY("
+            "   SELECT DISTINCT 'tag-' || floor(random() * :num_tags)::int "
+            "   FROM generate_series(1, 2 + i % 4)"
+            ") "
+            "FROM generate_series(1, :num_equipments) AS i"
+        ),
+        {"num_equipments": num_equipments, "num_tags": num_tags},
+    )
+    await db.execute(text("ANALYZE equipment"))
+
+
+async def time_filter(db: LocalSession, tags: set[str], repeat: int) -> tuple[float, int]:
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len((await db.scalars(query_equipments(has_tags=tags))).all())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), count
+
+
+async def main(num_equipments: int = 200_000, num_tags: int = 500, repeat: int = 10):
+    async with local_sessionmaker() as db:
+        try:
+            await insert_catalogue(db, num_equipments, num_tags)
+
+            for tags in ({"tag-1"}, {"tag-1", "tag-2"}):
+                for label, enable_index_scans in (("gin index", "on"), ("seq scan", "off")):
+                    await db.execute(text(f"SET LOCAL enable_bitmapscan = {enable_index_scans}"))
+                    await db.execute(text(f"SET LOCAL enable_indexscan = {enable_index_scans}"))
+                    median, count = await time_filter(db, tags, repeat)
+                    print(
+                        f"{','.join(sorted(tags)):<16}{label:<12}"
+                        f"{median * 1000:9.2f} ms  ({count} matches)"
+                    )
+        finally:
+            await db.rollback()
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE equipment"))
+        await conn.execute(text("REINDEX TABLE equipment"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Checks that the responses of model routes match their declared response
+model: models of exactly the declared type are serialized directly, and
+any other model is filtered through the response model.
+"""
+import asyncio
+import importlib
+import inspect
+from typing import Any
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from api.responses import ModelResponse, ModelRoute, serialized_model_types
+from api.schemas.base_schemas import BaseModel
+
+ROUTE_MODULES = [
+    "admin_routes",
+    "equipment_routes",
+    "lab_routes",
+    "material_routes",
+    "research_routes",
+    "search_routes",
+    "software_routes",
+    "uni_routes",
+    "user_routes",
+]
+
+
+class ItemDetail(BaseModel):
+    item_name: str
+
+
+class SecretItemDetail(ItemDetail):
+    secret_note: str
+
+
+class OtherDetail(BaseModel):
+    other_name: str
+
+
+router = APIRouter(route_class=ModelRoute)
+
+
+@router.get("/exact")
+async def exact_item() -> ItemDetail:
+    return ItemDetail(item_name="exact")
+
+
+@router.get("/subclass", response_model=ItemDetail)
+async def subclass_item() -> SecretItemDetail:
+    return SecretItemDetail(item_name="subclass", secret_note="not in the response model")
+
+
+@router.get("/union")
+async def union_item() -> ItemDetail | OtherDetail:
+    return OtherDetail(other_name="union")
+
+
+app = FastAPI()
+app.include_router(router)
+
+
+async def get_json(client: httpx.AsyncClient, path: str) -> tuple[Any, bool]:
+    """
+    The json of the response, and whether it was serialized as a `ModelResponse`
+    """
+    rendered: list[BaseModel] = []
+    render = ModelResponse.render
+
+    def record_render(self: ModelResponse, content: Any) -> bytes:
+        rendered.append(content)
+        return render(self, content)
+
+    ModelResponse.render = record_render  # type: ignore[method-assign]
+    try:
+        response = await client.get(path)
+    finally:
+        ModelResponse.render = render  # type: ignore[method-assign]
+    assert response.status_code == 200, response.text
+    return response.json(), bool(rendered)
+
+
+async def test_model_routes(client: httpx.AsyncClient):
+    assert await get_json(client, "/exact") == ({"itemName": "exact"}, True)
+    # Filtered through the response model, so the extra field is dropped
+    assert await get_json(client, "/subclass") == ({"itemName": "subclass"}, False)
+    assert await get_json(client, "/union") == ({"otherName": "union"}, True)
+
+
+def test_api_routes():
+    for module_name in ROUTE_MODULES:
+        module = importlib.import_module(f"api.routes.{module_name}")
+        routers = [v for v in vars(module).values() if isinstance(v, APIRouter)]
+        assert routers, module_name
+
+        for router in routers:
+            for route in router.routes:
+                assert isinstance(route, ModelRoute), (module_name, route)
+                if inspect.iscoroutinefunction(route.endpoint):
+                    assert hasattr(route.endpoint, "__wrapped__"), route.path
+                # Models of exactly the declared response model bypass fastapi's
+                # response model filtering, as filtering would not change them
+                response_model = route.response_model
+                if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+                    assert serialized_model_types(response_model) == (response_model,), route.path
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await test_model_routes(client)
+    test_api_routes()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
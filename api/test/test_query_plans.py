@@ -0,0 +1,37 @@
+"""
+Explains every query builder against the configured database and fails
+if any builder cannot be explained, or if any plan differs from the
+recorded baseline.
+
+The baseline is recorded against a database created by `db init`, `db seed`
+and `db seed-synthetic`. Run with `--update` to record the current plans
+as the baseline.
+"""
+import asyncio
+from pathlib import Path
+import sys
+
+from db import LocalSession, local_sessionmaker
+from db.query_plans import query_plan_report
+
+BASELINE = Path(__file__).parent / "query_plans.json"
+
+
+async def test_query_plans(db: LocalSession, update: bool = False):
+    report = await query_plan_report(
+        db, min_rows=10_000, baseline=BASELINE, update_baseline=update
+    )
+    for line in report.lines():
+        print(line)
+
+    assert not report.failures, f"{len(report.failures)} query plans could not be explained"
+    assert not report.changed_shapes, f"{len(report.changed_shapes)} query plans changed"
+
+
+async def main():
+    async with local_sessionmaker() as db:
+        await test_query_plans(db, update="--update" in sys.argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
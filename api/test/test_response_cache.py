@@ -0,0 +1,86 @@
+"""
+Checks that a cached index response is invalidated by a write to the table
+of a relation which is nested in the response, rather than only by writes
+to the table of the index.
+"""
+import asyncio
+from uuid import UUID
+
+import httpx
+from sqlalchemy import delete, insert, select, update
+
+from api import app
+from api.response_cache import response_cache
+from db import LocalSession, local_sessionmaker
+from db.models.lab import Lab
+from db.models.lab.installable import LabInstallation
+from db.models.lab.lab import lab_supervisor
+from db.models.user import User
+
+
+async def supervisor_count(client: httpx.AsyncClient, lab_id: UUID) -> int:
+    response = await client.get("/api/labs/lab", params={"ids": lab_id.hex})
+    assert response.status_code == 200, response.text
+    return response.json()["items"][0]["supervisors"]["totalItemCount"]
+
+
+async def test_nested_write_invalidates(db: LocalSession, client: httpx.AsyncClient):
+    lab = await db.scalar(select(Lab).limit(1))
+    assert lab is not None
+    user = await db.scalar(
+        select(User).where(
+            User.disabled.is_(False),
+            User.id.not_in(select(lab_supervisor.c.user_id).where(lab_supervisor.c.lab_id == lab.id)),
+        ).limit(1)
+    )
+    assert user is not None
+
+    response_cache.clear()
+    count = await supervisor_count(client, lab.id)
+    # Served from the cache
+    assert await supervisor_count(client, lab.id) == count
+
+    await db.execute(insert(lab_supervisor).values(lab_id=lab.id, user_id=user.id))
+    await db.commit()
+    try:
+        assert await supervisor_count(client, lab.id) == count + 1
+    finally:
+        await db.execute(
+            delete(lab_supervisor).where(
+                lab_supervisor.c.lab_id == lab.id,
+                lab_supervisor.c.user_id == user.id,
+            )
+        )
+        await db.commit()
+
+    assert await supervisor_count(client, lab.id) == count
+
+
+async def test_installation_write_invalidates(db: LocalSession, client: httpx.AsyncClient):
+    response_cache.clear()
+    response = await client.get("/api/equipments/equipment")
+    assert response.status_code == 200, response.text
+    key = "/api/equipments/equipment?"
+    assert response_cache.get(key) is not None
+
+    # The installations of each equipment are nested in the equipment index
+    installation_id = await db.scalar(select(LabInstallation.id).limit(1))
+    await db.execute(
+        update(LabInstallation)
+        .where(LabInstallation.id == installation_id)
+        .values(updated_at=LabInstallation.updated_at)
+    )
+    await db.commit()
+    assert response_cache.get(key) is None
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async with local_sessionmaker() as db:
+            await test_nested_write_invalidates(db, client)
+            await test_installation_write_invalidates(db, client)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
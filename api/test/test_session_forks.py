@@ -0,0 +1,52 @@
+"""
+Checks that the forks of concurrent request sessions hold no more connections
+than the process wide fork slots, however many sub-resources each request
+hydrates on its forks (as research plan details do).
+"""
+import asyncio
+from collections import Counter
+
+from sqlalchemy import text
+
+from db import LocalSession, db_settings, engine, local_sessionmaker
+from db.forks import gather_forked
+from db.pool_metrics import pool_metrics
+
+
+async def test_fork_concurrency(num_requests: int = 8, num_loads: int = 9):
+    in_flight: Counter[int] = Counter()
+    peak_in_flight = 0
+    peak_request_in_flight = 0
+    peak_checked_out = 0
+
+    async def request(request_index: int):
+        async def load(fork: LocalSession):
+            nonlocal peak_in_flight, peak_request_in_flight, peak_checked_out
+            in_flight[request_index] += 1
+            try:
+                peak_in_flight = max(peak_in_flight, in_flight.total())
+                peak_request_in_flight = max(peak_request_in_flight, in_flight[request_index])
+                await fork.execute(text("SELECT pg_sleep(0.02)"))
+                peak_checked_out = max(peak_checked_out, pool_metrics(engine.pool).checked_out)
+            finally:
+                in_flight[request_index] -= 1
+
+        async with local_sessionmaker() as db:
+            # The request session holds its own connection while its forks run
+            await db.execute(text("SELECT 1"))
+            await gather_forked(db, *[load] * num_loads)
+
+    await asyncio.gather(*[request(i) for i in range(num_requests)])
+
+    assert peak_in_flight == db_settings.db_fork_pool_slots, peak_in_flight
+    assert peak_request_in_flight <= db_settings.db_fork_max_concurrency, peak_request_in_flight
+    assert peak_checked_out <= num_requests + db_settings.db_fork_pool_slots, peak_checked_out
+    assert pool_metrics(engine.pool).wait_stats.timeouts == 0
+
+
+async def main():
+    await test_fork_concurrency()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())